@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Compare single-document inference latency: scikit-learn vs InferenceEngine.
+
+Example:
+    python benchmarks/bench_inference.py --n-topics 20 --queries 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ng20lda.core.document_processor import iter_documents, vectorize_documents
+from ng20lda.core.inference import get_inference_engine
+from ng20lda.core.lda_model import get_document_topic_distribution, save_model, train_lda_model
+from ng20lda.core.synthetic import generate_synthetic_corpus
+
+
+def _percentiles(timings):
+    timings = np.array(timings) * 1e6
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def _time_calls(func, arguments):
+    timings = []
+    for argument in arguments:
+        start = time.perf_counter()
+        func(argument)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    """Print p50/p99 latency of each inference path."""
+    parser = argparse.ArgumentParser(description='Benchmark single-document inference')
+    parser.add_argument('--n-documents', type=int, default=2000, help='Training corpus size')
+    parser.add_argument('--n-topics', type=int, default=20, help='Number of LDA topics')
+    parser.add_argument('--queries', type=int, default=1000, help='Documents to time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = os.path.join(tmp_dir, 'corpus')
+        generate_synthetic_corpus(corpus_dir, args.n_documents, n_topics=args.n_topics)
+        documents = list(iter_documents(corpus_dir))
+        doc_term_matrix, vectorizer = vectorize_documents(text for _, text in documents)
+        lda_model = train_lda_model(doc_term_matrix, n_topics=args.n_topics)
+        model_path = os.path.join(tmp_dir, 'lda.pkl')
+        save_model(lda_model, vectorizer, model_path)
+
+        queries = [os.path.join(corpus_dir, doc_id) for doc_id, _ in documents[:args.queries]]
+        rows = [doc_term_matrix[i] for i in range(len(queries))]
+        engine = get_inference_engine(lda_model)
+
+        # Warm up the model cache and both code paths
+        get_document_topic_distribution(queries[0], model_path)
+        lda_model.transform(rows[0])
+        engine.transform(rows[0])
+
+        results = {
+            'sklearn transform': _time_calls(lda_model.transform, rows),
+            'InferenceEngine.transform': _time_calls(engine.transform, rows),
+            'get_document_topic_distribution': _time_calls(
+                lambda path: get_document_topic_distribution(path, model_path), queries
+            ),
+        }
+
+    print(f"{'path':<34} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for name, timings in results.items():
+        p50, p99 = _percentiles(timings)
+        print(f"{name:<34} {p50:>10.1f} {p99:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Benchmark peak memory of vectorizing and training on a synthetic corpus.
+
+Each pipeline runs in a fresh process so its peak RSS is measured on its
+own:
+
+* ``int64``: CountVectorizer's default int64 counts, converted to float64
+  by LDA's input validation (the previous behavior);
+* ``float32``: the package's float32 counts, used by LDA as they are;
+* ``npz``: the float32 pipeline started from a saved document-term matrix.
+
+Example:
+    python benchmarks/bench_matrix_memory.py --n-documents 50000
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def _run(pipeline, corpus_dir, matrix_path, n_topics, train):
+    from ng20lda.core.document_processor import build_vectorizer, iter_documents
+    from ng20lda.core.lda_model import train_lda_model
+    from ng20lda.core.matrix_store import load_doc_term_matrix
+    from ng20lda.core.utils import peak_rss_bytes
+
+    start = time.perf_counter()
+    if pipeline == "npz":
+        matrix, _ = load_doc_term_matrix(matrix_path)
+    else:
+        vectorizer = build_vectorizer()
+        if pipeline == "int64":
+            vectorizer.set_params(dtype=np.int64)
+        matrix = vectorizer.fit_transform(text for _, text in iter_documents(corpus_dir))
+    matrix_bytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    if train:
+        train_lda_model(matrix, n_topics=n_topics)
+    return matrix_bytes, time.perf_counter() - start, peak_rss_bytes()
+
+
+def main():
+    """Print peak RSS, matrix size and wall time for each pipeline."""
+    parser = argparse.ArgumentParser(description='Benchmark document-term matrix memory')
+    parser.add_argument('--n-documents', type=int, default=50000, help='Corpus size')
+    parser.add_argument('--n-topics', type=int, default=10, help='Topics to train')
+    parser.add_argument('--no-train', action='store_true', help='Only vectorize')
+    args = parser.parse_args()
+
+    from ng20lda.core.document_processor import iter_documents, vectorize_documents
+    from ng20lda.core.matrix_store import save_doc_term_matrix
+    from ng20lda.core.synthetic import generate_synthetic_corpus
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = os.path.join(tmp_dir, 'corpus')
+        matrix_path = os.path.join(tmp_dir, 'matrix.npz')
+        generate_synthetic_corpus(corpus_dir, args.n_documents, n_topics=args.n_topics)
+        save_doc_term_matrix(
+            *vectorize_documents(text for _, text in iter_documents(corpus_dir)), matrix_path
+        )
+
+        print(f"{'pipeline':<10} {'matrix (MB)':>12} {'time (s)':>9} {'peak RSS (MB)':>14}")
+        for pipeline in ('int64', 'float32', 'npz'):
+            with context.Pool(1) as pool:
+                matrix_bytes, elapsed, peak = pool.apply(
+                    _run,
+                    (pipeline, corpus_dir, matrix_path, args.n_topics, not args.no_train),
+                )
+            print(
+                f"{pipeline:<10} {matrix_bytes / 2 ** 20:>12.1f} {elapsed:>9.2f} "
+                f"{peak / 2 ** 20:>14.1f}"
+            )
+        print(f"npz file: {os.path.getsize(matrix_path) / 2 ** 20:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""Benchmark multi-process vectorization on a synthetic corpus.
+
+Example:
+    python benchmarks/bench_parallel_vectorize.py --n-documents 20000
+"""
+
+import argparse
+import tempfile
+import time
+
+from ng20lda.core.document_processor import find_documents, read_document
+from ng20lda.core.parallel import default_workers, vectorize_paths_parallel
+from ng20lda.core.synthetic import generate_synthetic_corpus
+from ng20lda.core.vocabulary import build_vocabulary
+
+
+def main():
+    """Time vectorization for increasing worker counts and print the speedup."""
+    parser = argparse.ArgumentParser(description='Benchmark parallel vectorization')
+    parser.add_argument('--n-documents', type=int, default=20000, help='Corpus size')
+    parser.add_argument('--max-workers', type=int, default=default_workers(),
+                        help='Largest worker count to try (default: CPU count)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per worker count')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate_synthetic_corpus(tmp_dir + '/corpus', args.n_documents)
+        paths = find_documents(tmp_dir + '/corpus')
+        vectorizer = build_vocabulary(read_document(path) for path in paths)
+
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= args.max_workers:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != args.max_workers:
+            worker_counts.append(args.max_workers)
+
+        baseline = None
+        print(f"{'workers':>8} {'seconds':>10} {'docs/s':>12} {'speedup':>8}")
+        for workers in worker_counts:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                vectorize_paths_parallel(paths, vectorizer, workers)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            baseline = baseline or best
+            print(f"{workers:>8} {best:>10.3f} {len(paths) / best:>12.0f} {baseline / best:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Benchmark similarity queries on a synthetic index of topic distributions.
+
+Rows are drawn from a sparse Dirichlet, like LDA doc-topic distributions,
+so the index can hold millions of documents without training a model.
+
+Example:
+    python benchmarks/bench_similarity.py --n-documents 2000000 --n-topics 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ng20lda.core.similarity import SimilarityIndex, write_similarity_index
+
+
+def _chunks(n_documents, n_topics, rng, chunk_size=100000):
+    for start in range(0, n_documents, chunk_size):
+        size = min(chunk_size, n_documents - start)
+        distributions = rng.dirichlet(np.full(n_topics, 0.1), size=size).astype(np.float32)
+        yield [str(i) for i in range(start, start + size)], distributions
+
+
+def main():
+    """Print build time and p50/p99 query latency per metric and probe setting."""
+    parser = argparse.ArgumentParser(description='Benchmark similarity queries')
+    parser.add_argument('--n-documents', type=int, default=1000000, help='Indexed documents')
+    parser.add_argument('--n-topics', type=int, default=20, help='Number of topics')
+    parser.add_argument('--queries', type=int, default=50, help='Queries per setting')
+    parser.add_argument('-k', type=int, default=10, help='Neighbours per query')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = os.path.join(tmp_dir, 'index')
+        start = time.perf_counter()
+        write_similarity_index(
+            _chunks(args.n_documents, args.n_topics, rng), args.n_documents, args.n_topics,
+            index_path,
+        )
+        print(f"Built index of {args.n_documents} documents in {time.perf_counter() - start:.1f}s")
+
+        queries = rng.dirichlet(np.full(args.n_topics, 0.1), size=args.queries)
+        with SimilarityIndex(index_path) as index:
+            print(f"{'metric':<10} {'probe':>6} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+            for metric in ('hellinger', 'cosine'):
+                for n_probe in (None, 3, 1):
+                    index.query(queries[0], args.k, metric, n_probe)
+                    timings = []
+                    for query in queries:
+                        start = time.perf_counter()
+                        index.query(query, args.k, metric, n_probe)
+                        timings.append(time.perf_counter() - start)
+                    timings = np.array(timings) * 1e3
+                    print(
+                        f"{metric:<10} {str(n_probe or 'all'):>6} "
+                        f"{np.percentile(timings, 50):>9.2f} {np.percentile(timings, 99):>9.2f}"
+                    )
+
+
+if __name__ == '__main__':
+    main()
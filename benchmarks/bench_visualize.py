@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Measure /visualize throughput: per-call pyplot figures vs the cached renderer.
+
+The ``pyplot`` row reproduces the previous implementation (a new figure,
+``tight_layout`` and ``savefig`` per call). The ``/visualize`` rows go
+through the FastAPI app, first with a cold render cache on distinct
+documents, then with repeated documents served from the cache, and finally
+with ``If-None-Match`` revalidation.
+
+Example:
+    python benchmarks/bench_visualize.py --requests 500
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import matplotlib
+import numpy as np
+from fastapi.testclient import TestClient
+
+from ng20lda.api import app
+from ng20lda.core.document_processor import iter_documents, vectorize_documents
+from ng20lda.core.lda_model import save_model, train_lda_model
+from ng20lda.core.rendering import get_render_cache, render_topic_chart
+from ng20lda.core.synthetic import generate_synthetic_corpus
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def render_with_pyplot(distribution, n_topics=3):
+    """Previous rendering path, kept here as the baseline."""
+    top_indices = distribution.argsort()[-n_topics:][::-1]
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.bar([f"Topic {idx}" for idx in top_indices], distribution[top_indices], color="#4C78A8")
+    ax.set_ylabel("Probability")
+    ax.set_title("Top topic distribution")
+    ax.set_ylim(0, 1)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _throughput(func, arguments):
+    start = time.perf_counter()
+    for argument in arguments:
+        func(argument)
+    return len(arguments) / (time.perf_counter() - start)
+
+
+def main():
+    """Print requests per second for each rendering path."""
+    parser = argparse.ArgumentParser(description='Benchmark /visualize throughput')
+    parser.add_argument('--n-documents', type=int, default=1000, help='Training corpus size')
+    parser.add_argument('--n-topics', type=int, default=20, help='Number of LDA topics')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per measurement')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    distributions = list(rng.dirichlet(np.ones(args.n_topics), size=args.requests))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = os.path.join(tmp_dir, 'corpus')
+        generate_synthetic_corpus(corpus_dir, args.n_documents, n_topics=args.n_topics)
+        documents = list(iter_documents(corpus_dir))
+        doc_term_matrix, vectorizer = vectorize_documents(text for _, text in documents)
+        model_path = os.path.join(tmp_dir, 'lda.pkl')
+        save_model(train_lda_model(doc_term_matrix, n_topics=args.n_topics), vectorizer, model_path)
+
+        paths = [os.path.join(corpus_dir, doc_id) for doc_id, _ in documents[:args.requests]]
+        bodies = [{'document_path': path, 'model_path': model_path} for path in paths]
+
+        with TestClient(app) as client:
+            client.post('/visualize', json=bodies[0])
+            get_render_cache().clear()
+            etags = {}
+
+            def visualize(body):
+                response = client.post('/visualize', json=body)
+                etags[body['document_path']] = response.headers['etag']
+
+            def revalidate(body):
+                client.post(
+                    '/visualize', json=body,
+                    headers={'If-None-Match': etags[body['document_path']]},
+                )
+
+            render_with_pyplot(distributions[0])
+            render_topic_chart(distributions[0])
+            results = {
+                'render: pyplot per call': _throughput(render_with_pyplot, distributions),
+                'render: reused figure': _throughput(render_topic_chart, distributions),
+                '/visualize (cold cache)': _throughput(visualize, bodies),
+                '/visualize (cached)': _throughput(visualize, bodies),
+                '/visualize (304)': _throughput(revalidate, bodies),
+            }
+
+    print(f"{'path':<28} {'req/s':>10}")
+    for name, rate in results.items():
+        print(f"{name:<28} {rate:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,51 +2,647 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
+import json
 import logging
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
+from typing import List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import Response
-from pydantic import BaseModel, Field
+import anyio
+from fastapi import FastAPI, File, Form, Header, HTTPException, Query, Request, UploadFile
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, model_validator
 
-from ng20lda.config import configure_logging
-from ng20lda.core.lda_model import describe_document, render_document_topic_distribution
+from ng20lda.config import configure_logging, env_int
+from ng20lda.core.lda_model import (
+    describe_documents_with_model,
+    describe_texts,
+    format_description,
+    get_top_words_per_topic,
+    render_topic_distribution,
+)
+from ng20lda.core.metrics import get_metrics
+from ng20lda.core.model_cache import get_model_cache, load_cached_model, model_content_hash
+from ng20lda.core.rendering import chart_etag, get_render_cache
+from ng20lda.core.result_cache import get_result_cache
+from ng20lda.core.similarity import get_similarity_index
+from ng20lda.registry import UnknownModelError, get_model_registry, load_registry_config
+from ng20lda.serving import QueueFullError, create_dispatcher
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="ng20lda API", version="0.1.0")
+dispatcher = create_dispatcher()
+registry = get_model_registry()
+metrics = get_metrics()
+# Metrics are on in the server unless explicitly turned off
+if os.environ.get("NG20LDA_METRICS") != "0":
+    metrics.enable()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# /describe/batch returns every result in one JSON body; larger jobs should
+# use the streaming endpoints
+MAX_BATCH_DOCUMENTS = env_int("NG20LDA_MAX_BATCH_DOCUMENTS", 10_000)
+# Each uploaded file is decoded into memory whole before it is scored
+MAX_UPLOAD_BYTES = env_int("NG20LDA_MAX_UPLOAD_BYTES", 10 * 1024 * 1024)
+UPLOAD_READ_SIZE = 1024 * 1024
+TEXT_LABEL = "<text>"
 
-class DocumentRequest(BaseModel):
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the configured models before serving; release threads when stopping."""
+    await anyio.to_thread.run_sync(load_registry_config)
+    yield
+    registry.shutdown()
+    dispatcher.shutdown()
+
+
+app = FastAPI(title="ng20lda API", version="0.1.0", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record the latency of every request by route and status."""
+    if not metrics.enabled:
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.observe(
+        "http_request_seconds",
+        time.perf_counter() - start,
+        method=request.method,
+        route=route.path if route is not None else "unmatched",
+        status=response.status_code,
+    )
+    return response
+
+
+class ModelSelection(BaseModel):
+    """Selects a model either by registry name or by path."""
+
+    model: Optional[str] = Field(None, description="Name of a model in the registry")
+    model_path: Optional[Path] = Field(
+        None, description="Path to the trained model (pickle or artifact directory)"
+    )
+
+    @model_validator(mode="after")
+    def _one_model(self):
+        if (self.model is None) == (self.model_path is None):
+            raise ValueError("Give exactly one of model and model_path.")
+        return self
+
+
+class DocumentRequest(ModelSelection):
     """Request model for document operations."""
 
-    document_path: Path = Field(..., description="Path to the document")
-    model_path: Path = Field(..., description="Path to the trained model pickle")
+    document_path: Optional[Path] = Field(None, description="Path to the document")
+    text: Optional[str] = Field(None, description="Document text, instead of a path")
+
+    @model_validator(mode="after")
+    def _one_document(self):
+        if (self.document_path is None) == (self.text is None):
+            raise ValueError("Give exactly one of document_path and text.")
+        return self
+
+    @property
+    def label(self) -> str:
+        """Name of the document in descriptions."""
+        return TEXT_LABEL if self.document_path is None else str(self.document_path)
+
+
+class VisualizeRequest(DocumentRequest):
+    """Request model for topic distribution charts."""
+
+    n_topics: int = Field(3, ge=1, description="Number of top topics to display")
+
+
+class BatchDescribeRequest(ModelSelection):
+    """Request model for describing many documents at once."""
+
+    document_paths: List[Path] = Field(..., description="Paths to the documents")
+    n_topics: int = Field(3, ge=1, description="Number of top topics per document")
+    n_words: int = Field(5, ge=1, description="Number of top words per topic")
+    chunk_size: int = Field(1000, ge=1, description="Documents scored per vectorized pass")
+
+
+class SimilarRequest(BaseModel):
+    """Request model for finding related documents in a similarity index."""
+
+    index_path: Path = Field(..., description="Path to the similarity index")
+    id: Optional[str] = Field(None, description="ID of an indexed document to use as the query")
+    document_path: Optional[Path] = Field(None, description="Path to the query document")
+    text: Optional[str] = Field(None, description="Query document text")
+    model: Optional[str] = Field(None, description="Name of a model in the registry")
+    model_path: Optional[Path] = Field(
+        None, description="Path to the model the index was built with"
+    )
+    k: int = Field(10, ge=1, le=1000, description="Number of related documents")
+    metric: Literal["hellinger", "cosine"] = Field("hellinger", description="Distance measure")
+    n_probe: Optional[int] = Field(
+        None, ge=1, description="Only scan partitions of the query's strongest topics"
+    )
+
+    @model_validator(mode="after")
+    def _one_query(self):
+        queries = [self.id, self.document_path, self.text]
+        if sum(query is not None for query in queries) != 1:
+            raise ValueError("Give exactly one of id, document_path and text.")
+        if self.id is None and (self.model is None) == (self.model_path is None):
+            raise ValueError("Give exactly one of model and model_path to score a document.")
+        return self
+
+    @property
+    def label(self) -> str:
+        """Name of the query document in logs."""
+        if self.id is not None:
+            return self.id
+        return TEXT_LABEL if self.document_path is None else str(self.document_path)
+
+
+class ModelVersionRequest(BaseModel):
+    """Request model for loading a new version of a named model."""
+
+    path: Path = Field(..., description="Path to the trained model (pickle or artifact directory)")
+    version: Optional[str] = Field(None, description="Version label; defaults to the content hash")
+
+
+def _overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server is overloaded, retry later.",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _check_model(request: ModelSelection) -> None:
+    if request.model is not None and request.model not in registry:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {request.model}")
+    if request.model_path is not None and not await anyio.Path(request.model_path).exists():
+        raise HTTPException(status_code=404, detail="Model not found.")
+
+
+async def _check_paths(request: DocumentRequest) -> None:
+    if request.document_path is not None and not await anyio.Path(request.document_path).exists():
+        raise HTTPException(status_code=404, detail="Document not found.")
+    await _check_model(request)
+
+
+async def _document_bytes(request: DocumentRequest) -> bytes:
+    if request.text is not None:
+        return request.text.encode("utf-8")
+    return await anyio.Path(request.document_path).read_bytes()
+
+
+@contextmanager
+def _model_key(request: ModelSelection):
+    """Yield the key the request's model is served under.
+
+    Named models are held for the whole request, so a concurrent swap never
+    frees the version a request started with.
+    """
+    if request.model is None:
+        yield os.path.abspath(request.model_path)
+        return
+    try:
+        model_version = registry.checkout(request.model)
+    except UnknownModelError:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {request.model}") from None
+    try:
+        yield model_version
+    finally:
+        registry.release(model_version)
+
+
+def _loaded_model(model_key):
+    if isinstance(model_key, str):
+        return load_cached_model(model_key)
+    return model_key.lda_model, model_key.vectorizer
+
+
+def _model_hash(model_key) -> str:
+    if isinstance(model_key, str):
+        return model_content_hash(model_key)
+    return model_key.content_hash
+
+
+async def _topic_distribution(request: DocumentRequest, model_key, raw: bytes | None = None):
+    """Read the document without blocking and score it on the inference pool."""
+    if raw is None:
+        raw = await _document_bytes(request)
+    document = raw.decode("utf-8", errors="ignore")
+    try:
+        return await dispatcher.topic_distribution(model_key, document)
+    except QueueFullError:
+        raise _overloaded() from None
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    candidates |= {tag[2:] for tag in candidates if tag.startswith("W/")}
+    return "*" in candidates or etag in candidates
+
+
+def _describe(document_label, distribution, model_key, n_topics=3, n_words=5):
+    lda_model, vectorizer = _loaded_model(model_key)
+    all_topics = get_top_words_per_topic(lda_model, vectorizer, n_words)
+    return format_description(document_label, distribution, all_topics, n_topics)
 
 
 @app.post("/describe")
-def describe(request: DocumentRequest) -> dict:
+async def describe(request: DocumentRequest) -> dict:
     """Describe a document using a trained LDA model."""
-    if not request.document_path.exists():
-        raise HTTPException(status_code=404, detail="Document not found.")
-    if not request.model_path.exists():
-        raise HTTPException(status_code=404, detail="Model not found.")
-    logger.info("API describe called for %s", request.document_path)
-    description = describe_document(str(request.document_path), str(request.model_path))
+    await _check_paths(request)
+    logger.info("API describe called for %s", request.label)
+    with _model_key(request) as model_key:
+        distribution = await _topic_distribution(request, model_key)
+        try:
+            description = await dispatcher.run(_describe, request.label, distribution, model_key)
+        except QueueFullError:
+            raise _overloaded() from None
     return {"description": description}
 
 
 @app.post("/visualize")
-def visualize(request: DocumentRequest) -> Response:
-    """Return a topic distribution chart as PNG bytes."""
-    if not request.document_path.exists():
-        raise HTTPException(status_code=404, detail="Document not found.")
-    if not request.model_path.exists():
+async def visualize(
+    request: VisualizeRequest,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """Return a topic distribution chart as PNG bytes.
+
+    Charts are identified by an ETag derived from the document contents,
+    the model contents and ``n_topics``. A matching ``If-None-Match``
+    header is answered with ``304 Not Modified`` before any inference, and
+    rendered charts are served from an in-memory LRU cache.
+    """
+    await _check_paths(request)
+    logger.info("API visualize called for %s", request.label)
+    raw = await _document_bytes(request)
+    with _model_key(request) as model_key:
+        try:
+            model_hash = await dispatcher.run(_model_hash, model_key)
+        except QueueFullError:
+            raise _overloaded() from None
+        etag = chart_etag(hashlib.sha256(raw).hexdigest(), model_hash, request.n_topics)
+        headers = {"ETag": etag}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        render_cache = get_render_cache()
+        png_bytes = render_cache.get(etag)
+        if png_bytes is None:
+            distribution = await _topic_distribution(request, model_key, raw)
+            try:
+                png_bytes = await dispatcher.run(
+                    render_topic_distribution, distribution, request.n_topics
+                )
+            except QueueFullError:
+                raise _overloaded() from None
+            render_cache.put(etag, png_bytes)
+    return Response(content=png_bytes, media_type="image/png", headers=headers)
+
+
+@app.post("/describe/batch")
+async def describe_batch(request: BatchDescribeRequest) -> dict:
+    """Describe many documents with a single vectorized pass per chunk.
+
+    All results are held in memory and returned in one body, so at most
+    ``MAX_BATCH_DOCUMENTS`` paths are accepted per request.
+    """
+    if len(request.document_paths) > MAX_BATCH_DOCUMENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"At most {MAX_BATCH_DOCUMENTS} documents per batch; "
+                "use /describe/stream or /describe/upload for larger jobs."
+            ),
+        )
+    missing = [
+        str(path) for path in request.document_paths if not await anyio.Path(path).exists()
+    ]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Documents not found: {missing}")
+    await _check_model(request)
+    logger.info("API batch describe called for %s documents", len(request.document_paths))
+
+    def run_batch(model_key):
+        lda_model, vectorizer = _loaded_model(model_key)
+        return list(describe_documents_with_model(
+            [str(path) for path in request.document_paths],
+            lda_model,
+            vectorizer,
+            n_topics=request.n_topics,
+            n_words=request.n_words,
+            chunk_size=request.chunk_size,
+        ))
+
+    with _model_key(request) as model_key:
+        try:
+            results = await dispatcher.run(run_batch, model_key)
+        except QueueFullError:
+            raise _overloaded() from None
+    return {"results": results}
+
+
+def _describe_texts(model_key, labels, documents, n_topics, n_words):
+    lda_model, vectorizer = _loaded_model(model_key)
+    return describe_texts(
+        labels, documents, lda_model, vectorizer, _model_hash(model_key), n_topics, n_words
+    )
+
+
+async def _query_model(model: Optional[str], model_path: Optional[str]) -> ModelSelection:
+    if (model is None) == (model_path is None):
+        raise HTTPException(status_code=422, detail="Give exactly one of model and model_path.")
+    selection = ModelSelection(model=model, model_path=model_path)
+    await _check_model(selection)
+    return selection
+
+
+async def _ndjson_records(chunks):
+    """Parse a byte stream of NDJSON documents one line at a time.
+
+    Yields:
+        ``(label, text)`` for each document, or an error dict for a line
+        that is not a JSON object with a string ``text``.
+    """
+    buffer = bytearray()
+    line_number = 0
+
+    def parse(line):
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            return {"line": line_number, "error": f"Invalid JSON: {error}"}
+        if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+            return {"line": line_number, "error": "Expected an object with a text field."}
+        return str(record.get("id", line_number)), record["text"]
+
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            line_number += 1
+            line = bytes(buffer[start:end])
+            start = end + 1
+            if line.strip():
+                yield parse(line)
+        del buffer[:start]
+    if buffer.strip():
+        line_number += 1
+        yield parse(bytes(buffer))
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """Streaming response whose body is produced while the request is read.
+
+    ``StreamingResponse`` watches for client disconnects by reading the
+    request channel, which would steal the chunks of a streamed request
+    body. Here the body iterator reads the request itself, and sees a
+    disconnect as ``ClientDisconnect`` from ``Request.stream``.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _stream_descriptions(records, selection, n_topics, n_words, chunk_size):
+    """Describe a stream of documents, yielding NDJSON result lines.
+
+    Documents are scored in chunks of ``chunk_size``; each chunk is scored
+    on the inference pool while the next one is read, so at most two chunks
+    are held in memory. Error dicts from ``records`` are passed through in
+    order.
+    """
+
+    async def score(entries):
+        documents = [entry for entry in entries if isinstance(entry, tuple)]
+        results = iter(await dispatcher.run(
+            _describe_texts,
+            model_key,
+            [label for label, _ in documents],
+            [text for _, text in documents],
+            n_topics,
+            n_words,
+        ))
+        return [entry if isinstance(entry, dict) else next(results) for entry in entries]
+
+    def lines(results):
+        return "".join(json.dumps(result) + "\n" for result in results)
+
+    pending = None
+    try:
+        with _model_key(selection) as model_key:
+            entries = []
+            async for entry in records:
+                entries.append(entry)
+                if pending is not None and pending.done():
+                    yield lines(pending.result())
+                    pending = None
+                if len(entries) < chunk_size:
+                    continue
+                if pending is not None:
+                    yield lines(await pending)
+                pending = asyncio.ensure_future(score(entries))
+                entries = []
+            if pending is not None:
+                yield lines(await pending)
+                pending = None
+            if entries:
+                yield lines(await score(entries))
+    except QueueFullError:
+        yield lines([{"error": "Server is overloaded, retry later."}])
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+@app.post("/describe/stream")
+async def describe_stream(
+    request: Request,
+    model: Optional[str] = Query(None, description="Name of a model in the registry"),
+    model_path: Optional[str] = Query(None, description="Path to the trained model"),
+    n_topics: int = Query(3, ge=1, description="Number of top topics per document"),
+    n_words: int = Query(5, ge=1, description="Number of top words per topic"),
+    chunk_size: int = Query(64, ge=1, description="Documents scored per inference call"),
+) -> StreamingResponse:
+    """Describe an NDJSON stream of documents, streaming NDJSON results back.
+
+    Each request line is an object ``{"text": "...", "id": "..."}``; the
+    ``id`` defaults to the line number. Each response line is a result like
+    those of ``/describe/batch``, or ``{"line": n, "error": "..."}`` for an
+    invalid line. The request body is parsed as it arrives and results are
+    sent as soon as their chunk is scored, so neither side is held in memory
+    as a whole.
+    """
+    selection = await _query_model(model, model_path)
+    logger.info("API stream describe called")
+    return _DuplexStreamingResponse(
+        _stream_descriptions(
+            _ndjson_records(request.stream()), selection, n_topics, n_words, chunk_size
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+def _upload_size(upload):
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
+async def _read_upload(upload):
+    """Decode an uploaded file read in pieces of ``UPLOAD_READ_SIZE`` bytes."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts = []
+    try:
+        while True:
+            piece = await upload.read(UPLOAD_READ_SIZE)
+            if not piece:
+                break
+            parts.append(decoder.decode(piece))
+        parts.append(decoder.decode(b"", final=True))
+    finally:
+        await upload.close()
+    return "".join(parts)
+
+
+@app.post("/describe/upload")
+async def describe_upload(
+    files: List[UploadFile] = File(..., description="Documents to describe"),
+    model: Optional[str] = Form(None, description="Name of a model in the registry"),
+    model_path: Optional[str] = Form(None, description="Path to the trained model"),
+    n_topics: int = Form(3, ge=1, description="Number of top topics per document"),
+    n_words: int = Form(5, ge=1, description="Number of top words per topic"),
+    chunk_size: int = Form(64, ge=1, description="Documents scored per inference call"),
+) -> StreamingResponse:
+    """Describe uploaded files, streaming one NDJSON result per file.
+
+    Uploads are spooled to temporary files by the multipart parser rather
+    than held in memory, and are read one at a time in bounded pieces.
+    Files larger than ``MAX_UPLOAD_BYTES`` are rejected with a 413 before
+    any are scored. Results are labelled with the uploaded file names.
+    """
+    oversized = [upload.filename for upload in files if _upload_size(upload) > MAX_UPLOAD_BYTES]
+    if oversized:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Files larger than {MAX_UPLOAD_BYTES} bytes: {oversized}",
+        )
+    selection = await _query_model(model, model_path)
+    logger.info("API upload describe called for %s files", len(files))
+
+    async def records():
+        for upload in files:
+            yield upload.filename, await _read_upload(upload)
+
+    return StreamingResponse(
+        _stream_descriptions(records(), selection, n_topics, n_words, chunk_size),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@app.post("/similar")
+async def similar(request: SimilarRequest) -> dict:
+    """Return the indexed documents closest to a query document.
+
+    The query is an indexed document ``id``, or a document (path or text)
+    scored with the model the index was built with.
+    """
+    if not await anyio.Path(request.index_path).exists():
+        raise HTTPException(status_code=404, detail="Index not found.")
+    logger.info("API similar called for %s", request.label)
+    try:
+        similarity_index = await dispatcher.run(get_similarity_index, str(request.index_path))
+        if request.id is not None:
+            try:
+                results = await dispatcher.run(
+                    similarity_index.query_id, request.id, request.k, request.metric,
+                    request.n_probe,
+                )
+            except KeyError:
+                raise HTTPException(
+                    status_code=404, detail=f"Document not in index: {request.id}"
+                ) from None
+        else:
+            await _check_paths(request)
+            with _model_key(request) as model_key:
+                if await dispatcher.run(_model_hash, model_key) != similarity_index.model_hash:
+                    raise HTTPException(
+                        status_code=409, detail="The index was built with a different model."
+                    )
+                distribution = await _topic_distribution(request, model_key)
+            results = await dispatcher.run(
+                similarity_index.query, distribution, request.k, request.metric, request.n_probe
+            )
+    except QueueFullError:
+        raise _overloaded() from None
+    return {
+        "results": [
+            {"document": doc_id, "distance": distance} for doc_id, distance in results
+        ]
+    }
+
+
+@app.get("/models")
+async def list_models() -> dict:
+    """List the named models with their serving, loading and draining versions."""
+    return {"models": registry.status()}
+
+
+@app.post("/admin/models/{name}", status_code=202)
+async def load_model_version(name: str, request: ModelVersionRequest) -> dict:
+    """Load a new version of a named model in the background.
+
+    The version is loaded and warmed up off the request path, then swapped
+    in atomically. The previous version keeps serving the requests that
+    already hold it and is freed once they finish. Progress is reported by
+    ``GET /models``.
+    """
+    if not await anyio.Path(request.path).exists():
         raise HTTPException(status_code=404, detail="Model not found.")
-    logger.info("API visualize called for %s", request.document_path)
-    png_bytes = render_document_topic_distribution(
-        str(request.document_path),
-        str(request.model_path),
+    try:
+        registry.register_in_background(name, str(request.path), request.version)
+    except RuntimeError as error:
+        raise HTTPException(status_code=409, detail=str(error)) from None
+    logger.info("API loading model %s from %s", name, request.path)
+    return {"model": name, "path": str(request.path), "status": "loading"}
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict:
+    """Report hit counters and hit ratios of the server caches."""
+    render_cache = get_render_cache()
+    return {
+        "models": get_model_cache().stats.as_dict(),
+        "results": get_result_cache().stats.as_dict(),
+        "charts": {"hits": render_cache.hits, "misses": render_cache.misses},
+    }
+
+
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    """Expose stage timings, cache counters and request latencies for Prometheus."""
+    render_cache = get_render_cache()
+    metrics.set_gauge("cache_entries", len(get_model_cache()), cache="model")
+    metrics.set_gauge("cache_entries", len(get_result_cache()), cache="result")
+    metrics.set_gauge("cache_entries", len(render_cache), cache="chart")
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
     )
-    return Response(content=png_bytes, media_type="image/png")
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""Built-in benchmark suite for the main ng20lda code paths.
+
+The suite generates a synthetic corpus, so it runs offline. It times
+loading, vectorizing, training, saving and loading models, describing
+documents, and the HTTP endpoints through an in-process test client. The
+report is a JSON-serializable dictionary that can be stored as a baseline;
+:func:`compare_reports` flags stages that got slower than the baseline.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+
+from ng20lda.core.utils import peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+DEFAULT_TOLERANCE = 0.25
+
+
+def summarize(durations, n_items=None):
+    """Summarize the durations of repeated operations.
+
+    Args:
+        durations (list): Durations in seconds, one per operation.
+        n_items (int, optional): Items processed by each operation, for the
+            throughput; defaults to one.
+
+    Returns:
+        dict: Count, mean and percentile latencies in milliseconds, and
+        throughput in items per second.
+    """
+    timings = np.asarray(durations, dtype=np.float64)
+    n_items = n_items or 1
+    total = timings.sum()
+    return {
+        "count": int(timings.size),
+        "mean_ms": float(timings.mean() * 1e3),
+        "p50_ms": float(np.percentile(timings, 50) * 1e3),
+        "p95_ms": float(np.percentile(timings, 95) * 1e3),
+        "p99_ms": float(np.percentile(timings, 99) * 1e3),
+        "throughput_per_s": float(timings.size * n_items / total) if total else float("inf"),
+    }
+
+
+def _time(func, arguments):
+    durations = []
+    for argument in arguments:
+        start = time.perf_counter()
+        func(argument)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _environment():
+    import scipy
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "scikit-learn": sklearn.__version__,
+    }
+
+
+def _clear_result_caches():
+    from ng20lda.core.rendering import get_render_cache
+    from ng20lda.core.result_cache import get_result_cache
+
+    get_result_cache().clear()
+    get_render_cache().clear()
+
+
+def run_benchmarks(n_documents=2000, n_topics=10, queries=100, repeat=3, seed=0,
+                   include_api=True):
+    """Run every benchmark stage and return the report.
+
+    Args:
+        n_documents (int): Size of the synthetic corpus.
+        n_topics (int): Number of topics of the corpus and of the model.
+        queries (int): Documents described per latency stage.
+        repeat (int): Repetitions of the save and load stages.
+        seed (int): Seed of the synthetic corpus.
+        include_api (bool): Also time the HTTP endpoints.
+
+    Returns:
+        dict: Report with the configuration, environment, per-stage
+        summaries and the peak RSS of the whole run. Peak RSS is the
+        process-wide high-water mark, so it is not reported per stage.
+    """
+    from ng20lda.core.document_processor import load_documents_recursive, vectorize_documents
+    from ng20lda.core.lda_model import (
+        describe_document,
+        load_model,
+        save_model,
+        train_lda_model,
+    )
+    from ng20lda.core.model_cache import get_model_cache
+    from ng20lda.core.synthetic import generate_synthetic_corpus
+
+    stages = {}
+
+    def record(name, durations, n_items=None):
+        stages[name] = summarize(durations, n_items)
+        logger.info("Benchmark %s: p50 %.2f ms", name, stages[name]["p50_ms"])
+
+    with tempfile.TemporaryDirectory(prefix="ng20lda-bench-") as tmp_dir:
+        corpus_dir = os.path.join(tmp_dir, "corpus")
+        generate_synthetic_corpus(corpus_dir, n_documents, n_topics=n_topics, seed=seed)
+
+        start = time.perf_counter()
+        documents = load_documents_recursive(corpus_dir)
+        record("load_documents_recursive", [time.perf_counter() - start], len(documents))
+
+        start = time.perf_counter()
+        doc_term_matrix, vectorizer = vectorize_documents(documents)
+        record("vectorize_documents", [time.perf_counter() - start], len(documents))
+        del documents
+
+        start = time.perf_counter()
+        lda_model = train_lda_model(doc_term_matrix, n_topics=n_topics)
+        record("train_lda_model", [time.perf_counter() - start], doc_term_matrix.shape[0])
+
+        model_paths = {
+            "pickle": os.path.join(tmp_dir, "lda.pkl"),
+            "artifact": os.path.join(tmp_dir, "lda"),
+        }
+        for model_format, path in model_paths.items():
+            record(
+                f"save_model[{model_format}]",
+                _time(lambda _: save_model(lda_model, vectorizer, path, model_format), range(repeat)),
+            )
+            record(f"load_model[{model_format}]", _time(lambda _: load_model(path), range(repeat)))
+
+        model_path = model_paths["pickle"]
+        document_paths = sorted(
+            os.path.join(root, name)
+            for root, _, files in os.walk(corpus_dir)
+            for name in files
+        )[:queries]
+
+        get_model_cache().invalidate()
+        _clear_result_caches()
+        record(
+            "describe_document",
+            _time(lambda path: describe_document(path, model_path), document_paths),
+        )
+
+        if include_api:
+            from fastapi.testclient import TestClient
+
+            from ng20lda.api import app
+
+            client = TestClient(app)
+            for endpoint in ("/describe", "/visualize"):
+                # Otherwise /visualize would reuse the distributions /describe cached
+                _clear_result_caches()
+                record(
+                    f"POST {endpoint}",
+                    _time(
+                        lambda path: client.post(
+                            endpoint, json={"document_path": path, "model_path": model_path}
+                        ).raise_for_status(),
+                        document_paths,
+                    ),
+                )
+            _clear_result_caches()
+            record(
+                "POST /describe/batch",
+                _time(
+                    lambda _: client.post(
+                        "/describe/batch",
+                        json={"document_paths": document_paths, "model_path": model_path},
+                    ).raise_for_status(),
+                    range(repeat),
+                ),
+                len(document_paths),
+            )
+            # Memory-mapped artifact models, loaded through the model cache
+            get_model_cache().invalidate()
+            _clear_result_caches()
+            record(
+                "POST /describe[artifact]",
+                _time(
+                    lambda path: client.post(
+                        "/describe",
+                        json={"document_path": path, "model_path": model_paths["artifact"]},
+                    ).raise_for_status(),
+                    document_paths,
+                ),
+            )
+
+    return {
+        "version": REPORT_VERSION,
+        "config": {
+            "n_documents": n_documents,
+            "n_topics": n_topics,
+            "queries": queries,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "environment": _environment(),
+        "stages": stages,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Find stages that are slower than in a baseline report.
+
+    A stage regresses when its median latency exceeds the baseline's by
+    more than ``tolerance``. Stages missing from either report are skipped.
+
+    Args:
+        report (dict): Current report from :func:`run_benchmarks`.
+        baseline (dict): Baseline report.
+        tolerance (float): Allowed relative slowdown, e.g. ``0.25`` for 25%.
+
+    Returns:
+        list: One dict per regressed stage with ``stage``, ``baseline_ms``,
+        ``current_ms`` and ``ratio``.
+    """
+    if report.get("config") != baseline.get("config"):
+        logger.warning("Benchmark configuration differs from the baseline")
+    regressions = []
+    for stage, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if previous is None or not previous["p50_ms"]:
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append({
+                "stage": stage,
+                "baseline_ms": previous["p50_ms"],
+                "current_ms": current["p50_ms"],
+                "ratio": ratio,
+            })
+    return regressions
+
+
+def save_report(report, path):
+    """Write a report as JSON.
+
+    Args:
+        report (dict): Benchmark report.
+        path (str): Output file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_report(path):
+    """Read a report written by :func:`save_report`.
+
+    Args:
+        path (str): Report file.
+
+    Returns:
+        dict: The report.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
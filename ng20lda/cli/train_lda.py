@@ -2,10 +2,11 @@
 """CLI script to train an LDA model on text documents."""
 
 import argparse
+import itertools
 import os
 
 from ng20lda.config import configure_logging
-from ng20lda.core.document_processor import load_documents_recursive, vectorize_documents
+from ng20lda.core.document_processor import iter_documents, vectorize_documents
 from ng20lda.core.lda_model import train_lda_model, save_model
 
 
@@ -31,17 +32,26 @@ def main():
         default=10,
         help='Number of topics for LDA (default: 10)'
     )
+    parser.add_argument(
+        '--read-workers',
+        type=int,
+        default=None,
+        help='Threads used to read documents from disk (default: sequential)'
+    )
     
     args = parser.parse_args()
     
-    # Load documents
-    documents = load_documents_recursive(args.input_dir)
+    # Stream documents so the corpus is never held in memory as strings
+    documents = iter_documents(args.input_dir, max_workers=args.read_workers)
+    first = next(documents, None)
 
-    if len(documents) == 0:
+    if first is None:
         raise SystemExit("Error: No documents found.")
 
     # Vectorize documents
-    doc_term_matrix, vectorizer = vectorize_documents(documents)
+    doc_term_matrix, vectorizer = vectorize_documents(
+        text for _, text in itertools.chain([first], documents)
+    )
 
     # Train LDA model
     lda_model = train_lda_model(doc_term_matrix, n_topics=args.n_topics)
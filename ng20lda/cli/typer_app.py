@@ -1,65 +1,627 @@
 #!/usr/bin/env python
 """Unified CLI using Typer with subcommands."""
 
+import csv
+import json
+import shutil
+import sys
+import time
 from pathlib import Path
+from typing import List
 
 import typer
 from ng20lda.config import configure_logging
-from ng20lda.core.data_fetcher import fetch_and_save_ng20
-from ng20lda.core.document_processor import load_documents_recursive, vectorize_documents
-from ng20lda.core.lda_model import train_lda_model, save_model, describe_document
-from ng20lda.core.utils import count_lines_from_file
+from ng20lda.core.metrics import get_metrics
+from ng20lda.core.utils import count_lines_from_file, count_lines_in_directory
+
+# Commands import their dependencies when they run, so that startup, --help
+# and light commands such as count never load scikit-learn, NumPy or
+# matplotlib.
 
 app = typer.Typer(help="20 Newsgroups LDA toolkit")
 
 
+def _print_profile():
+    metrics = get_metrics()
+    typer.echo(f"{'stage':<16} {'calls':>8} {'total (s)':>10} {'mean (ms)':>10} {'max (ms)':>10}", err=True)
+    for row in metrics.stage_summary():
+        typer.echo(
+            f"{row['stage']:<16} {row['count']:>8} {row['total_seconds']:>10.3f} "
+            f"{row['mean_ms']:>10.3f} {row['max_ms']:>10.3f}",
+            err=True,
+        )
+    for name, series in sorted(metrics.counters().items()):
+        for labels, value in sorted(series.items()):
+            label_text = ",".join(f"{key}={label}" for key, label in labels)
+            typer.echo(f"{name}[{label_text}]: {value:g}", err=True)
+
+
 @app.callback()
-def main():
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print per-stage timings and counters to stderr on exit"
+    ),
+):
     """Initialize logging for CLI."""
     configure_logging()
+    if profile:
+        get_metrics().enable()
+        ctx.call_on_close(_print_profile)
 
 
 @app.command()
 def fetch(
     category: str = typer.Argument(..., help="Category name from 20newsgroups dataset"),
     n_documents: int = typer.Argument(..., help="Number of documents to fetch"),
-    output_dir: str = typer.Argument(..., help="Output directory to save documents")
+    output_dir: str = typer.Argument(..., help="Output directory to save documents"),
+    packed: bool = typer.Option(
+        False, "--packed", help="Append to a packed corpus instead of writing one file per document"
+    ),
 ):
     """Fetch N documents from a 20newsgroups category."""
-    fetch_and_save_ng20(category, n_documents, output_dir)
+    from ng20lda.core.data_fetcher import fetch_and_save_ng20
+
+    fetch_and_save_ng20(category, n_documents, output_dir, packed=packed)
     typer.echo(f"✓ Successfully fetched {n_documents} documents from {category}")
 
 
+@app.command()
+def ingest(
+    output_dir: str = typer.Argument(..., help="Output directory to save documents"),
+    categories: List[str] = typer.Option(
+        None, "--category", "-c", help="Category to ingest; repeat for several (default: all)"
+    ),
+    n_documents: int = typer.Option(None, "--n-documents", "-n", help="Maximum documents per category"),
+    subset: str = typer.Option("train", "--subset", help="train, test or all"),
+    archive: Path = typer.Option(
+        None, "--archive", help="Local 20news-bydate.tar.gz to read instead of the scikit-learn cache",
+        exists=True,
+    ),
+    data_home: Path = typer.Option(
+        None, "--data-home", help="scikit-learn data directory holding the cached dataset"
+    ),
+    workers: int = typer.Option(8, "--workers", help="Threads writing documents"),
+    packed: bool = typer.Option(
+        False, "--packed", help="Append to a packed corpus instead of writing one file per document"
+    ),
+):
+    """Save many 20newsgroups categories at once from local data, resuming interrupted runs."""
+    from ng20lda.core.data_fetcher import ingest_ng20
+
+    try:
+        n_written, n_skipped = ingest_ng20(
+            output_dir,
+            categories=categories or None,
+            n_documents=n_documents,
+            subset=subset,
+            data_home=str(data_home) if data_home is not None else None,
+            archive=str(archive) if archive is not None else None,
+            packed=packed,
+            workers=workers,
+        )
+    except (FileNotFoundError, ValueError) as error:
+        typer.echo(f"Error: {error}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"✓ Wrote {n_written} documents into {output_dir} ({n_skipped} already up to date)")
+
+
+@app.command()
+def pack(
+    input_dir: Path = typer.Argument(..., help="Directory of .txt documents", exists=True),
+    output_dir: Path = typer.Argument(..., help="Packed corpus directory to create"),
+    read_workers: int = typer.Option(
+        None, "--read-workers", help="Threads used to read documents from disk"
+    ),
+):
+    """Convert a directory of .txt files into a packed corpus."""
+    from ng20lda.core.corpus_store import write_packed_corpus
+    from ng20lda.core.document_processor import iter_documents
+
+    n_documents = write_packed_corpus(
+        iter_documents(str(input_dir), max_workers=read_workers), str(output_dir)
+    )
+    typer.echo(f"✓ Packed {n_documents} documents into {output_dir}")
+
+
+def _corpus_documents(input_dir):
+    """Return ``(documents, corpus_path)`` for a directory of files or a packed corpus.
+
+    For a packed corpus the documents are the range of its positions.
+    """
+    from ng20lda.core.corpus_store import PackedCorpus, is_packed_corpus
+    from ng20lda.core.document_processor import iter_document_paths
+
+    if is_packed_corpus(str(input_dir)):
+        with PackedCorpus(str(input_dir)) as corpus:
+            return range(len(corpus)), str(input_dir)
+    return list(iter_document_paths(str(input_dir))), None
+
+
+def _fixed_vocabulary(input_dir, paths, vocabulary_path, workers, read_workers,
+                      corpus_path=None):
+    """Load a saved vocabulary, or build one in a streaming pass and save it."""
+    from ng20lda.core.document_processor import iter_documents
+    from ng20lda.core.parallel import build_vocabulary_parallel
+    from ng20lda.core.vocabulary import build_vocabulary, load_vocabulary, save_vocabulary
+
+    if vocabulary_path is not None and vocabulary_path.exists():
+        return load_vocabulary(str(vocabulary_path))
+
+    if workers > 1:
+        vectorizer = build_vocabulary_parallel(paths, workers, corpus_path=corpus_path)
+    else:
+        vectorizer = build_vocabulary(
+            text for _, text in iter_documents(input_dir, max_workers=read_workers)
+        )
+    if vocabulary_path is not None:
+        save_vocabulary(vectorizer, str(vocabulary_path))
+    return vectorizer
+
+
+def _vectorize_corpus(input_dir, paths, corpus_path, vectorizer, workers, read_workers,
+                      batch_size):
+    """Emit CSR chunks against the fixed vocabulary and stack them."""
+    from ng20lda.core.document_processor import iter_documents
+    from ng20lda.core.parallel import vectorize_paths_parallel
+    from ng20lda.core.vocabulary import vectorize_streaming
+
+    if workers > 1:
+        return vectorize_paths_parallel(paths, vectorizer, workers, corpus_path=corpus_path)
+    doc_term_matrix, _ = vectorize_streaming(
+        lambda: (text for _, text in iter_documents(input_dir, max_workers=read_workers)),
+        chunk_size=batch_size,
+        vectorizer=vectorizer,
+    )
+    return doc_term_matrix
+
+
+def _corpus_matrix(input_dir, paths, corpus_path, matrix_path, vocabulary_path, workers,
+                   read_workers, batch_size):
+    """Return ``(doc_term_matrix, vectorizer)``, reusing a saved matrix when it fits the corpus."""
+    from ng20lda.core.matrix_store import (
+        load_doc_term_matrix,
+        read_matrix_fingerprint,
+        save_doc_term_matrix,
+    )
+    from ng20lda.core.training_manifest import corpus_fingerprint
+
+    fingerprint = corpus_fingerprint(input_dir) if matrix_path is not None else None
+    if matrix_path is not None and matrix_path.exists():
+        if read_matrix_fingerprint(str(matrix_path)) == fingerprint:
+            if vocabulary_path is not None:
+                typer.echo(
+                    f"Warning: --vocabulary is ignored, {matrix_path} is reused with the "
+                    "vocabulary it was built with.",
+                    err=True,
+                )
+            return load_doc_term_matrix(str(matrix_path))
+        typer.echo(
+            f"Warning: {matrix_path} was built from a different version of the corpus, "
+            "vectorizing again.",
+            err=True,
+        )
+
+    vectorizer = _fixed_vocabulary(
+        input_dir, paths, vocabulary_path, workers, read_workers, corpus_path
+    )
+    doc_term_matrix = _vectorize_corpus(
+        input_dir, paths, corpus_path, vectorizer, workers, read_workers, batch_size
+    )
+    if matrix_path is not None:
+        save_doc_term_matrix(doc_term_matrix, vectorizer, str(matrix_path), fingerprint)
+    return doc_term_matrix, vectorizer
+
+
+def _train_online(input_dir, output_path, model_format, vectorizer, paths, n_topics,
+                  batch_size, passes, checkpoint_every, workers, read_workers,
+                  corpus_path=None):
+    """Train with partial_fit over chunks streamed from disk."""
+    from ng20lda.core.document_processor import iter_document_chunks
+    from ng20lda.core.lda_model import save_model, train_lda_model_online
+    from ng20lda.core.parallel import ParallelVectorizer
+
+    def make_chunks():
+        if workers > 1:
+            for start in range(0, len(paths), batch_size):
+                yield parallel_vectorizer.transform_paths(paths[start:start + batch_size])
+            return
+        for _, texts in iter_document_chunks(input_dir, batch_size, max_workers=read_workers):
+            yield vectorizer.transform(texts)
+
+    checkpoint_path = f"{output_path}.ckpt"
+
+    def checkpoint(lda_model):
+        save_model(lda_model, vectorizer, checkpoint_path, model_format=model_format)
+
+    with ParallelVectorizer(vectorizer, workers, corpus_path) as parallel_vectorizer:
+        return train_lda_model_online(
+            make_chunks,
+            total_samples=len(paths),
+            n_topics=n_topics,
+            batch_size=batch_size,
+            passes=passes,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+        )
+
+
+def _name_hashed_features(lda_model, vectorizer, documents):
+    """Name the top features of a model trained on hashed features.
+
+    ``documents`` is a lazy iterable of texts; it is only read for hashing
+    vectorizers.
+    """
+    from ng20lda.core.document_processor import is_hashing_vectorizer
+    from ng20lda.core.topic_words import name_hashed_features
+
+    if is_hashing_vectorizer(vectorizer):
+        name_hashed_features(lda_model, vectorizer, documents)
+
+
+def _read_changed(changed, corpus_path=None):
+    """Yield the texts of changed documents, given as paths or packed positions."""
+    from ng20lda.core.corpus_store import PackedCorpus
+    from ng20lda.core.document_processor import read_document
+
+    if corpus_path is None:
+        for path in changed:
+            yield read_document(path)
+        return
+    with PackedCorpus(corpus_path) as corpus:
+        for position in changed:
+            yield corpus[position]
+
+
+def _saved_model_summary(model_path):
+    """Describe the size and load time of a saved model."""
+    from ng20lda.core.lda_model import load_model, model_size
+
+    start = time.perf_counter()
+    load_model(model_path)
+    elapsed = time.perf_counter() - start
+    return f"{model_size(model_path) / 2 ** 20:.1f} MB, loads in {elapsed:.2f}s"
+
+
+def _train_update(input_dir, output_path, model_format, existing_path, corpus_path,
+                  batch_size, passes, workers):
+    """Fold the documents missing from an existing model's manifest into it."""
+    from ng20lda.core.lda_model import load_model, read_model_lineage, save_model, update_lda_model
+    from ng20lda.core.model_cache import compute_model_hash
+    from ng20lda.core.parallel import ParallelVectorizer
+    from ng20lda.core.training_manifest import (
+        load_training_manifest,
+        save_training_manifest,
+        scan_corpus,
+    )
+
+    try:
+        previous = load_training_manifest(existing_path)
+    except FileNotFoundError as error:
+        typer.echo(f"Error: {error}", err=True)
+        raise typer.Exit(code=1)
+    records, changed = scan_corpus(input_dir, previous)
+    if not changed:
+        typer.echo(f"✓ No new or changed documents, {existing_path} is up to date")
+        return
+
+    lda_model, vectorizer = load_model(existing_path)
+    lineage = {
+        "version": read_model_lineage(existing_path)["version"] + 1,
+        "parent": compute_model_hash(existing_path),
+    }
+    with ParallelVectorizer(vectorizer, workers, corpus_path) as parallel_vectorizer:
+        def make_chunks():
+            for start in range(0, len(changed), batch_size):
+                yield parallel_vectorizer.transform_paths(changed[start:start + batch_size])
+
+        update_lda_model(lda_model, make_chunks, total_samples=len(records), passes=passes)
+
+    # Features already named keep their names; only new top features are
+    # named, from the changed documents
+    _name_hashed_features(lda_model, vectorizer, _read_changed(changed, corpus_path))
+    save_model(lda_model, vectorizer, output_path, model_format=model_format, lineage=lineage)
+    save_training_manifest(records, output_path)
+    typer.echo(
+        f"✓ Model version {lineage['version']} saved to {output_path} "
+        f"({len(changed)} new or changed documents; {_saved_model_summary(output_path)})"
+    )
+
+
 @app.command()
 def train(
-    input_dir: Path = typer.Argument(..., help="Directory containing text documents", exists=True),
+    input_dir: Path = typer.Argument(
+        ..., help="Directory containing text documents, or a packed corpus", exists=True
+    ),
     output_path: Path = typer.Argument(..., help="Path to save the trained model"),
-    n_topics: int = typer.Option(10, "--n-topics", "-n", help="Number of topics for LDA")
+    n_topics: int = typer.Option(
+        None, "--n-topics", "-n", help="Number of topics for LDA (default: 10)"
+    ),
+    mode: str = typer.Option(None, "--mode", help="Training mode: batch or online (default: batch)"),
+    batch_size: int = typer.Option(
+        256, "--batch-size", help="Documents per chunk when streaming the corpus"
+    ),
+    passes: int = typer.Option(1, "--passes", help="Passes over the corpus in online mode"),
+    checkpoint_every: int = typer.Option(
+        0, "--checkpoint-every", help="Chunks between checkpoints in online mode (0: per pass)"
+    ),
+    vocabulary_path: Path = typer.Option(
+        None, "--vocabulary", help="Vocabulary file to reuse, or to create if missing"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Processes used to tokenize and vectorize documents"
+    ),
+    read_workers: int = typer.Option(
+        None, "--read-workers", help="Threads used to read documents from disk"
+    ),
+    model_format: str = typer.Option(
+        None,
+        "--format",
+        help="Model format: pickle or artifact (default: pickle, artifact for an existing directory)",
+    ),
+    update_path: Path = typer.Option(
+        None,
+        "--update",
+        help="Existing model to continue training with only new or changed documents",
+        exists=True,
+    ),
+    matrix_path: Path = typer.Option(
+        None,
+        "--matrix",
+        help="Document-term matrix (.npz) to train from if it exists, or to save after vectorizing",
+    ),
+    hash_features: int = typer.Option(
+        None,
+        "--hash-features",
+        help="Hash terms into this many features instead of building a vocabulary",
+    ),
+    record_manifest: bool = typer.Option(
+        False,
+        "--manifest",
+        help="Record the trained documents in <output>.ingest.json for later --update runs",
+    ),
 ):
-    """Train an LDA model on text documents."""
-    # Load documents
-    documents = load_documents_recursive(str(input_dir))
-    
-    if len(documents) == 0:
+    """Train an LDA model on text documents.
+
+    With ``--manifest``, the size, modification time and hash of every
+    document are recorded next to the model. This reads the corpus once
+    more. With ``--update``, the documents already recorded in the existing
+    model's training manifest are skipped and the model is updated with
+    ``partial_fit`` on the rest, producing a new model version that always
+    gets a manifest.
+
+    With ``--matrix``, batch training saves the vectorized corpus and later
+    runs on the same corpus skip vectorization.
+
+    With ``--hash-features``, terms are hashed into a fixed feature space,
+    so there is no vocabulary pass and no vocabulary to store; the top
+    words of each topic are named from the corpus after training.
+    """
+    from ng20lda.core.document_processor import build_hashing_vectorizer, iter_documents
+    from ng20lda.core.lda_model import infer_model_format, save_model, train_lda_model
+    from ng20lda.core.training_manifest import save_training_manifest, scan_corpus
+
+    if update_path is not None:
+        # The existing model fixes the topics and the vectorizer, and
+        # updates always stream partial_fit chunks
+        ignored = {
+            "--n-topics": n_topics,
+            "--mode": mode,
+            "--hash-features": hash_features,
+            "--matrix": matrix_path,
+            "--vocabulary": vocabulary_path,
+            "--read-workers": read_workers,
+            "--checkpoint-every": checkpoint_every or None,
+        }
+        rejected = [name for name, value in ignored.items() if value is not None]
+        if rejected:
+            typer.echo(f"Error: --update cannot be combined with {', '.join(rejected)}.", err=True)
+            raise typer.Exit(code=1)
+    n_topics = 10 if n_topics is None else n_topics
+    mode = mode or "batch"
+    if mode not in ("batch", "online"):
+        typer.echo("Error: --mode must be 'batch' or 'online'.", err=True)
+        raise typer.Exit(code=1)
+    model_format = model_format or infer_model_format(output_path)
+    if model_format not in ("pickle", "artifact"):
+        typer.echo("Error: --format must be 'pickle' or 'artifact'.", err=True)
+        raise typer.Exit(code=1)
+    if matrix_path is not None and mode != "batch":
+        typer.echo("Error: --matrix only applies to --mode batch.", err=True)
+        raise typer.Exit(code=1)
+    if hash_features is not None and (hash_features < 1 or vocabulary_path or matrix_path):
+        typer.echo(
+            "Error: --hash-features must be positive and cannot be combined with "
+            "--vocabulary or --matrix.",
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+    paths, corpus_path = _corpus_documents(input_dir)
+    if not paths:
         typer.echo("Error: No documents found!", err=True)
         raise typer.Exit(code=1)
 
-    doc_term_matrix, vectorizer = vectorize_documents(documents)
-    lda_model = train_lda_model(doc_term_matrix, n_topics=n_topics)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if update_path is not None:
+        _train_update(
+            str(input_dir), str(output_path), model_format, str(update_path),
+            corpus_path, batch_size, passes, workers,
+        )
+        return
+
+    if hash_features is not None:
+        vectorizer = build_hashing_vectorizer(hash_features)
+
+    if mode == "online":
+        if hash_features is None:
+            # Pass 1: fix the vocabulary without holding the corpus in memory
+            vectorizer = _fixed_vocabulary(
+                str(input_dir), paths, vocabulary_path, workers, read_workers, corpus_path
+            )
+        lda_model = _train_online(
+            str(input_dir),
+            str(output_path),
+            model_format,
+            vectorizer,
+            paths,
+            n_topics,
+            batch_size,
+            passes,
+            checkpoint_every,
+            workers,
+            read_workers,
+            corpus_path,
+        )
+    else:
+        if hash_features is not None:
+            doc_term_matrix = _vectorize_corpus(
+                str(input_dir), paths, corpus_path, vectorizer, workers, read_workers, batch_size
+            )
+        else:
+            doc_term_matrix, vectorizer = _corpus_matrix(
+                str(input_dir), paths, corpus_path, matrix_path, vocabulary_path, workers,
+                read_workers, batch_size,
+            )
+        lda_model = train_lda_model(doc_term_matrix, n_topics=n_topics)
+
+    _name_hashed_features(
+        lda_model,
+        vectorizer,
+        (text for _, text in iter_documents(str(input_dir), max_workers=read_workers)),
+    )
+    save_model(lda_model, vectorizer, str(output_path), model_format=model_format)
+    checkpoint_path = Path(f"{output_path}.ckpt")
+    if checkpoint_path.is_dir():
+        shutil.rmtree(checkpoint_path)
+    else:
+        checkpoint_path.unlink(missing_ok=True)
+    if record_manifest:
+        records, _ = scan_corpus(str(input_dir))
+        save_training_manifest(records, str(output_path))
+    typer.echo(f"✓ Model saved to {output_path} ({_saved_model_summary(str(output_path))})")
+
+
+def _parse_topic_counts(value):
+    """Parse a comma-separated list of topic counts."""
+    try:
+        counts = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        counts = []
+    if not counts or min(counts) < 1:
+        typer.echo("Error: --n-topics must be a comma-separated list of positive integers.", err=True)
+        raise typer.Exit(code=1)
+    return counts
+
+
+@app.command()
+def sweep(
+    input_dir: Path = typer.Argument(
+        ..., help="Directory containing text documents, or a packed corpus", exists=True
+    ),
+    output_path: Path = typer.Argument(..., help="Path to save the best model"),
+    n_topics: str = typer.Option(
+        "5,10,20,40", "--n-topics", "-n", help="Comma-separated topic counts to try"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Processes used to vectorize and to train candidates"
+    ),
+    heldout: float = typer.Option(
+        0.1, "--heldout", help="Fraction of documents held out to score perplexity"
+    ),
+    vocabulary_path: Path = typer.Option(
+        None, "--vocabulary", help="Vocabulary file to reuse, or to create if missing"
+    ),
+    read_workers: int = typer.Option(
+        None, "--read-workers", help="Threads used to read documents from disk"
+    ),
+    model_format: str = typer.Option(
+        None,
+        "--format",
+        help="Model format: pickle or artifact (default: pickle, artifact for an existing directory)",
+    ),
+    report_path: Path = typer.Option(None, "--report", help="Write the scores as JSON"),
+    matrix_path: Path = typer.Option(
+        None,
+        "--matrix",
+        help="Document-term matrix (.npz) to reuse if it exists, or to save after vectorizing",
+    ),
+    record_manifest: bool = typer.Option(
+        False,
+        "--manifest",
+        help="Record the trained documents in <output>.ingest.json for later --update runs",
+    ),
+):
+    """Train one model per topic count, score them and keep the best.
+
+    The corpus is vectorized once and shared read-only with the worker
+    processes. Models are ranked by held-out perplexity. ``--manifest``
+    records the corpus for later ``train --update`` runs.
+    """
+    from ng20lda.core.lda_model import infer_model_format, save_model
+    from ng20lda.core.sweep import sweep_topics
+    from ng20lda.core.training_manifest import save_training_manifest, scan_corpus
+
+    counts = _parse_topic_counts(n_topics)
+    if not 0 <= heldout < 1:
+        typer.echo("Error: --heldout must be in [0, 1).", err=True)
+        raise typer.Exit(code=1)
+    model_format = model_format or infer_model_format(output_path)
+    if model_format not in ("pickle", "artifact"):
+        typer.echo("Error: --format must be 'pickle' or 'artifact'.", err=True)
+        raise typer.Exit(code=1)
+
+    paths, corpus_path = _corpus_documents(input_dir)
+    if not paths:
+        typer.echo("Error: No documents found!", err=True)
+        raise typer.Exit(code=1)
+
+    doc_term_matrix, vectorizer = _corpus_matrix(
+        str(input_dir), paths, corpus_path, matrix_path, vocabulary_path, workers,
+        read_workers, 1000,
+    )
+    results, best_model = sweep_topics(doc_term_matrix, counts, workers=workers, heldout=heldout)
+
+    typer.echo(f"{'n_topics':>8} {'perplexity':>12} {'coherence':>10} {'time (s)':>9} {'peak RSS (MB)':>14}")
+    for result in results:
+        peak = f"{result.peak_rss / 2 ** 20:.1f}" if result.peak_rss is not None else "n/a"
+        typer.echo(
+            f"{result.n_topics:>8} {result.perplexity:>12.1f} {result.coherence:>10.3f} "
+            f"{result.fit_seconds:>9.2f} {peak:>14}"
+        )
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    save_model(lda_model, vectorizer, str(output_path))
-    typer.echo(f"✓ Model saved to {output_path}")
+    save_model(best_model, vectorizer, str(output_path), model_format=model_format)
+    if record_manifest:
+        records, _ = scan_corpus(str(input_dir))
+        save_training_manifest(records, str(output_path))
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "best_n_topics": best_model.n_components,
+            "results": [result.as_dict() for result in results],
+        }
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    typer.echo(f"✓ Best model ({best_model.n_components} topics) saved to {output_path}")
 
 
 @app.command()
 def describe(
     document_path: Path = typer.Argument(..., help="Path to the document to describe", exists=True),
-    model_path: Path = typer.Argument(..., help="Path to the trained model pickle file", exists=True),
+    model_path: Path = typer.Argument(..., help="Path to the trained model (pickle file or artifact directory)", exists=True),
     n_topics: int = typer.Option(3, "--n-topics", "-n", help="Number of topics to display"),
     n_words: int = typer.Option(5, "--n-words", "-w", help="Number of top words per topic"),
+    cache_path: Path = typer.Option(
+        None, "--cache", help="SQLite file caching topic distributions across runs"
+    ),
 ):
     """Describe a document using a trained LDA model."""
+    from ng20lda.core.lda_model import describe_document
+    from ng20lda.core.result_cache import ResultCache, set_result_cache
+
+    if cache_path is not None:
+        set_result_cache(ResultCache(path=str(cache_path)))
     description = describe_document(
         str(document_path),
         str(model_path),
@@ -69,10 +631,237 @@ def describe(
     typer.echo(description)
 
 
+def _write_batch_results(results, output, output_format):
+    """Write batch description results as JSONL or CSV, one row at a time."""
+    if output_format == "jsonl":
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+        return
+
+    writer = csv.writer(output)
+    writer.writerow(["document", "rank", "topic", "probability", "words"])
+    for result in results:
+        for topic in result["topics"]:
+            writer.writerow([
+                result["document"],
+                topic["rank"],
+                topic["topic"],
+                f"{topic['probability']:.6f}",
+                " ".join(topic["words"]),
+            ])
+
+
+def _batch_documents(source):
+    """Return ``(document_paths, corpus_path)`` for a directory, glob or packed corpus.
+
+    For a packed corpus the documents are its IDs. Exits when nothing matches.
+    """
+    from ng20lda.core.corpus_store import PackedCorpus, is_packed_corpus
+    from ng20lda.core.document_processor import find_documents
+
+    corpus_path = None
+    if is_packed_corpus(source):
+        corpus_path = source
+        with PackedCorpus(source) as corpus:
+            document_paths = list(corpus.ids)
+    else:
+        document_paths = find_documents(source)
+    if not document_paths:
+        typer.echo("Error: No documents found!", err=True)
+        raise typer.Exit(code=1)
+    return document_paths, corpus_path
+
+
+@app.command("describe-batch")
+def describe_batch(
+    source: str = typer.Argument(
+        ..., help="Directory, glob pattern or packed corpus of documents to describe"
+    ),
+    model_path: Path = typer.Argument(..., help="Path to the trained model (pickle file or artifact directory)", exists=True),
+    n_topics: int = typer.Option(3, "--n-topics", "-n", help="Number of topics per document"),
+    n_words: int = typer.Option(5, "--n-words", "-w", help="Number of top words per topic"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", help="Documents scored per vectorized pass"),
+    workers: int = typer.Option(1, "--workers", help="Processes used to vectorize documents"),
+    output_format: str = typer.Option("jsonl", "--format", "-f", help="Output format: jsonl or csv"),
+    output: Path = typer.Option(None, "--output", "-o", help="Output file (defaults to stdout)"),
+):
+    """Describe every document in a directory or glob using a trained LDA model."""
+    from ng20lda.core.lda_model import describe_documents
+
+    if output_format not in ("jsonl", "csv"):
+        typer.echo("Error: --format must be 'jsonl' or 'csv'.", err=True)
+        raise typer.Exit(code=1)
+
+    document_paths, corpus_path = _batch_documents(source)
+
+    results = describe_documents(
+        document_paths,
+        str(model_path),
+        n_topics=n_topics,
+        n_words=n_words,
+        chunk_size=chunk_size,
+        workers=workers,
+        corpus_path=corpus_path,
+    )
+    if output is None:
+        _write_batch_results(results, sys.stdout, output_format)
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        _write_batch_results(results, f, output_format)
+    typer.echo(f"✓ Described {len(document_paths)} documents into {output}")
+
+
+@app.command()
+def index(
+    source: str = typer.Argument(
+        ..., help="Directory, glob pattern or packed corpus of documents to index"
+    ),
+    model_path: Path = typer.Argument(..., help="Path to the trained model (pickle file or artifact directory)", exists=True),
+    output: Path = typer.Option(..., "--output", "-o", help="Similarity index directory to create"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", help="Documents scored per vectorized pass"),
+    workers: int = typer.Option(1, "--workers", help="Processes used to vectorize documents"),
+):
+    """Compute and save the topic distributions of a corpus for similarity search."""
+    from ng20lda.core.similarity import build_similarity_index
+
+    document_paths, corpus_path = _batch_documents(source)
+    n_documents = build_similarity_index(
+        document_paths,
+        str(model_path),
+        str(output),
+        chunk_size=chunk_size,
+        workers=workers,
+        corpus_path=corpus_path,
+    )
+    typer.echo(f"✓ Indexed {n_documents} documents into {output}")
+
+
+@app.command()
+def similar(
+    index_path: Path = typer.Argument(..., help="Similarity index directory", exists=True),
+    document_path: Path = typer.Argument(
+        None, help="Document to find related documents for", exists=True
+    ),
+    doc_id: str = typer.Option(None, "--id", help="Use an indexed document as the query"),
+    model_path: Path = typer.Option(
+        None, "--model", help="Model the index was built with, to score DOCUMENT_PATH", exists=True
+    ),
+    k: int = typer.Option(10, "--top-k", "-k", help="Number of related documents"),
+    metric: str = typer.Option("hellinger", "--metric", help="Distance: hellinger or cosine"),
+    n_probe: int = typer.Option(
+        None, "--probe", help="Only scan documents whose dominant topic is among the query's N strongest"
+    ),
+):
+    """Find the indexed documents closest to a document."""
+    from ng20lda.core.similarity import METRICS, SimilarityIndex
+
+    if metric not in METRICS:
+        typer.echo(f"Error: --metric must be one of {', '.join(METRICS)}.", err=True)
+        raise typer.Exit(code=1)
+    if (document_path is None) == (doc_id is None):
+        typer.echo("Error: Give either DOCUMENT_PATH or --id.", err=True)
+        raise typer.Exit(code=1)
+
+    with SimilarityIndex(str(index_path)) as similarity_index:
+        if doc_id is not None:
+            try:
+                results = similarity_index.query_id(doc_id, k, metric, n_probe)
+            except KeyError:
+                typer.echo(f"Error: {doc_id} is not in the index.", err=True)
+                raise typer.Exit(code=1)
+        else:
+            from ng20lda.core.lda_model import get_document_topic_distribution
+            from ng20lda.core.model_cache import model_content_hash
+
+            if model_path is None:
+                typer.echo("Error: --model is required to score a document.", err=True)
+                raise typer.Exit(code=1)
+            if model_content_hash(str(model_path)) != similarity_index.model_hash:
+                typer.echo(f"Error: {index_path} was built with a different model.", err=True)
+                raise typer.Exit(code=1)
+            distribution = get_document_topic_distribution(str(document_path), str(model_path))
+            results = similarity_index.query(distribution, k, metric, n_probe)
+
+    for related_id, distance in results:
+        typer.echo(f"{distance:.6f}\t{related_id}")
+
+
+@app.command()
+def bench(
+    n_documents: int = typer.Option(2000, "--n-documents", help="Size of the synthetic corpus"),
+    n_topics: int = typer.Option(10, "--n-topics", "-n", help="Number of topics"),
+    queries: int = typer.Option(100, "--queries", help="Documents described per latency stage"),
+    repeat: int = typer.Option(3, "--repeat", help="Repetitions of the save and load stages"),
+    api: bool = typer.Option(True, "--api/--no-api", help="Also benchmark the HTTP endpoints"),
+    output: Path = typer.Option(None, "--output", "-o", help="Write the report as JSON"),
+    baseline: Path = typer.Option(
+        None, "--baseline", help="Report to compare against; exits non-zero on regressions",
+        exists=True,
+    ),
+    tolerance: float = typer.Option(
+        0.25, "--tolerance", help="Allowed relative slowdown of the median latency"
+    ),
+):
+    """Benchmark loading, training, inference and the API on a synthetic corpus."""
+    from ng20lda.bench import compare_reports, load_report, run_benchmarks, save_report
+
+    if n_documents < 1 or queries < 1 or repeat < 1:
+        typer.echo("Error: --n-documents, --queries and --repeat must be positive.", err=True)
+        raise typer.Exit(code=1)
+    report = run_benchmarks(
+        n_documents=n_documents,
+        n_topics=n_topics,
+        queries=queries,
+        repeat=repeat,
+        include_api=api,
+    )
+
+    typer.echo(f"{'stage':<26} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'items/s':>10}")
+    for stage, summary in report["stages"].items():
+        typer.echo(
+            f"{stage:<26} {summary['p50_ms']:>10.2f} {summary['p95_ms']:>10.2f} "
+            f"{summary['p99_ms']:>10.2f} {summary['throughput_per_s']:>10.1f}"
+        )
+    if report["peak_rss_bytes"] is not None:
+        typer.echo(f"Peak RSS: {report['peak_rss_bytes'] / 2 ** 20:.1f} MB")
+    if output is not None:
+        save_report(report, str(output))
+        typer.echo(f"✓ Report saved to {output}")
+
+    if baseline is not None:
+        regressions = compare_reports(report, load_report(str(baseline)), tolerance)
+        for regression in regressions:
+            typer.echo(
+                f"Regression: {regression['stage']} {regression['baseline_ms']:.2f} ms -> "
+                f"{regression['current_ms']:.2f} ms ({regression['ratio']:.2f}x)",
+                err=True,
+            )
+        if regressions:
+            raise typer.Exit(code=1)
+        typer.echo(f"✓ No regressions against {baseline}")
+
+
 @app.command()
 def count(
-    filepath: Path = typer.Argument(..., help="Path to the file to count lines", exists=True),
+    filepath: Path = typer.Argument(
+        ..., help="File to count lines in (.gz, .bz2 and .xz are decompressed)", exists=True
+    ),
+    recursive: bool = typer.Option(
+        False, "--recursive", "-r", help="Total the lines of every file under a directory"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Processes for one large file, or threads with --recursive"
+    ),
 ):
-    """Count the number of lines in a file."""
-    num_lines = count_lines_from_file(str(filepath))
+    """Count the number of lines in a file, or in a directory tree."""
+    if filepath.is_dir():
+        if not recursive:
+            typer.echo(f"Error: {filepath} is a directory; use --recursive.", err=True)
+            raise typer.Exit(code=1)
+        n_files, num_lines = count_lines_in_directory(str(filepath), max_workers=workers)
+        typer.echo(f"Number of files: {n_files}")
+    else:
+        num_lines = count_lines_from_file(str(filepath), workers=workers)
     typer.echo(f"Number of lines: {num_lines}")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import os
 
 
 def configure_logging(level: int = logging.INFO) -> None:
@@ -14,4 +15,32 @@ def configure_logging(level: int = logging.INFO) -> None:
     logging.basicConfig(
         level=level,
         format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-    )
\ No newline at end of file
+    )
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment.
+
+    Args:
+        name (str): Environment variable name.
+        default (int): Value used when the variable is unset or empty.
+
+    Returns:
+        int: The configured value.
+    """
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment.
+
+    Args:
+        name (str): Environment variable name.
+        default (float): Value used when the variable is unset or empty.
+
+    Returns:
+        float: The configured value.
+    """
+    value = os.environ.get(name)
+    return float(value) if value else default
@@ -0,0 +1,274 @@
+"""Versioned, memory-mappable on-disk format for trained models.
+
+An artifact is a directory holding the model arrays as raw ``.npy`` files
+and everything else as JSON::
+
+    model/
+        manifest.json                  format version, hyperparameters, hash
+        components.npy                 LDA ``components_``
+        exp_dirichlet_component.npy    LDA ``exp_dirichlet_component_``
+        vocabulary.npy                 vocabulary terms ordered by column
+        topic_word_indices.npy         top feature indices per topic
+        topic_word_weights.npy         top topic-word probabilities per topic
+
+Models trained with a HashingVectorizer have no vocabulary; they store the
+names of their top features instead::
+
+        feature_indices.npy            hashed features with a known term
+        feature_names.npy              the term shown for each of them
+
+The arrays are loaded with ``mmap_mode='r'``, so every process serving the
+same artifact shares the same pages of the operating system's page cache.
+
+The vocabulary is the exception: loading rebuilds the ``{term: column}``
+dict that ``CountVectorizer`` needs, in each process. ``transform`` looks
+every token up in ``vocabulary_`` one at a time, so a mapping backed by
+``np.searchsorted`` over the shared array would cost a NumPy call per token
+on the inference path. The dict is bounded by ``max_features`` (1000 terms
+by default), which is small next to the topic-word arrays that are shared.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.utils import check_random_state
+
+from ng20lda.core.topic_words import compute_topic_word_index, register_topic_word_index
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "ng20lda-artifact"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+_LDA_STATE = ("doc_topic_prior_", "topic_word_prior_", "n_batch_iter_", "n_iter_", "bound_")
+
+
+def is_artifact(path) -> bool:
+    """Return True if ``path`` is a model artifact directory.
+
+    Args:
+        path (str): Path to check.
+
+    Returns:
+        bool: Whether the path holds an artifact manifest.
+    """
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def _jsonable_params(params):
+    """Convert estimator parameters to JSON-compatible values."""
+    converted = {}
+    for name, value in params.items():
+        if isinstance(value, type) and issubclass(value, np.generic):
+            value = np.dtype(value).name
+        elif isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        elif isinstance(value, tuple):
+            value = list(value)
+        elif isinstance(value, np.generic):
+            value = value.item()
+        if callable(value):
+            raise ValueError(
+                f"Parameter '{name}' is a callable and cannot be stored in an artifact; "
+                "save the model as a pickle instead."
+            )
+        converted[name] = value
+    return converted
+
+
+def _write_array(directory, name, array):
+    """Atomically write ``array`` to ``<directory>/<name>.npy``.
+
+    Replacing the file instead of overwriting it keeps the old inode alive
+    for processes that still have it memory-mapped.
+    """
+    filename = f"{name}.npy"
+    tmp_path = os.path.join(directory, f".{filename}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp_path, os.path.join(directory, filename))
+    return filename
+
+
+def _hash_files(directory, filenames, metadata):
+    """Compute a SHA-256 over array files and canonical metadata."""
+    digest = hashlib.sha256()
+    for filename in sorted(filenames):
+        digest.update(filename.encode("utf-8"))
+        with open(os.path.join(directory, filename), 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    digest.update(json.dumps(metadata, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_artifact(lda_model, vectorizer, output_path, lineage=None):
+    """Save an LDA model and vectorizer as an artifact directory.
+
+    Args:
+        lda_model: Trained LDA model.
+        vectorizer: Fitted CountVectorizer, or a HashingVectorizer.
+        output_path (str): Directory to write the artifact into.
+        lineage (dict, optional): ``{"version": int, "parent": hash}``
+            recorded in the manifest for models updated incrementally.
+
+    Returns:
+        str: Content hash of the artifact.
+    """
+    os.makedirs(output_path, exist_ok=True)
+
+    index = compute_topic_word_index(lda_model, vectorizer)
+    arrays = {
+        "components": np.ascontiguousarray(lda_model.components_),
+        "exp_dirichlet_component": np.ascontiguousarray(lda_model.exp_dirichlet_component_),
+        "topic_word_indices": index.indices,
+        "topic_word_weights": index.weights,
+    }
+    if isinstance(vectorizer, HashingVectorizer):
+        names = getattr(vectorizer, "feature_names_", {})
+        arrays["feature_indices"] = np.array(sorted(names), dtype=np.int64)
+        arrays["feature_names"] = np.array([names[i] for i in sorted(names)], dtype=str)
+    else:
+        vocabulary = vectorizer.vocabulary_
+        arrays["vocabulary"] = np.array(sorted(vocabulary, key=vocabulary.get))
+    files = {name: _write_array(output_path, name, array) for name, array in arrays.items()}
+
+    metadata = {
+        "lda_params": _jsonable_params(lda_model.get_params()),
+        "lda_state": {
+            name: getattr(lda_model, name).item()
+            if isinstance(getattr(lda_model, name), np.generic)
+            else getattr(lda_model, name)
+            for name in _LDA_STATE
+            if hasattr(lda_model, name)
+        },
+        "vectorizer_class": type(vectorizer).__name__,
+        "vectorizer_params": _jsonable_params(vectorizer.get_params()),
+        "arrays": {
+            name: {"file": files[name], "dtype": array.dtype.str, "shape": list(array.shape)}
+            for name, array in arrays.items()
+        },
+    }
+    if lineage is not None:
+        metadata["lineage"] = lineage
+    content_hash = _hash_files(output_path, files.values(), metadata)
+    manifest = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "content_hash": content_hash,
+        **metadata,
+    }
+
+    # The manifest is written last, so an interrupted save never leaves a
+    # manifest pointing at arrays that were not written.
+    tmp_path = os.path.join(output_path, f".{MANIFEST_NAME}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(output_path, MANIFEST_NAME))
+
+    logger.info("Model artifact saved to %s (sha256 %s)", output_path, content_hash[:12])
+    return content_hash
+
+
+def read_manifest(model_path):
+    """Read and validate an artifact manifest.
+
+    Args:
+        model_path (str): Artifact directory.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        ValueError: If the manifest has an unknown format or version.
+    """
+    with open(os.path.join(model_path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_NAME:
+        raise ValueError(f"{model_path} is not an ng20lda model artifact.")
+    if manifest.get("format_version", 0) > FORMAT_VERSION:
+        raise ValueError(
+            f"Artifact format version {manifest['format_version']} is newer than "
+            f"supported version {FORMAT_VERSION}."
+        )
+    return manifest
+
+
+def _restore_params(params):
+    if "ngram_range" in params:
+        params["ngram_range"] = tuple(params["ngram_range"])
+    if "dtype" in params:
+        params["dtype"] = np.dtype(params["dtype"]).type
+    return params
+
+
+def load_artifact(model_path, mmap_mode='r'):
+    """Load an LDA model and vectorizer from an artifact directory.
+
+    Args:
+        model_path (str): Artifact directory.
+        mmap_mode (str, optional): Memory-map mode passed to ``np.load``;
+            ``None`` reads the arrays into private memory.
+
+    Returns:
+        tuple: (lda_model, vectorizer)
+    """
+    manifest = read_manifest(model_path)
+    arrays = {
+        name: np.load(os.path.join(model_path, spec["file"]), mmap_mode=mmap_mode)
+        for name, spec in manifest["arrays"].items()
+    }
+
+    lda_model = LatentDirichletAllocation(**manifest["lda_params"])
+    lda_model.components_ = arrays["components"]
+    lda_model.exp_dirichlet_component_ = arrays["exp_dirichlet_component"]
+    lda_model.n_features_in_ = arrays["components"].shape[1]
+    lda_model.random_state_ = check_random_state(lda_model.random_state)
+    for name, value in manifest["lda_state"].items():
+        setattr(lda_model, name, value)
+
+    params = _restore_params(manifest["vectorizer_params"])
+    if manifest["vectorizer_class"] == "CountVectorizer":
+        vectorizer = CountVectorizer(**params)
+        # Deliberately a private dict, see the module docstring
+        terms = arrays["vocabulary"].tolist()
+        vectorizer.vocabulary_ = dict(zip(terms, range(len(terms))))
+        vectorizer.fixed_vocabulary_ = False
+    elif manifest["vectorizer_class"] == "HashingVectorizer":
+        vectorizer = HashingVectorizer(**params)
+        vectorizer.feature_names_ = dict(
+            zip(arrays["feature_indices"].tolist(), arrays["feature_names"].tolist())
+        )
+    else:
+        raise ValueError(f"Unsupported vectorizer class {manifest['vectorizer_class']}.")
+
+    if "topic_word_indices" in arrays:
+        register_topic_word_index(
+            lda_model,
+            arrays["topic_word_indices"],
+            arrays["topic_word_weights"],
+            vectorizer,
+        )
+    return lda_model, vectorizer
+
+
+def artifact_size(model_path):
+    """Return the total size in bytes of the files in an artifact.
+
+    Args:
+        model_path (str): Artifact directory.
+
+    Returns:
+        int: Combined size of the artifact files.
+    """
+    return sum(
+        entry.stat().st_size for entry in os.scandir(model_path) if entry.is_file()
+    )
@@ -0,0 +1,314 @@
+"""Packed corpus format: one data file and an offsets index.
+
+Millions of tiny ``.txt`` files make loading a corpus dominated by
+directory walks and ``open`` calls. A packed corpus stores the same
+documents in a directory holding a handful of files::
+
+    corpus/
+        manifest.json    format version and document count
+        data.bin         concatenated UTF-8 payloads
+        offsets.npy      int64 byte offsets, one more than documents
+        ids.txt          document IDs, one per line, in storage order
+
+``data.bin`` and ``offsets.npy`` are memory-mapped, so slicing a document
+out of the corpus is zero-copy and random access by index or ID costs no
+system call.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+from array import array
+from itertools import islice
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "ng20lda-corpus"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "data.bin"
+OFFSETS_NAME = "offsets.npy"
+IDS_NAME = "ids.txt"
+
+
+def is_packed_corpus(path) -> bool:
+    """Return True if ``path`` is a packed corpus directory.
+
+    Args:
+        path (str): Path to check.
+
+    Returns:
+        bool: Whether the path holds a packed corpus manifest.
+    """
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        return False
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("format") == FORMAT_NAME
+
+
+class PackedCorpusWriter:
+    """Write documents into a packed corpus in a single sequential pass.
+
+    Payloads are appended to ``data.bin`` through a buffered file; the
+    offsets, IDs and manifest are written when the writer is closed, the
+    manifest last, so an interrupted write is never mistaken for a
+    complete corpus. Until then the previous corpus stays readable, and
+    leaving a ``with`` block with an exception calls :meth:`abort`, which
+    keeps it as it was.
+
+    Args:
+        path (str): Corpus directory.
+        append (bool): Add documents to an existing corpus instead of
+            replacing it.
+        buffer_size (int): Write buffer size in bytes.
+    """
+
+    def __init__(self, path, append=False, buffer_size=8 * 1024 * 1024):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._offsets = array('q', [0])
+        self._ids = []
+        self._known = set()
+        mode = 'wb'
+        if append and is_packed_corpus(path):
+            with PackedCorpus(path) as existing:
+                self._offsets = array('q', existing.offsets.tolist())
+                self._ids = list(existing.ids)
+            self._known = set(self._ids)
+            mode = 'ab'
+        self._base = self._offsets[-1]
+        self._n_existing = len(self._ids)
+        # A new corpus is written beside the old data file and swapped in on
+        # close, so processes that have the old file mapped keep a valid map.
+        # Appending only writes past the end that readers know about.
+        data_path = os.path.join(path, DATA_NAME)
+        self._data_tmp = None if mode == 'ab' else os.path.join(path, f".{DATA_NAME}.tmp")
+        self._data = open(self._data_tmp or data_path, mode, buffering=buffer_size)
+        if mode == 'ab':
+            self._data.truncate(self._offsets[-1])
+
+    def add(self, doc_id, text):
+        """Append one document.
+
+        Args:
+            doc_id (str): Unique document ID.
+            text (str): Document text.
+
+        Raises:
+            ValueError: If the ID contains a newline or is already present.
+        """
+        if '\n' in doc_id:
+            raise ValueError(f"Document ID {doc_id!r} contains a newline.")
+        if doc_id in self._known:
+            raise ValueError(f"Document ID {doc_id!r} is already in the corpus.")
+        payload = text.encode('utf-8', errors='ignore')
+        self._data.write(payload)
+        self._offsets.append(self._offsets[-1] + len(payload))
+        self._ids.append(doc_id)
+        self._known.add(doc_id)
+
+    def add_many(self, documents):
+        """Append ``(doc_id, text)`` pairs.
+
+        Args:
+            documents (iterable): Pairs of document ID and text.
+        """
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+    def close(self):
+        """Flush the data and write the index and manifest."""
+        if self._data is None:
+            return
+        self._data.close()
+        self._data = None
+        # Drop the manifest while the index is replaced, so a crash part way
+        # leaves a corpus that is not mistaken for a complete one
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        if self._data_tmp is not None:
+            os.replace(self._data_tmp, os.path.join(self.path, DATA_NAME))
+
+        def replace(name, write):
+            tmp_path = os.path.join(self.path, f".{name}.tmp")
+            write(tmp_path)
+            os.replace(tmp_path, os.path.join(self.path, name))
+
+        def write_ids(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+                for doc_id in self._ids:
+                    f.write(doc_id + '\n')
+
+        def write_offsets(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.frombuffer(self._offsets, dtype=np.int64), allow_pickle=False)
+
+        def write_manifest(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+
+        replace(OFFSETS_NAME, write_offsets)
+        replace(IDS_NAME, write_ids)
+        manifest = {
+            "format": FORMAT_NAME,
+            "format_version": FORMAT_VERSION,
+            "n_documents": len(self._ids),
+            "n_bytes": self._offsets[-1],
+        }
+        replace(MANIFEST_NAME, write_manifest)
+        logger.info("Packed corpus %s holds %s documents", self.path, len(self._ids))
+
+    def abort(self):
+        """Discard the documents added so far and keep the previous corpus."""
+        if self._data is None:
+            return
+        self._data.close()
+        self._data = None
+        if self._data_tmp is not None:
+            os.remove(self._data_tmp)
+        else:
+            # Appended bytes lie past the end the old offsets know about
+            os.truncate(os.path.join(self.path, DATA_NAME), self._base)
+        logger.info("Discarded %s documents for %s", len(self._ids) - self._n_existing, self.path)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_packed_corpus(documents, output_path, append=False):
+    """Write ``(doc_id, text)`` pairs into a packed corpus.
+
+    Args:
+        documents (iterable): Pairs of document ID and text, for instance
+            from :func:`ng20lda.core.document_processor.iter_documents`.
+        output_path (str): Corpus directory.
+        append (bool): Add to an existing corpus instead of replacing it.
+
+    Returns:
+        int: Number of documents in the corpus.
+    """
+    with PackedCorpusWriter(output_path, append=append) as writer:
+        writer.add_many(documents)
+    return len(writer)
+
+
+class PackedCorpus:
+    """Read-only, memory-mapped view of a packed corpus.
+
+    Args:
+        path (str): Corpus directory.
+
+    Raises:
+        ValueError: If the directory is not a supported packed corpus.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not a packed ng20lda corpus.")
+        if manifest.get("format_version", 0) > FORMAT_VERSION:
+            raise ValueError(
+                f"Corpus format version {manifest['format_version']} is newer than "
+                f"supported version {FORMAT_VERSION}."
+            )
+        self.offsets = np.load(os.path.join(path, OFFSETS_NAME), mmap_mode='r')
+        with open(os.path.join(path, IDS_NAME), 'r', encoding='utf-8', newline='\n') as f:
+            self.ids = f.read().split('\n')[:-1]
+        if len(self.ids) != len(self.offsets) - 1:
+            raise ValueError(f"Corpus {path} has mismatched IDs and offsets.")
+
+        self._data = memoryview(b"")
+        if self.offsets[-1] > 0:
+            with open(os.path.join(path, DATA_NAME), 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = memoryview(self._mmap)
+        self._index = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, doc_id):
+        """Return the storage position of a document ID.
+
+        Raises:
+            KeyError: If the ID is not in the corpus.
+        """
+        if self._index is None:
+            self._index = {doc_id: position for position, doc_id in enumerate(self.ids)}
+        return self._index[doc_id]
+
+    def document_bytes(self, index):
+        """Return the UTF-8 payload of a document without copying it.
+
+        The returned memoryview points into the memory-mapped data file and
+        must not be used after the corpus is closed.
+
+        Args:
+            index (int): Storage position of the document.
+
+        Returns:
+            memoryview: The document's bytes.
+        """
+        return self._data[int(self.offsets[index]):int(self.offsets[index + 1])]
+
+    def __getitem__(self, index):
+        return str(self.document_bytes(index), 'utf-8', errors='ignore')
+
+    def get(self, doc_id):
+        """Return the text of a document by ID.
+
+        Raises:
+            KeyError: If the ID is not in the corpus.
+        """
+        return self[self.index_of(doc_id)]
+
+    def iter_documents(self, start=0, stop=None):
+        """Yield ``(doc_id, text)`` pairs in storage order.
+
+        Args:
+            start (int): First position to read.
+            stop (int, optional): Position to stop before.
+
+        Yields:
+            tuple: (doc_id, text)
+        """
+        stop = len(self) if stop is None else stop
+        for position, doc_id in enumerate(islice(self.ids, start, stop), start):
+            yield doc_id, self[position]
+
+    def close(self):
+        """Release the memory map once no payload views remain."""
+        self._data.release()
+        self._data = memoryview(b"")
+        mapped = getattr(self, "_mmap", None)
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                # Views handed out by document_bytes keep the map alive;
+                # it is unmapped when the last of them is released.
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,23 +1,58 @@
 """Functions to fetch and save 20 newsgroups data."""
 
+import hashlib
+import json
 import logging
 import os
+import re
+import tarfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from sklearn.datasets import fetch_20newsgroups
+from ng20lda.core.corpus_store import PackedCorpus, is_packed_corpus, write_packed_corpus
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REMOVE = ('headers', 'footers', 'quotes')
+SUBSET_FOLDERS = {
+    'train': ('20news-bydate-train',),
+    'test': ('20news-bydate-test',),
+    'all': ('20news-bydate-train', '20news-bydate-test'),
+}
+INGEST_MANIFEST_NAME = ".ingest-manifest.jsonl"
+WRITE_BATCH_SIZE = 256
 
-def fetch_and_save_ng20(category, n_documents, output_dir):
+
+def _pack_new_documents(documents, output_dir):
+    """Append the documents whose IDs a packed corpus does not hold yet.
+
+    Returns:
+        tuple: ``(n_written, n_skipped)``
+    """
+    existing = set()
+    if is_packed_corpus(output_dir):
+        with PackedCorpus(output_dir) as corpus:
+            existing = set(corpus.ids)
+    pending = [(doc_id, text) for doc_id, text in documents if doc_id not in existing]
+    write_packed_corpus(pending, output_dir, append=True)
+    return len(pending), len(documents) - len(pending)
+
+
+def fetch_and_save_ng20(category, n_documents, output_dir, packed=False):
     """Fetch N documents from a specific 20newsgroups category and save them.
     
     Args:
         category (str): Category name from 20newsgroups dataset.
         n_documents (int): Number of documents to fetch.
         output_dir (str): Base directory where to save the documents.
+        packed (bool): Append the documents to a packed corpus at
+            ``output_dir`` in one bulk write instead of writing one file
+            per document. Document IDs match the file layout, e.g.
+            ``comp_graphics/0.txt``; IDs already in the corpus are kept
+            and their documents skipped.
         
     Returns:
-        str: Path to the created category directory.
+        str: Path to the created category directory, or to the packed
+        corpus.
         
     Raises:
         ValueError: If category is not valid or n_documents is negative.
@@ -28,6 +63,9 @@ def fetch_and_save_ng20(category, n_documents, output_dir):
         category,
         output_dir,
     )
+    # scikit-learn's dataset loaders are slow to import; only fetch needs them
+    from sklearn.datasets import fetch_20newsgroups
+
     # Fetch the data for the specific category
     newsgroups = fetch_20newsgroups(
         subset='train',
@@ -38,8 +76,19 @@ def fetch_and_save_ng20(category, n_documents, output_dir):
     # Limit to N documents
     documents = newsgroups.data[:n_documents]
     
+    category_name = category.replace('.', '_')
+    if packed:
+        n_written, n_skipped = _pack_new_documents(
+            [(f"{category_name}/{i}.txt", doc) for i, doc in enumerate(documents)],
+            output_dir,
+        )
+        logger.info(
+            "Packed %s documents into %s (%s already present)", n_written, output_dir, n_skipped
+        )
+        return output_dir
+
     # Create output directory
-    category_dir = os.path.join(output_dir, category.replace('.', '_'))
+    category_dir = os.path.join(output_dir, category_name)
     os.makedirs(category_dir, exist_ok=True)
     
     # Save each document
@@ -49,4 +98,238 @@ def fetch_and_save_ng20(category, n_documents, output_dir):
             f.write(doc)
     
     logger.info("Saved %s documents to %s", len(documents), category_dir)
-    return category_dir
\ No newline at end of file
+    return category_dir
+
+
+# Quote markers of scikit-learn's fetch_20newsgroups(remove=('quotes',)). The
+# strip helpers below follow scikit-learn, which keeps them private.
+_QUOTE_RE = re.compile(
+    r"(writes in|writes:|wrote:|says:|said:|^In article|^Quoted from|^\||^>)"
+)
+
+
+def _strip_header(text):
+    """Remove everything before the first blank line."""
+    _, _, after = text.partition("\n\n")
+    return after
+
+
+def _strip_footer(text):
+    """Remove the signature block after the last blank or all-hyphen line."""
+    lines = text.strip().split("\n")
+    for line_num in range(len(lines) - 1, -1, -1):
+        if lines[line_num].strip().strip("-") == "":
+            break
+    if line_num > 0:
+        return "\n".join(lines[:line_num])
+    return text
+
+
+def _strip_quoting(text):
+    """Remove quoted lines and the lines that introduce a quote."""
+    return "\n".join(line for line in text.split("\n") if not _QUOTE_RE.search(line))
+
+
+def _strip(text, remove):
+    if 'headers' in remove:
+        text = _strip_header(text)
+    if 'footers' in remove:
+        text = _strip_footer(text)
+    if 'quotes' in remove:
+        text = _strip_quoting(text)
+    return text
+
+
+def _load_archive(archive_path, subset, remove):
+    """Read every document of a subset from a ``20news-bydate`` tarball in one pass."""
+    folders = SUBSET_FOLDERS[subset]
+    found = {}
+    with tarfile.open(archive_path, 'r:*') as archive:
+        for member in archive:
+            parts = [part for part in member.name.split('/') if part not in ('', '.')]
+            if not member.isfile() or len(parts) != 3 or parts[0] not in folders:
+                continue
+            text = archive.extractfile(member).read().decode('latin1')
+            found.setdefault(parts[1], []).append((folders.index(parts[0]), parts[2], text))
+    # Same order as scikit-learn: subsets, then sorted file names per category
+    return {
+        category: [_strip(text, remove) for _, _, text in sorted(documents)]
+        for category, documents in sorted(found.items())
+    }
+
+
+def _load_cache(data_home, subset, remove):
+    """Read every document of a subset from the scikit-learn dataset cache."""
+    from sklearn.datasets import fetch_20newsgroups, get_data_home
+
+    try:
+        newsgroups = fetch_20newsgroups(
+            data_home=data_home,
+            subset=subset,
+            remove=remove,
+            shuffle=False,
+            download_if_missing=False,
+        )
+    except OSError:
+        raise FileNotFoundError(
+            f"20 Newsgroups is not in the scikit-learn cache at {get_data_home(data_home)}; "
+            "pass the 20news-bydate.tar.gz archive instead."
+        ) from None
+    # The cache is shuffled; file paths end in <subset folder>/<category>/<name>
+    folders = SUBSET_FOLDERS[subset]
+    found = {name: [] for name in newsgroups.target_names}
+    for text, target, filename in zip(newsgroups.data, newsgroups.target, newsgroups.filenames):
+        parts = os.path.normpath(filename).split(os.sep)
+        found[newsgroups.target_names[target]].append((folders.index(parts[-3]), parts[-1], text))
+    return {
+        category: [text for _, _, text in sorted(documents)]
+        for category, documents in found.items()
+    }
+
+
+def load_newsgroups(categories=None, subset='train', data_home=None, archive=None,
+                    remove=DEFAULT_REMOVE):
+    """Load 20 Newsgroups documents from local data, without network access.
+
+    Documents are read once, either from a ``20news-bydate.tar.gz`` archive
+    or from the scikit-learn dataset cache, and returned in the same order
+    for both sources: training documents before test documents, each in
+    file name order.
+
+    Args:
+        categories (list, optional): Category names; all when omitted.
+        subset (str): ``'train'``, ``'test'`` or ``'all'``.
+        data_home (str, optional): scikit-learn data directory.
+        archive (str, optional): Path to a ``20news-bydate`` tarball, read
+            instead of the scikit-learn cache.
+        remove (tuple): Parts of each post to strip, as in
+            ``fetch_20newsgroups``.
+
+    Returns:
+        dict: Mapping of category name to its list of documents.
+
+    Raises:
+        ValueError: If ``subset`` or a category is unknown.
+        FileNotFoundError: If the dataset is not available locally.
+    """
+    if subset not in SUBSET_FOLDERS:
+        raise ValueError(f"subset must be one of {', '.join(SUBSET_FOLDERS)}.")
+    if archive is not None:
+        documents = _load_archive(archive, subset, remove)
+    else:
+        documents = _load_cache(data_home, subset, remove)
+    if categories is None:
+        return documents
+    unknown = sorted(set(categories) - set(documents))
+    if unknown:
+        raise ValueError(f"Unknown categories: {', '.join(unknown)}")
+    return {category: documents[category] for category in categories}
+
+
+def _read_ingest_manifest(path):
+    """Read an ingest manifest, ignoring a line torn by an interrupted run.
+
+    Returns:
+        tuple: ``({doc_id: record}, torn)`` where ``torn`` tells whether the
+        file ends in the middle of a line.
+    """
+    records = {}
+    line = "\n"
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record["id"]] = record
+    return records, not line.endswith("\n")
+
+
+def _write_batch(output_dir, batch):
+    records = []
+    for doc_id, payload, digest in batch:
+        with open(os.path.join(output_dir, doc_id), 'wb') as f:
+            f.write(payload)
+        records.append({"id": doc_id, "size": len(payload), "sha256": digest})
+    return records
+
+
+def ingest_ng20(output_dir, categories=None, n_documents=None, subset='train', data_home=None,
+                archive=None, packed=False, workers=8, batch_size=WRITE_BATCH_SIZE):
+    """Save many 20 Newsgroups categories in one run, resuming interrupted runs.
+
+    The source is loaded once (see :func:`load_newsgroups`) and documents
+    are saved as ``<category>/<i>.txt`` in file name order, so ``n_documents``
+    keeps the first files of each category. :func:`fetch_and_save_ng20`
+    uses the same layout but scikit-learn's shuffled order, so the same
+    path holds a different post in each. Category directories are created up front and
+    files are written in batches by a thread pool. Each finished batch is
+    appended to ``.ingest-manifest.jsonl`` in ``output_dir`` with the size
+    and SHA-256 of its files, so a later run skips files that are recorded
+    with the same contents and size and rewrites the rest.
+
+    With ``packed``, documents are appended to a packed corpus instead,
+    skipping IDs it already holds.
+
+    Args:
+        output_dir (str): Base directory, or packed corpus directory.
+        categories (list, optional): Category names; all when omitted.
+        n_documents (int, optional): Maximum documents per category.
+        subset (str): ``'train'``, ``'test'`` or ``'all'``.
+        data_home (str, optional): scikit-learn data directory.
+        archive (str, optional): Path to a ``20news-bydate`` tarball.
+        packed (bool): Write a packed corpus.
+        workers (int): Threads writing files.
+        batch_size (int): Files written per thread pool task.
+
+    Returns:
+        tuple: ``(n_written, n_skipped)`` document counts.
+    """
+    newsgroups = load_newsgroups(categories, subset, data_home, archive)
+    documents = [
+        (f"{category.replace('.', '_')}/{i}.txt", text)
+        for category, texts in newsgroups.items()
+        for i, text in enumerate(texts[:n_documents])
+    ]
+    logger.info("Ingesting %s documents from %s categories", len(documents), len(newsgroups))
+
+    if packed:
+        return _pack_new_documents(documents, output_dir)
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, INGEST_MANIFEST_NAME)
+    done, torn = _read_ingest_manifest(manifest_path)
+    pending = []
+    for doc_id, text in documents:
+        payload = text.encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+        record = done.get(doc_id)
+        if record is not None and record["sha256"] == digest:
+            path = os.path.join(output_dir, doc_id)
+            if os.path.isfile(path) and os.path.getsize(path) == record["size"]:
+                continue
+        pending.append((doc_id, payload, digest))
+
+    for directory in {os.path.dirname(doc_id) for doc_id, _, _ in pending}:
+        os.makedirs(os.path.join(output_dir, directory), exist_ok=True)
+
+    n_written = 0
+    with open(manifest_path, 'a', encoding='utf-8') as manifest, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        if torn:
+            manifest.write("\n")
+        futures = [
+            executor.submit(_write_batch, output_dir, pending[start:start + batch_size])
+            for start in range(0, len(pending), batch_size)
+        ]
+        for future in as_completed(futures):
+            records = future.result()
+            manifest.write("".join(json.dumps(record) + "\n" for record in records))
+            manifest.flush()
+            n_written += len(records)
+    logger.info(
+        "Wrote %s documents into %s, %s already up to date",
+        n_written, output_dir, len(documents) - n_written,
+    )
+    return n_written, len(documents) - n_written
@@ -1,58 +1,255 @@
 """Functions for processing documents."""
 
+import glob
 import logging
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-from sklearn.feature_extraction.text import CountVectorizer
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
+from ng20lda.core.corpus_store import PackedCorpus, is_packed_corpus
+from ng20lda.core.metrics import count_documents, timed
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_HASH_FEATURES = 2 ** 16
+
+
+def iter_document_paths(directory):
+    """Yield the paths of all .txt files under a directory in a stable order.
+
+    Args:
+        directory (str): Root directory to search for .txt files.
+
+    Yields:
+        str: Path of each .txt file, visiting directories and files in
+        sorted order.
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith('.txt'):
+                yield os.path.join(root, file)
+
+
+def read_document(filepath):
+    """Read a document as text, ignoring undecodable bytes.
+
+    Args:
+        filepath (str): Path to the document.
+
+    Returns:
+        str: Document contents.
+    """
+    with timed("read_document"), open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def iter_documents(directory, max_workers=None):
+    """Lazily yield ``(doc_id, text)`` pairs for every .txt file under a directory.
+
+    Document IDs are paths relative to ``directory`` using ``/`` separators,
+    so they are stable across runs and platforms. When ``max_workers`` is
+    set, files are read by a thread pool with at most ``2 * max_workers``
+    reads in flight, which hides filesystem latency without reading ahead
+    of the consumer.
+
+    ``directory`` may also be a packed corpus (see
+    :mod:`ng20lda.core.corpus_store`), whose documents are read from its
+    memory-mapped data file in storage order.
+
+    Args:
+        directory (str): Root directory to search for .txt files, or a
+            packed corpus directory.
+        max_workers (int, optional): Number of reader threads. Files are
+            read sequentially when omitted.
+
+    Yields:
+        tuple: (doc_id, text)
+    """
+    if is_packed_corpus(directory):
+        with PackedCorpus(directory) as corpus:
+            yield from corpus.iter_documents()
+        return
+
+    def doc_id(filepath):
+        return os.path.relpath(filepath, directory).replace(os.sep, '/')
+
+    paths = iter_document_paths(directory)
+    if not max_workers or max_workers <= 1:
+        for filepath in paths:
+            yield doc_id(filepath), read_document(filepath)
+        return
+
+    window = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for filepath in paths:
+            pending.append((doc_id(filepath), executor.submit(read_document, filepath)))
+            if len(pending) >= window:
+                identifier, future = pending.popleft()
+                yield identifier, future.result()
+        while pending:
+            identifier, future = pending.popleft()
+            yield identifier, future.result()
+
+
+def iter_document_chunks(directory, chunk_size, max_workers=None):
+    """Lazily yield fixed-size chunks of documents from a directory.
+
+    Args:
+        directory (str): Root directory of .txt files, or a packed corpus.
+        chunk_size (int): Maximum number of documents per chunk.
+        max_workers (int, optional): Number of reader threads.
+
+    Yields:
+        tuple: (doc_ids, texts) lists of at most ``chunk_size`` items.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    documents = iter_documents(directory, max_workers=max_workers)
+    while True:
+        chunk = list(islice(documents, chunk_size))
+        if not chunk:
+            return
+        doc_ids, texts = zip(*chunk)
+        yield list(doc_ids), list(texts)
+
 
 def load_documents_recursive(directory):
     """Load all .txt files recursively from a directory.
-    
+
+    Prefer :func:`iter_documents` for large corpora, since this function
+    holds every document in memory at once.
+
     Args:
-        directory (str): Root directory to search for .txt files.
-        
+        directory (str): Root directory of .txt files, or a packed corpus.
+
     Returns:
         list: List of document contents as strings.
     """
     logger.info("Loading documents recursively from %s", directory)
-    documents = []
-    
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.txt'):
-                filepath = os.path.join(root, file)
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    documents.append(f.read())
-    
+    documents = [text for _, text in iter_documents(directory)]
     logger.info("Loaded %s documents from %s", len(documents), directory)
     return documents
 
 
-def vectorize_documents(documents, max_features=1000):
-    """Vectorize documents using CountVectorizer.
-    
+def find_documents(source):
+    """Resolve a directory, glob pattern or single file into document paths.
+
+    Directories are searched recursively for .txt files. Glob patterns
+    support ``**`` for recursive matching.
+
+    Args:
+        source (str): Directory, glob pattern or file path.
+
+    Returns:
+        list: Sorted list of document paths.
+    """
+    if os.path.isdir(source):
+        paths = iter_document_paths(source)
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        paths = [path for path in glob.glob(source, recursive=True) if os.path.isfile(path)]
+
+    return sorted(paths)
+
+
+def build_vectorizer(max_features=1000):
+    """Create the CountVectorizer configuration used across the package.
+
     Args:
-        documents (list): List of document strings.
         max_features (int): Maximum number of features for the vectorizer.
-        
+
     Returns:
-        tuple: (document-term matrix, fitted vectorizer)
+        CountVectorizer: Unfitted vectorizer.
     """
-    vectorizer = CountVectorizer(
+    return CountVectorizer(
         max_features=max_features,
         stop_words='english',
         max_df=0.95,
-        min_df=2
+        min_df=2,
+        dtype=np.float32,
     )
+
+
+def build_hashing_vectorizer(n_features=DEFAULT_HASH_FEATURES):
+    """Create a HashingVectorizer with the package's tokenization.
+
+    Terms are hashed into a fixed number of columns, so no vocabulary pass
+    is needed and the vectorizer holds no per-term state. Signs are not
+    alternated and rows are not normalized, so the matrix holds the
+    non-negative counts LDA expects. Document frequency pruning does not
+    apply.
+
+    Args:
+        n_features (int): Number of hashed features.
+
+    Returns:
+        HashingVectorizer: Vectorizer, ready to ``transform``.
+    """
+    return HashingVectorizer(
+        n_features=n_features,
+        stop_words='english',
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+
+def is_hashing_vectorizer(vectorizer) -> bool:
+    """Return True if ``vectorizer`` hashes terms instead of using a vocabulary."""
+    return isinstance(vectorizer, HashingVectorizer)
+
+
+def minimal_vectorizer(vectorizer):
+    """Return a vectorizer holding only the state ``transform`` needs.
+
+    A fitted CountVectorizer keeps the ``stop_words_`` set of every pruned
+    term (on scikit-learn versions that still record it), and its
+    vocabulary indices are numpy integers, which pickle several times
+    larger than plain ints. The copy keeps the parameters and a plain
+    ``{term: int}`` vocabulary. Hashing vectorizers are returned as they
+    are.
+
+    Args:
+        vectorizer: Fitted vectorizer.
+
+    Returns:
+        Vectorizer that transforms exactly like ``vectorizer``.
+    """
+    if is_hashing_vectorizer(vectorizer):
+        return vectorizer
+    stripped = type(vectorizer)(**vectorizer.get_params())
+    stripped.vocabulary_ = {term: int(index) for term, index in vectorizer.vocabulary_.items()}
+    stripped.fixed_vocabulary_ = vectorizer.fixed_vocabulary_
+    return stripped
+
+
+def vectorize_documents(documents, max_features=1000):
+    """Vectorize documents using CountVectorizer.
     
-    doc_term_matrix = vectorizer.fit_transform(documents)
+    Args:
+        documents (iterable): Document strings. Any iterable works, including
+            a generator from :func:`iter_documents`, so the corpus never has
+            to be held in memory as strings.
+        max_features (int): Maximum number of features for the vectorizer.
+        
+    Returns:
+        tuple: (document-term matrix, fitted vectorizer)
+    """
+    vectorizer = build_vectorizer(max_features)
+    with timed("vectorize_fit"):
+        doc_term_matrix = vectorizer.fit_transform(documents)
+    count_documents("vectorize_fit", doc_term_matrix.shape[0])
     logger.info(
         "Vectorized %s documents with %s features",
-        len(documents),
+        doc_term_matrix.shape[0],
         doc_term_matrix.shape[1],
     )
     
-    return doc_term_matrix, vectorizer
\ No newline at end of file
+    return doc_term_matrix, minimal_vectorizer(vectorizer)
\ No newline at end of file
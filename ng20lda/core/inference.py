@@ -0,0 +1,111 @@
+"""Low-overhead topic inference for single documents."""
+
+from __future__ import annotations
+
+import threading
+import weakref
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import psi
+
+
+class InferenceEngine:
+    """Variational E-step for one document at a time, in plain NumPy.
+
+    ``LatentDirichletAllocation.transform`` validates its input and sets up
+    a joblib dispatch on every call, which dominates the cost for a single
+    short document. This engine captures ``exp(E[log beta])`` and the
+    E-step settings once per model and runs the same fixed-point iteration
+    as scikit-learn directly on the document's sparse term counts. The
+    topic-word array is used in place, so memory-mapped artifacts stay
+    shared between processes.
+
+    Args:
+        lda_model: Trained LDA model.
+    """
+
+    def __init__(self, lda_model):
+        self.source = lda_model.exp_dirichlet_component_
+        self.exp_topic_word = np.asarray(self.source)
+        self.dtype = self.exp_topic_word.dtype
+        self.n_topics, self.n_features = self.exp_topic_word.shape
+        self.doc_topic_prior = lda_model.doc_topic_prior_
+        self.max_iter = lda_model.max_doc_update_iter
+        self.mean_change_tol = lda_model.mean_change_tol
+        self._eps = np.finfo(self.dtype).eps
+        initial = np.ones(self.n_topics, dtype=self.dtype)
+        self._initial_exp_doc_topic = np.exp(psi(initial) - psi(initial.sum()))
+
+    def transform_counts(self, ids, counts):
+        """Infer the normalized topic distribution of one document.
+
+        Args:
+            ids (numpy.ndarray): Feature indices present in the document.
+            counts (numpy.ndarray): Counts for ``ids``.
+
+        Returns:
+            numpy.ndarray: Topic distribution of shape (n_topics,).
+        """
+        # Shape (n_terms, n_topics), contiguous for the matrix products below
+        exp_word_topic_d = np.ascontiguousarray(self.exp_topic_word[:, ids].T)
+        counts = np.asarray(counts, dtype=self.dtype)
+        doc_topic = np.ones(self.n_topics, dtype=self.dtype)
+        exp_doc_topic = self._initial_exp_doc_topic
+
+        for _ in range(self.max_iter):
+            last = doc_topic
+            norm_phi = exp_word_topic_d @ exp_doc_topic + self._eps
+            doc_topic = exp_doc_topic * ((counts / norm_phi) @ exp_word_topic_d)
+            doc_topic += self.doc_topic_prior
+            exp_doc_topic = np.exp(psi(doc_topic) - psi(doc_topic.sum()))
+            if np.abs(last - doc_topic).mean() < self.mean_change_tol:
+                break
+
+        return doc_topic / doc_topic.sum()
+
+    def transform(self, doc_term_matrix):
+        """Infer normalized topic distributions for the rows of a matrix.
+
+        Args:
+            doc_term_matrix: Sparse document-term matrix.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_documents, n_topics).
+        """
+        matrix = sp.csr_matrix(doc_term_matrix)
+        if matrix.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected {self.n_features} features, got {matrix.shape[1]}."
+            )
+        result = np.empty((matrix.shape[0], self.n_topics), dtype=self.dtype)
+        for row in range(matrix.shape[0]):
+            start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+            result[row] = self.transform_counts(
+                matrix.indices[start:stop], matrix.data[start:stop]
+            )
+        return result
+
+
+_engines = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_inference_engine(lda_model):
+    """Return the inference engine for a model, creating it once.
+
+    The engine is rebuilt if the model has been updated since (for instance
+    by ``partial_fit``), which replaces ``exp_dirichlet_component_``.
+
+    Args:
+        lda_model: Trained LDA model.
+
+    Returns:
+        InferenceEngine: Engine bound to ``lda_model``.
+    """
+    with _lock:
+        engine = _engines.get(lda_model)
+        if engine is None or engine.source is not lda_model.exp_dirichlet_component_:
+            engine = InferenceEngine(lda_model)
+            _engines[lda_model] = engine
+    return engine
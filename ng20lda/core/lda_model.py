@@ -2,16 +2,37 @@
 
 from __future__ import annotations
 
-import io
 import logging
+import os
 import pickle
+import time
+from itertools import islice
 
-import matplotlib
 import numpy as np
 from sklearn.decomposition import LatentDirichletAllocation
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt  # noqa: E402
+from ng20lda.core.artifact import (
+    artifact_size,
+    is_artifact,
+    load_artifact,
+    read_manifest,
+    save_artifact,
+)
+from ng20lda.core.corpus_store import PackedCorpus
+from ng20lda.core.document_processor import minimal_vectorizer, read_document
+from ng20lda.core.inference import get_inference_engine
+from ng20lda.core.metrics import count_documents, timed
+from ng20lda.core.model_cache import get_model_cache, load_cached_model
+from ng20lda.core.parallel import ParallelVectorizer
+from ng20lda.core.rendering import render_topic_chart
+from ng20lda.core.result_cache import document_hash, get_result_cache
+from ng20lda.core.topic_words import (
+    compute_topic_word_index,
+    get_topic_word_index,
+    register_topic_word_index,
+    top_k_indices,
+)
+
 
 logger = logging.getLogger(__name__)
 
@@ -34,24 +55,176 @@ def train_lda_model(doc_term_matrix, n_topics=10, random_state=42):
         learning_method='batch'
     )
     
-    lda_model.fit(doc_term_matrix)
+    with timed("train"):
+        lda_model.fit(doc_term_matrix)
+    count_documents("train", doc_term_matrix.shape[0])
     logger.info("LDA model trained with %s topics", n_topics)
     
     return lda_model
 
 
-def save_model(lda_model, vectorizer, output_path):
-    """Save LDA model and vectorizer to a pickle file.
+def train_lda_model_online(
+    make_chunks,
+    total_samples,
+    n_topics=10,
+    batch_size=128,
+    passes=1,
+    random_state=42,
+    checkpoint=None,
+    checkpoint_every=0,
+):
+    """Train an LDA model with online variational Bayes over streamed chunks.
+
+    Each chunk is passed to ``LatentDirichletAllocation.partial_fit``, so
+    peak memory is bounded by the chunk size rather than the corpus size.
+    The vocabulary must be fixed before training so every chunk shares the
+    same feature space.
+
+    Args:
+        make_chunks: Callable returning a fresh iterable of document-term
+            matrices; called once per pass.
+        total_samples (int): Total number of documents in the corpus.
+        n_topics (int): Number of topics for LDA.
+        batch_size (int): Mini-batch size used by ``partial_fit``.
+        passes (int): Number of passes over the corpus.
+        random_state (int): Random state for reproducibility.
+        checkpoint: Optional callable receiving the model every
+            ``checkpoint_every`` chunks and at the end of each pass.
+        checkpoint_every (int): Number of chunks between checkpoints;
+            ``0`` only checkpoints at the end of each pass.
+
+    Returns:
+        LatentDirichletAllocation: Trained LDA model.
+    """
+    if passes < 1:
+        raise ValueError("passes must be at least 1.")
+    lda_model = LatentDirichletAllocation(
+        n_components=n_topics,
+        random_state=random_state,
+        learning_method='online',
+        batch_size=batch_size,
+        total_samples=total_samples,
+    )
+
+    _partial_fit_passes(lda_model, make_chunks, passes, checkpoint, checkpoint_every)
+    logger.info("Online LDA model trained with %s topics over %s passes", n_topics, passes)
+    return lda_model
+
+
+def _partial_fit_passes(lda_model, make_chunks, passes, checkpoint=None, checkpoint_every=0):
+    """Run ``partial_fit`` over every chunk for several passes, with logging."""
+    n_chunks = 0
+    for pass_idx in range(1, passes + 1):
+        pass_start = time.perf_counter()
+        n_documents = 0
+        for chunk in make_chunks():
+            chunk_start = time.perf_counter()
+            with timed("partial_fit"):
+                lda_model.partial_fit(chunk)
+            elapsed = time.perf_counter() - chunk_start
+            count_documents("partial_fit", chunk.shape[0])
+            n_chunks += 1
+            n_documents += chunk.shape[0]
+            logger.info(
+                "Pass %s chunk %s: %s documents in %.3fs (%.1f docs/s)",
+                pass_idx,
+                n_chunks,
+                chunk.shape[0],
+                elapsed,
+                chunk.shape[0] / elapsed if elapsed else float("inf"),
+            )
+            if checkpoint is not None and checkpoint_every and n_chunks % checkpoint_every == 0:
+                checkpoint(lda_model)
+
+        if n_documents == 0:
+            raise ValueError("No documents were provided for online training.")
+        logger.info(
+            "Pass %s finished: %s documents in %.3fs",
+            pass_idx,
+            n_documents,
+            time.perf_counter() - pass_start,
+        )
+        if checkpoint is not None:
+            checkpoint(lda_model)
+
+
+def update_lda_model(lda_model, make_chunks, total_samples, passes=1):
+    """Continue training an existing LDA model on new documents.
+
+    The model keeps its topics and learning-rate schedule; each chunk of new
+    documents is folded in with ``partial_fit``. Read-only arrays (from a
+    memory-mapped artifact) are copied first so the update never writes
+    through to the artifact on disk.
+
+    Args:
+        lda_model: Trained LDA model.
+        make_chunks: Callable returning a fresh iterable of document-term
+            matrices of new documents; called once per pass.
+        total_samples (int): Total number of documents the model now covers,
+            used to weight each update.
+        passes (int): Number of passes over the new documents.
+
+    Returns:
+        LatentDirichletAllocation: The updated model.
+    """
+    if passes < 1:
+        raise ValueError("passes must be at least 1.")
+    lda_model.components_ = np.array(lda_model.components_)
+    lda_model.exp_dirichlet_component_ = np.array(lda_model.exp_dirichlet_component_)
+    lda_model.total_samples = total_samples
+    _partial_fit_passes(lda_model, make_chunks, passes)
+    logger.info("Updated LDA model with %s topics", lda_model.n_components)
+    return lda_model
+
+
+def infer_model_format(path):
+    """Guess the model format from a path.
+
+    Models are pickles unless the path ends with a path separator or is
+    an existing directory, which are artifact directories. Any other
+    path, with or without an extension, stays a pickle; pass
+    ``model_format="artifact"`` to write an artifact there.
+
+    Args:
+        path (str): Model path.
+
+    Returns:
+        str: ``"pickle"`` or ``"artifact"``.
+    """
+    path = os.fspath(path)
+    if path.endswith(('/', os.sep)) or os.path.isdir(path):
+        return 'artifact'
+    return 'pickle'
+
+
+def save_model(lda_model, vectorizer, output_path, model_format=None, lineage=None):
+    """Save LDA model and vectorizer to a pickle file or an artifact directory.
     
     Args:
         lda_model: Trained LDA model.
         vectorizer: Fitted vectorizer.
-        output_path (str): Path where to save the pickle file.
+        output_path (str): Path where to save the model.
+        model_format (str, optional): ``"pickle"`` or ``"artifact"``. Inferred
+            from ``output_path`` when omitted (see :func:`infer_model_format`).
+        lineage (dict, optional): ``{"version": int, "parent": hash}`` of a
+            model derived from another by incremental training.
     """
+    model_format = model_format or infer_model_format(output_path)
+    if model_format == 'artifact':
+        save_artifact(lda_model, vectorizer, output_path, lineage=lineage)
+        logger.info("Model saved to %s", output_path)
+        return
+    if model_format != 'pickle':
+        raise ValueError(f"Unknown model format: {model_format}")
+
+    index = compute_topic_word_index(lda_model, vectorizer)
     model_data = {
         'lda_model': lda_model,
-        'vectorizer': vectorizer
+        'vectorizer': minimal_vectorizer(vectorizer),
+        'topic_words': {'indices': index.indices, 'weights': index.weights},
     }
+    if lineage is not None:
+        model_data['lineage'] = lineage
     
     with open(output_path, 'wb') as f:
         pickle.dump(model_data, f)
@@ -60,23 +233,76 @@ def save_model(lda_model, vectorizer, output_path):
 
 
 def load_model(model_path):
-    """Load LDA model and vectorizer from a pickle file.
+    """Load LDA model and vectorizer from a pickle file or an artifact directory.
+
+    Artifact arrays are memory-mapped read-only, so processes loading the
+    same artifact share its pages.
     
     Args:
-        model_path (str): Path to the pickle file.
+        model_path (str): Path to the pickle file or artifact directory.
         
     Returns:
         tuple: (lda_model, vectorizer)
     """
     logger.info("Loading model from %s", model_path)
+    if is_artifact(model_path):
+        return load_artifact(model_path)
+
     with open(model_path, 'rb') as f:
         model_data = pickle.load(f)
-    
-    return model_data['lda_model'], model_data['vectorizer']
+
+    # Older pickles may carry fitted state transform never uses
+    lda_model, vectorizer = model_data['lda_model'], minimal_vectorizer(model_data['vectorizer'])
+    # Pickles written before the topic-word index existed simply compute it
+    # on first use.
+    if 'topic_words' in model_data:
+        register_topic_word_index(
+            lda_model,
+            model_data['topic_words']['indices'],
+            model_data['topic_words']['weights'],
+            vectorizer,
+        )
+    return lda_model, vectorizer
+
+
+def model_size(model_path):
+    """Return the size in bytes of a saved model.
+
+    Args:
+        model_path (str): Path to the pickle file or artifact directory.
+
+    Returns:
+        int: File size of a pickle, or the combined size of an artifact.
+    """
+    if is_artifact(model_path):
+        return artifact_size(model_path)
+    return os.path.getsize(model_path)
+
+
+def read_model_lineage(model_path):
+    """Return the version and parent of a saved model.
+
+    Models saved without lineage are version 1 with no parent.
+
+    Args:
+        model_path (str): Path to the pickle file or artifact directory.
+
+    Returns:
+        dict: ``{"version": int, "parent": str or None}``
+    """
+    if is_artifact(model_path):
+        lineage = read_manifest(model_path).get("lineage")
+    else:
+        with open(model_path, 'rb') as f:
+            lineage = pickle.load(f).get('lineage')
+    return lineage or {"version": 1, "parent": None}
 
 
 def get_top_words_per_topic(lda_model, vectorizer, n_words=5):
     """Get top words for each topic in the LDA model.
+
+    Served from the topic-word index stored with the model, or computed
+    once per loaded model when more words are requested than were stored.
     
     Args:
         lda_model: Trained LDA model.
@@ -87,15 +313,204 @@ def get_top_words_per_topic(lda_model, vectorizer, n_words=5):
         list: List of lists containing top words for each topic.
     """
     logger.info("Getting top %s words per topic", n_words)
-    feature_names = vectorizer.get_feature_names_out()
-    topics = []
-    
-    for topic_idx, topic in enumerate(lda_model.components_):
-        top_indices = topic.argsort()[-n_words:][::-1]
-        top_words = [feature_names[i] for i in top_indices]
-        topics.append(top_words)
-    
-    return topics
+    with timed("top_words"):
+        index = get_topic_word_index(lda_model, vectorizer, n_words)
+    return [words[:n_words] for words in index.words]
+
+
+def describe_documents(document_paths, model_path, n_topics=3, n_words=5, chunk_size=1000,
+                       workers=None, corpus_path=None):
+    """Describe many documents with one vectorized pass per chunk.
+
+    Each chunk of documents is turned into a single sparse matrix and
+    scored with one ``transform`` call, so memory stays bounded by
+    ``chunk_size`` rather than the number of documents.
+
+    Args:
+        document_paths (iterable): Paths of the documents to describe.
+        model_path (str): Path to the saved model pickle file.
+        n_topics (int): Number of top topics per document.
+        n_words (int): Number of top words per topic.
+        chunk_size (int): Number of documents scored per ``transform`` call.
+        workers (int, optional): Number of processes used to tokenize and
+            vectorize each chunk.
+        corpus_path (str, optional): Packed corpus to read documents from;
+            ``document_paths`` are then document IDs within it.
+
+    Yields:
+        dict: ``{"document": path, "topics": [...]}`` where each topic entry
+        holds its ``rank``, ``topic`` index, ``probability`` and ``words``.
+    """
+    lda_model, vectorizer = load_cached_model(model_path)
+    return describe_documents_with_model(
+        document_paths, lda_model, vectorizer, n_topics, n_words, chunk_size, workers, corpus_path
+    )
+
+
+def describe_documents_with_model(document_paths, lda_model, vectorizer, n_topics=3, n_words=5,
+                                  chunk_size=1000, workers=None, corpus_path=None):
+    """Describe many documents with an already loaded model.
+
+    See :func:`describe_documents` for the arguments other than
+    ``lda_model`` and ``vectorizer``.
+
+    Yields:
+        dict: ``{"document": path, "topics": [...]}`` for each document.
+    """
+    all_topics = get_top_words_per_topic(lda_model, vectorizer, n_words)
+    n_described = 0
+    for chunk, distributions in iter_topic_distributions(
+        document_paths, lda_model, vectorizer, chunk_size, workers, corpus_path
+    ):
+        yield from _topic_records(chunk, distributions, all_topics, n_topics)
+        n_described += len(chunk)
+        logger.info("Described %s documents so far", n_described)
+
+
+def iter_topic_distributions(document_paths, lda_model, vectorizer, chunk_size=1000,
+                             workers=None, corpus_path=None):
+    """Compute topic distributions of documents on disk, one chunk at a time.
+
+    Args:
+        document_paths (iterable): Paths of the documents, or document IDs
+            within ``corpus_path``.
+        lda_model: Trained LDA model.
+        vectorizer: Fitted vectorizer.
+        chunk_size (int): Number of documents scored per ``transform`` call.
+        workers (int, optional): Number of processes used to tokenize and
+            vectorize each chunk.
+        corpus_path (str, optional): Packed corpus to read documents from.
+
+    Yields:
+        tuple: ``(labels, distributions)`` for each chunk, where ``labels``
+        lists the chunk's paths or IDs as strings.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    labels = iter(document_paths)
+    resolve = str
+    if corpus_path is not None:
+        with PackedCorpus(corpus_path) as corpus:
+            resolve = {doc_id: position for position, doc_id in enumerate(corpus.ids)}.__getitem__
+
+    with ParallelVectorizer(vectorizer, workers or 1, corpus_path) as parallel_vectorizer:
+        for chunk in iter(lambda: [str(label) for label in islice(labels, chunk_size)], []):
+            with timed("vectorize"):
+                doc_term_matrix = parallel_vectorizer.transform_paths(
+                    [resolve(label) for label in chunk]
+                )
+            with timed("lda_transform"):
+                distributions = lda_model.transform(doc_term_matrix)
+            count_documents("lda_transform", len(chunk))
+            yield chunk, distributions
+
+
+def _topic_records(labels, distributions, all_topics, n_topics):
+    top_indices = top_k_indices(distributions, n_topics)
+    for label, distribution, indices in zip(labels, distributions, top_indices):
+        yield {
+            "document": label,
+            "topics": [
+                {
+                    "rank": rank,
+                    "topic": int(topic_idx),
+                    "probability": float(distribution[topic_idx]),
+                    "words": list(all_topics[topic_idx]),
+                }
+                for rank, topic_idx in enumerate(indices, 1)
+            ],
+        }
+
+
+def describe_texts(labels, documents, lda_model, vectorizer, model_hash, n_topics=3, n_words=5):
+    """Describe document texts with an already loaded model.
+
+    Distributions go through the result cache like
+    :func:`get_topic_distributions`.
+
+    Args:
+        labels (list): Label reported for each document.
+        documents (list): Document strings.
+        lda_model: Trained LDA model.
+        vectorizer: Fitted vectorizer.
+        model_hash (str): Content hash of the model.
+        n_topics (int): Number of top topics per document.
+        n_words (int): Number of top words per topic.
+
+    Returns:
+        list: One ``{"document": label, "topics": [...]}`` dict per document,
+        as yielded by :func:`describe_documents`.
+    """
+    if not documents:
+        return []
+    all_topics = get_top_words_per_topic(lda_model, vectorizer, n_words)
+    distributions = score_documents(documents, lda_model, vectorizer, model_hash)
+    return list(_topic_records(labels, distributions, all_topics, n_topics))
+
+
+def get_topic_distributions(documents, model_path):
+    """Compute topic distributions for document texts in one pass.
+
+    Results are looked up in the content-addressed result cache first, by
+    document hash and model content hash. Of the remaining documents, a
+    single one goes through the low-overhead inference engine; several
+    share one ``transform`` call.
+
+    Args:
+        documents (list): Document strings.
+        model_path (str): Path to the saved model.
+
+    Returns:
+        numpy.ndarray: Array of shape (n_documents, n_topics).
+    """
+    cache = get_model_cache()
+    return _topic_distributions(documents, model_path, cache.get_entry(model_path))
+
+
+def _topic_distributions(documents, model_path, entry):
+    # Hashed when the entry was loaded, so it describes the weights it holds
+    model_hash = entry.content_hash
+    get_result_cache().track_model(model_path, model_hash)
+    return score_documents(documents, entry.lda_model, entry.vectorizer, model_hash)
+
+
+def score_documents(documents, lda_model, vectorizer, model_hash):
+    """Compute topic distributions with an already loaded model.
+
+    Like :func:`get_topic_distributions`, results are looked up in the
+    result cache first.
+
+    Args:
+        documents (list): Document strings.
+        lda_model: Trained LDA model.
+        vectorizer: Fitted vectorizer.
+        model_hash (str): Content hash of the model.
+
+    Returns:
+        numpy.ndarray: Array of shape (n_documents, n_topics).
+    """
+    result_cache = get_result_cache()
+    keys = [result_cache.key(document_hash(document), model_hash) for document in documents]
+    cached = result_cache.get_many(keys)
+    missing = [position for position, value in enumerate(cached) if value is None]
+    if not missing:
+        return np.vstack(cached)
+
+    with timed("vectorize"):
+        doc_term_matrix = vectorizer.transform([documents[position] for position in missing])
+    with timed("lda_transform"):
+        if doc_term_matrix.shape[0] == 1:
+            computed = get_inference_engine(lda_model).transform(doc_term_matrix)
+        else:
+            computed = lda_model.transform(doc_term_matrix)
+    count_documents("lda_transform", len(missing))
+    result_cache.put_many([(keys[position], row) for position, row in zip(missing, computed)])
+    if len(missing) == len(documents):
+        return computed
+
+    for position, row in zip(missing, computed):
+        cached[position] = row
+    return np.vstack(cached)
 
 
 def get_document_topic_distribution(document_path: str, model_path: str) -> np.ndarray:
@@ -109,11 +524,21 @@ def get_document_topic_distribution(document_path: str, model_path: str) -> np.n
         numpy.ndarray: Topic distribution for the document.
     """
     logger.info("Computing topic distribution for document: %s", document_path)
-    lda_model, vectorizer = load_model(model_path)
-    with open(document_path, "r", encoding="utf-8", errors="ignore") as f:
-        document = f.read()
-    doc_vector = vectorizer.transform([document])
-    return lda_model.transform(doc_vector)[0]
+    document = read_document(document_path)
+    return get_topic_distributions([document], model_path)[0]
+
+
+def render_topic_distribution(distribution, n_topics: int = 3) -> bytes:
+    """Render the top topics of a distribution as a PNG bar chart.
+
+    Args:
+        distribution (numpy.ndarray): Topic distribution of a document.
+        n_topics (int): Number of top topics to display.
+
+    Returns:
+        bytes: PNG image bytes of the topic distribution chart.
+    """
+    return render_topic_chart(distribution, n_topics)
 
 
 def render_document_topic_distribution(
@@ -133,22 +558,32 @@ def render_document_topic_distribution(
     """
     logger.info("Rendering topic distribution chart for %s", document_path)
     distribution = get_document_topic_distribution(document_path, model_path)
-    top_indices = distribution.argsort()[-n_topics:][::-1]
-    top_probs = distribution[top_indices]
-    labels = [f"Topic {idx}" for idx in top_indices]
+    return render_topic_distribution(distribution, n_topics)
 
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.bar(labels, top_probs, color="#4C78A8")
-    ax.set_ylabel("Probability")
-    ax.set_title("Top topic distribution")
-    ax.set_ylim(0, 1)
-    fig.tight_layout()
 
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="png")
-    plt.close(fig)
-    buffer.seek(0)
-    return buffer.read()
+def format_description(document_label, topic_distribution, all_topics, n_topics=3):
+    """Format the top topics of a distribution as a text description.
+
+    Args:
+        document_label (str): Name shown in the description header.
+        topic_distribution (numpy.ndarray): Topic distribution of the document.
+        all_topics (list): Top words of every topic, as returned by
+            :func:`get_top_words_per_topic`.
+        n_topics (int): Number of top topics to display.
+
+    Returns:
+        str: Description of the document.
+    """
+    # Get top topics
+    top_topic_indices = topic_distribution.argsort()[-n_topics:][::-1]
+    
+    # Build description
+    description = f"Document: {document_label}\n\n"
+    for rank, topic_idx in enumerate(top_topic_indices, 1):
+        prob = topic_distribution[topic_idx]
+        words = ', '.join(all_topics[topic_idx])
+        description += f"Topic {rank} (probability: {prob:.3f}): {words}\n"
+    return description
 
 
 def describe_document(document_path, model_path, n_topics=3, n_words=5):
@@ -163,30 +598,14 @@ def describe_document(document_path, model_path, n_topics=3, n_words=5):
     Returns:
         str: Description of the document.
     """
-    # Load model and vectorizer
     logger.info("Describing document %s using model %s", document_path, model_path)
-    lda_model, vectorizer = load_model(model_path)
-    
-    # Load document
-    with open(document_path, 'r', encoding='utf-8', errors='ignore') as f:
-        document = f.read()
-    
-    # Vectorize document
-    doc_vector = vectorizer.transform([document])
-    
-    # Get topic distribution
-    topic_distribution = lda_model.transform(doc_vector)[0]
-    
-    # Get top topics
-    top_topic_indices = topic_distribution.argsort()[-n_topics:][::-1]
-    
+    entry = get_model_cache().get_entry(model_path)
+
+    # Get topic distribution, served from the result cache when possible
+    document = read_document(document_path)
+    topic_distribution = _topic_distributions([document], model_path, entry)[0]
+
     # Get all topic words
-    all_topics = get_top_words_per_topic(lda_model, vectorizer, n_words)
-    
-    # Build description
-    description = f"Document: {document_path}\n\n"
-    for rank, topic_idx in enumerate(top_topic_indices, 1):
-        prob = topic_distribution[topic_idx]
-        words = ', '.join(all_topics[topic_idx])
-        description += f"Topic {rank} (probability: {prob:.3f}): {words}\n"
-    return description
+    all_topics = get_top_words_per_topic(entry.lda_model, entry.vectorizer, n_words)
+
+    return format_description(document_path, topic_distribution, all_topics, n_topics)
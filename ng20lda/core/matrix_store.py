@@ -0,0 +1,148 @@
+"""Compact on-disk storage of document-term matrices.
+
+Vectorizing is the slowest step before training. Saving the matrix lets
+repeated training runs on the same corpus start from it directly. The
+counts are stored with the smallest unsigned integer dtype that holds them
+and the indices with int32 whenever the number of non-zeros allows, next to
+the vocabulary they were counted with. Loading converts the counts to
+float32 once, which is the dtype training uses, and reuses the index
+arrays as they are.
+
+A fingerprint of the corpus (see
+:func:`ng20lda.core.training_manifest.corpus_fingerprint`) can be stored
+with the matrix, so a matrix is only reused for the exact corpus it was
+built from.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+from ng20lda.core.vocabulary import vectorizer_from_terms
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+TRAINING_DTYPE = np.float32
+
+
+def count_dtype(max_count):
+    """Return the smallest unsigned integer dtype holding counts up to ``max_count``.
+
+    Args:
+        max_count (int): Largest count to store.
+
+    Returns:
+        numpy.dtype: uint8, uint16, uint32 or uint64.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_count <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def index_dtype(nnz, n_columns):
+    """Return int32 if it can index a matrix, int64 otherwise.
+
+    Args:
+        nnz (int): Number of stored values.
+        n_columns (int): Number of columns.
+
+    Returns:
+        numpy.dtype: int32 or int64.
+    """
+    if max(nnz, n_columns) <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    return np.dtype(np.int64)
+
+
+def save_doc_term_matrix(doc_term_matrix, vectorizer, path, fingerprint=None):
+    """Save a document-term matrix and its vocabulary as an ``.npz`` file.
+
+    Args:
+        doc_term_matrix: Sparse matrix of term counts.
+        vectorizer: Fitted vectorizer the matrix was produced with.
+        path (str): Destination file.
+        fingerprint (str, optional): Fingerprint of the corpus the matrix
+            was built from.
+    """
+    matrix = sp.csr_matrix(doc_term_matrix)
+    max_count = int(matrix.data.max()) if matrix.nnz else 0
+    indices = index_dtype(matrix.nnz, matrix.shape[1])
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f,
+            format_version=np.array(FORMAT_VERSION),
+            shape=np.array(matrix.shape, dtype=np.int64),
+            data=matrix.data.astype(count_dtype(max_count)),
+            indices=matrix.indices.astype(indices, copy=False),
+            indptr=matrix.indptr.astype(indices, copy=False),
+            terms=np.array(terms, dtype=str),
+            max_features=np.array(-1 if vectorizer.max_features is None else vectorizer.max_features),
+            fingerprint=np.array(fingerprint or ""),
+        )
+    os.replace(tmp_path, path)
+    logger.info(
+        "Saved %s x %s document-term matrix (%s non-zeros, %s counts) to %s",
+        matrix.shape[0],
+        matrix.shape[1],
+        matrix.nnz,
+        count_dtype(max_count).name,
+        path,
+    )
+
+
+def load_doc_term_matrix(path):
+    """Load a matrix saved by :func:`save_doc_term_matrix`.
+
+    Args:
+        path (str): ``.npz`` file.
+
+    Returns:
+        tuple: (float32 CSR document-term matrix, fitted vectorizer)
+
+    Raises:
+        ValueError: If the file was written by a newer format version.
+    """
+    with np.load(path, allow_pickle=False) as stored:
+        if int(stored["format_version"]) > FORMAT_VERSION:
+            raise ValueError(f"Matrix file {path} has an unsupported format version.")
+        matrix = sp.csr_matrix(
+            (
+                stored["data"].astype(TRAINING_DTYPE),
+                stored["indices"],
+                stored["indptr"],
+            ),
+            shape=tuple(int(size) for size in stored["shape"]),
+            copy=False,
+        )
+        max_features = int(stored["max_features"])
+        vectorizer = vectorizer_from_terms(
+            stored["terms"].tolist(), None if max_features < 0 else max_features
+        )
+    logger.info("Loaded %s x %s document-term matrix from %s", *matrix.shape, path)
+    return matrix, vectorizer
+
+
+def read_matrix_fingerprint(path):
+    """Return the corpus fingerprint stored with a matrix.
+
+    Args:
+        path (str): ``.npz`` file.
+
+    Returns:
+        str: The fingerprint, or None if the matrix was saved without one.
+    """
+    with np.load(path, allow_pickle=False) as stored:
+        if "fingerprint" not in stored.files:
+            return None
+        return str(stored["fingerprint"]) or None
@@ -0,0 +1,276 @@
+"""Lightweight timing and counter instrumentation.
+
+Hot paths in ``ng20lda.core`` record per-stage durations, cache lookups and
+documents processed through the process-wide :class:`MetricsRegistry`.
+Metrics are off by default: while disabled, :func:`timed` returns a shared
+no-op context manager and the recording functions return after a single
+attribute check, so instrumented code runs at full speed. The API enables
+them and serves them in Prometheus text format at ``GET /metrics``; the CLI
+enables them with ``--profile``.
+
+Set ``NG20LDA_METRICS=1`` to enable metrics at import time, or ``0`` to
+keep them off in the API.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+METRIC_PREFIX = "ng20lda_"
+STAGE_METRIC = "stage_seconds"
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values.
+
+    Args:
+        buckets (tuple): Sorted upper bounds of the buckets.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def cumulative_counts(self):
+        """Yield ``(upper_bound, count)`` pairs, ending with ``+Inf``."""
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_labels", "_start")
+
+    def __init__(self, registry, name, labels):
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._registry._observe(self._name, self._labels, time.perf_counter() - self._start)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = key + tuple(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms, counters and gauges.
+
+    Metric names are given without the ``ng20lda_`` prefix, which is added
+    when rendering. Label values are passed as keyword arguments.
+
+    Args:
+        enabled (bool): Whether recording is on.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._gauges: dict[str, dict[tuple, float]] = {}
+
+    def enable(self) -> None:
+        """Start recording."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording; already recorded values are kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def timer(self, name, **labels):
+        """Return a context manager recording its duration into a histogram.
+
+        Args:
+            name (str): Histogram name, in seconds.
+            **labels: Label values.
+
+        Returns:
+            A context manager; a shared no-op one while disabled.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, _label_key(labels))
+
+    def observe(self, name, value, **labels) -> None:
+        """Record a value into a histogram."""
+        if self.enabled:
+            self._observe(name, _label_key(labels), value)
+
+    def _observe(self, name, key, value):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels) -> None:
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels) -> None:
+        """Set a gauge to its current value."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{METRIC_PREFIX}{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key)} {value}")
+            for name, series in sorted(self._gauges.items()):
+                metric = f"{METRIC_PREFIX}{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{METRIC_PREFIX}{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in sorted(series.items()):
+                    for bound, count in histogram.cumulative_counts():
+                        labels = _format_labels(key, (("le", _format_bound(bound)),))
+                        lines.append(f"{metric}_bucket{labels} {count}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def stage_summary(self):
+        """Summarize the per-stage timings, slowest total first.
+
+        Returns:
+            list: One dict per stage with ``stage``, ``count``,
+            ``total_seconds``, ``mean_ms`` and ``max_ms``.
+        """
+        with self._lock:
+            series = dict(self._histograms.get(STAGE_METRIC, {}))
+        rows = [
+            {
+                "stage": dict(key).get("stage", ""),
+                "count": histogram.count,
+                "total_seconds": histogram.sum,
+                "mean_ms": histogram.sum / histogram.count * 1e3,
+                "max_ms": histogram.max * 1e3,
+            }
+            for key, histogram in series.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def counters(self):
+        """Return the counters as ``{name: {label_key: value}}``."""
+        with self._lock:
+            return {name: dict(series) for name, series in self._counters.items()}
+
+
+_default_registry = MetricsRegistry(enabled=os.environ.get("NG20LDA_METRICS") == "1")
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _default_registry
+
+
+def timed(stage):
+    """Time a pipeline stage into the ``stage_seconds`` histogram.
+
+    Args:
+        stage (str): Stage name, e.g. ``"vectorize"``.
+
+    Returns:
+        A context manager; a shared no-op one while metrics are disabled.
+    """
+    registry = _default_registry
+    if not registry.enabled:
+        return _NULL_TIMER
+    return _Timer(registry, STAGE_METRIC, (("stage", stage),))
+
+
+def record_cache_lookup(cache, hits, misses) -> None:
+    """Count hits and misses of one of the caches.
+
+    Args:
+        cache (str): Cache name, e.g. ``"model"``.
+        hits (int): Lookups answered by the cache.
+        misses (int): Lookups that were not.
+    """
+    registry = _default_registry
+    if not registry.enabled:
+        return
+    if hits:
+        registry.increment("cache_lookups", hits, cache=cache, result="hit")
+    if misses:
+        registry.increment("cache_lookups", misses, cache=cache, result="miss")
+
+
+def count_documents(stage, n_documents) -> None:
+    """Count documents processed by a stage.
+
+    Args:
+        stage (str): Stage name.
+        n_documents (int): Number of documents.
+    """
+    if _default_registry.enabled:
+        _default_registry.increment("documents_processed", n_documents, stage=stage)
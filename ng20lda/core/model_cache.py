@@ -0,0 +1,298 @@
+"""Process-wide cache of loaded LDA models."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ng20lda.config import env_int
+from ng20lda.core.metrics import get_metrics, record_cache_lookup, timed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MODELS = 4
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+@dataclass
+class CachedModel:
+    """A loaded model together with the file signature it was loaded from.
+
+    Attributes:
+        lda_model: Trained LDA model.
+        vectorizer: Fitted vectorizer.
+        signature (tuple): ``(mtime_ns, size)`` of the model at load time.
+        size (int): Approximate memory footprint in bytes (size on disk).
+        content_hash (str): Content hash of the model, computed when it
+            was loaded.
+    """
+
+    lda_model: object
+    vectorizer: object
+    signature: tuple
+    size: int
+    content_hash: str
+
+
+@dataclass
+class CacheStats:
+    """Counters describing model cache activity."""
+
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    evictions: int = 0
+    loads: int = 0
+    load_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a plain dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+            "loads": self.loads,
+            "load_seconds": self.load_seconds,
+        }
+
+
+def _file_signature(model_path: str) -> tuple:
+    """Return the ``(mtime_ns, size)`` signature of a model.
+
+    For artifact directories the manifest is used, since it is rewritten
+    last on every save, and the size is the combined size of the files.
+    """
+    if os.path.isdir(model_path):
+        from ng20lda.core.artifact import MANIFEST_NAME, artifact_size
+
+        stat = os.stat(os.path.join(model_path, MANIFEST_NAME))
+        return stat.st_mtime_ns, artifact_size(model_path)
+    stat = os.stat(model_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def compute_model_hash(model_path: str) -> str:
+    """Return the content hash of a model.
+
+    Artifacts record their hash in the manifest; pickles are hashed whole.
+    """
+    if os.path.isdir(model_path):
+        from ng20lda.core.artifact import read_manifest
+
+        return read_manifest(model_path)["content_hash"]
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_model_with_hash(model_path: str, loader=None):
+    """Load a model and hash the same version of it.
+
+    The hash and the model are read one after the other, so the file's
+    signature is checked around both; if the model was replaced in between,
+    both are read again. Results are then never cached under the hash of a
+    model that did not produce them.
+
+    Args:
+        model_path (str): Path to the saved model.
+        loader: Callable taking a path and returning ``(lda_model, vectorizer)``.
+            Defaults to :func:`ng20lda.core.lda_model.load_model`.
+
+    Returns:
+        tuple: ``(lda_model, vectorizer, signature, content_hash)``
+    """
+    if loader is None:
+        from ng20lda.core.lda_model import load_model as loader
+    while True:
+        signature = _file_signature(model_path)
+        content_hash = compute_model_hash(model_path)
+        with timed("model_load"):
+            lda_model, vectorizer = loader(model_path)
+        if _file_signature(model_path) == signature:
+            return lda_model, vectorizer, signature, content_hash
+        logger.info("Model %s changed while loading, loading again", model_path)
+
+
+class ModelCache:
+    """Thread-safe LRU cache of ``(lda_model, vectorizer)`` pairs keyed by path.
+
+    Entries are reloaded when the file's modification time or size changes,
+    and the least recently used entries are evicted once either the number
+    of models or their combined size exceeds the configured budget.
+
+    Args:
+        max_models (int): Maximum number of models kept in memory.
+        max_bytes (int): Maximum combined size, in bytes, of cached models.
+        loader: Callable taking a path and returning ``(lda_model, vectorizer)``.
+            Defaults to :func:`ng20lda.core.lda_model.load_model`.
+    """
+
+    def __init__(self, max_models=DEFAULT_MAX_MODELS, max_bytes=DEFAULT_MAX_BYTES, loader=None):
+        if max_models < 1:
+            raise ValueError("max_models must be at least 1.")
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._loader = loader
+        self._entries: OrderedDict[str, CachedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._path_locks: dict[str, threading.Lock] = {}
+        self.stats = CacheStats()
+
+    def _load(self, model_path: str):
+        if self._loader is not None:
+            return self._loader(model_path)
+        from ng20lda.core.lda_model import load_model
+
+        return load_model(model_path)
+
+    def get_entry(self, model_path: str) -> CachedModel:
+        """Return the cache entry for a model, loading it if needed.
+
+        Args:
+            model_path (str): Path to the saved model.
+
+        Returns:
+            CachedModel: The cached entry.
+        """
+        key = os.path.abspath(model_path)
+        signature = _file_signature(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                record_cache_lookup("model", 1, 0)
+                return entry
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        # Load outside the global lock so other models stay available; the
+        # per-path lock keeps concurrent misses from loading the same file twice.
+        with path_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.signature == signature:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    record_cache_lookup("model", 1, 0)
+                    return entry
+                self.stats.misses += 1
+                record_cache_lookup("model", 0, 1)
+                if entry is not None:
+                    self.stats.reloads += 1
+                    logger.info("Model %s changed on disk, reloading", key)
+
+            start = time.perf_counter()
+            lda_model, vectorizer, signature, content_hash = load_model_with_hash(
+                key, self._load
+            )
+            elapsed = time.perf_counter() - start
+            entry = CachedModel(lda_model, vectorizer, signature, signature[1], content_hash)
+            get_metrics().set_gauge("model_size_bytes", entry.size, model=key)
+
+            with self._lock:
+                self.stats.loads += 1
+                self.stats.load_seconds += elapsed
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._evict()
+        logger.info("Cached model %s (loaded in %.3fs)", key, elapsed)
+        return entry
+
+    def get(self, model_path: str):
+        """Return ``(lda_model, vectorizer)`` for a model path.
+
+        Args:
+            model_path (str): Path to the saved model.
+
+        Returns:
+            tuple: (lda_model, vectorizer)
+        """
+        entry = self.get_entry(model_path)
+        return entry.lda_model, entry.vectorizer
+
+    def content_hash(self, model_path: str) -> str:
+        """Return the content hash of the loaded version of a model.
+
+        Args:
+            model_path (str): Path to the saved model.
+
+        Returns:
+            str: Hex digest identifying the model contents.
+        """
+        return self.get_entry(model_path).content_hash
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the budget is met."""
+        total = sum(entry.size for entry in self._entries.values())
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or total > self.max_bytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            total -= entry.size
+            self.stats.evictions += 1
+            logger.info("Evicted model %s from cache", key)
+
+    def invalidate(self, model_path: str | None = None) -> None:
+        """Remove one model, or every model, from the cache.
+
+        Args:
+            model_path (str, optional): Path of the model to drop. Drops all
+                models when omitted.
+        """
+        with self._lock:
+            if model_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(model_path), None)
+
+    def __contains__(self, model_path: str) -> bool:
+        with self._lock:
+            return os.path.abspath(model_path) in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_default_cache = ModelCache(
+    max_models=env_int("NG20LDA_MODEL_CACHE_SIZE", DEFAULT_MAX_MODELS),
+    max_bytes=env_int("NG20LDA_MODEL_CACHE_BYTES", DEFAULT_MAX_BYTES),
+)
+
+
+def get_model_cache() -> ModelCache:
+    """Return the process-wide model cache."""
+    return _default_cache
+
+
+def load_cached_model(model_path: str):
+    """Load a model through the process-wide cache.
+
+    Args:
+        model_path (str): Path to the saved model.
+
+    Returns:
+        tuple: (lda_model, vectorizer)
+    """
+    return _default_cache.get(model_path)
+
+
+def model_content_hash(model_path: str) -> str:
+    """Return the content hash of a model through the process-wide cache.
+
+    Args:
+        model_path (str): Path to the saved model.
+
+    Returns:
+        str: Hex digest identifying the model contents.
+    """
+    return _default_cache.content_hash(model_path)
@@ -0,0 +1,209 @@
+"""Multi-process tokenization and vectorization."""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import scipy.sparse as sp
+
+from ng20lda.core.corpus_store import PackedCorpus
+from ng20lda.core.document_processor import build_vectorizer, read_document
+from ng20lda.core.vocabulary import count_terms, prune_vocabulary, vectorizer_from_terms
+
+logger = logging.getLogger(__name__)
+
+# Per-process vectorizer (and packed corpus, if any) installed by the pool
+# initializer, so tasks only carry shards of file paths or document indices
+# and results only carry CSR arrays.
+_worker_vectorizer = None
+_worker_corpus = None
+
+
+def _init_worker(vectorizer, corpus_path=None):
+    global _worker_vectorizer, _worker_corpus
+    _worker_vectorizer = vectorizer
+    _worker_corpus = PackedCorpus(corpus_path) if corpus_path is not None else None
+
+
+def _read_shard(documents, corpus=None):
+    if corpus is None:
+        return (read_document(path) for path in documents)
+    return (corpus[index] for index in documents)
+
+
+def _vectorize_shard(documents):
+    texts = _read_shard(documents, _worker_corpus)
+    matrix = sp.csr_matrix(_worker_vectorizer.transform(texts))
+    return matrix.data, matrix.indices, matrix.indptr, matrix.shape[1]
+
+
+def _count_shard(documents):
+    analyzer = _worker_vectorizer.build_analyzer()
+    return count_terms(_read_shard(documents, _worker_corpus), analyzer)
+
+
+def _shards(paths, workers, shard_size=None):
+    """Split a list of paths (or a range of indices) into contiguous shards."""
+    if shard_size is None:
+        # A few shards per worker keeps the pool busy when shards are uneven
+        shard_size = max(1, -(-len(paths) // (workers * 4)))
+    return [paths[start:start + shard_size] for start in range(0, len(paths), shard_size)]
+
+
+def default_workers():
+    """Return the number of CPU cores available to this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ParallelVectorizer:
+    """Vectorize documents on disk across a pool of worker processes.
+
+    The fitted vectorizer is sent once to each worker when the pool starts.
+    Each task is a contiguous shard of file paths: the worker reads and
+    tokenizes those documents against the shared fixed vocabulary and
+    returns only the CSR ``data``, ``indices`` and ``indptr`` arrays, which
+    are stacked in order. Document text never crosses process boundaries.
+
+    With ``corpus_path`` set, documents are addressed by their position in
+    a packed corpus instead, and every worker maps the corpus itself.
+    Passing a ``range`` keeps each task down to its two bounds.
+
+    Args:
+        vectorizer: Fitted vectorizer.
+        workers (int): Number of worker processes.
+        corpus_path (str, optional): Packed corpus the documents live in.
+    """
+
+    def __init__(self, vectorizer, workers, corpus_path=None):
+        self.vectorizer = vectorizer
+        self.workers = workers
+        self.corpus_path = corpus_path
+        self._corpus = None
+        self._executor = None
+        if workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(vectorizer, corpus_path),
+            )
+        elif corpus_path is not None:
+            self._corpus = PackedCorpus(corpus_path)
+
+    def transform_paths(self, paths, shard_size=None):
+        """Vectorize the documents at ``paths``.
+
+        Args:
+            paths (list): Document paths, or positions in the packed corpus.
+            shard_size (int, optional): Documents per task.
+
+        Returns:
+            scipy.sparse.csr_matrix: Document-term matrix with one row per path.
+        """
+        if self.corpus_path is None:
+            paths = [str(path) for path in paths]
+        if self._executor is None or len(paths) <= 1:
+            if self.corpus_path is not None and self._corpus is None:
+                self._corpus = PackedCorpus(self.corpus_path)
+            return sp.csr_matrix(self.vectorizer.transform(_read_shard(paths, self._corpus)))
+
+        fragments = [
+            sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_features))
+            for data, indices, indptr, n_features in self._executor.map(
+                _vectorize_shard, _shards(paths, self.workers, shard_size)
+            )
+        ]
+        return sp.vstack(fragments, format='csr')
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._corpus is not None:
+            self._corpus.close()
+            self._corpus = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def vectorize_paths_parallel(paths, vectorizer, workers, shard_size=None, corpus_path=None):
+    """Vectorize documents on disk across a process pool.
+
+    Args:
+        paths (list): Document paths, or positions in ``corpus_path``.
+        vectorizer: Fitted vectorizer.
+        workers (int): Number of worker processes.
+        shard_size (int, optional): Documents per task.
+        corpus_path (str, optional): Packed corpus the documents live in.
+
+    Returns:
+        scipy.sparse.csr_matrix: Document-term matrix with one row per path.
+    """
+    with ParallelVectorizer(vectorizer, workers, corpus_path) as parallel_vectorizer:
+        matrix = parallel_vectorizer.transform_paths(paths, shard_size)
+    logger.info(
+        "Vectorized %s documents with %s workers into %s features",
+        matrix.shape[0],
+        workers,
+        matrix.shape[1],
+    )
+    return matrix
+
+
+def build_vocabulary_parallel(paths, workers, max_features=1000, shard_size=None,
+                              corpus_path=None):
+    """Build the vocabulary with term counting spread across a process pool.
+
+    Each worker counts term and document frequencies for its shard; the
+    counters are merged and pruned exactly like
+    :func:`ng20lda.core.vocabulary.build_vocabulary`.
+
+    Args:
+        paths (list): Document paths, or positions in ``corpus_path``.
+        workers (int): Number of worker processes.
+        max_features (int): Maximum number of features for the vectorizer.
+        shard_size (int, optional): Documents per task.
+        corpus_path (str, optional): Packed corpus the documents live in.
+
+    Returns:
+        CountVectorizer: Fitted vectorizer with the pruned vocabulary.
+    """
+    if corpus_path is None:
+        paths = [str(path) for path in paths]
+    vectorizer = build_vectorizer(max_features)
+    term_counts = Counter()
+    doc_counts = Counter()
+    n_documents = 0
+
+    workers = max(1, workers)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(vectorizer, corpus_path)
+    ) as executor:
+        for shard_terms, shard_docs, shard_n in executor.map(
+            _count_shard, _shards(paths, workers, shard_size)
+        ):
+            term_counts.update(shard_terms)
+            doc_counts.update(shard_docs)
+            n_documents += shard_n
+
+    terms = prune_vocabulary(
+        term_counts,
+        doc_counts,
+        n_documents,
+        vectorizer.max_features,
+        vectorizer.max_df,
+        vectorizer.min_df,
+    )
+    logger.info("Built vocabulary of %s terms with %s workers", len(terms), workers)
+    return vectorizer_from_terms(terms, max_features)
+
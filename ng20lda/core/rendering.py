@@ -0,0 +1,157 @@
+"""Fast, cached PNG rendering of topic distribution charts."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ng20lda.config import env_int
+from ng20lda.core.metrics import record_cache_lookup, timed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+BAR_COLOR = "#4C78A8"
+
+# Each thread keeps one figure per bar count. Figures are created through the
+# object-oriented API, so rendering never touches pyplot's global state.
+_local = threading.local()
+
+
+def _chart(n_bars):
+    charts = getattr(_local, "charts", None)
+    if charts is None:
+        charts = _local.charts = {}
+    chart = charts.get(n_bars)
+    if chart is None:
+        # matplotlib is imported on the first render, so the API and the CLI
+        # only pay for it when a chart is actually drawn.
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=(6, 4))
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        bars = ax.bar(range(n_bars), np.zeros(n_bars), color=BAR_COLOR)
+        ax.set_xticks(range(n_bars))
+        ax.set_ylabel("Probability")
+        ax.set_title("Top topic distribution")
+        ax.set_ylim(0, 1)
+        # Fixed margins matching what tight_layout picks for this chart,
+        # so the layout is not recomputed on every render.
+        figure.subplots_adjust(left=0.11, right=0.975, bottom=0.1, top=0.91)
+        chart = charts[n_bars] = (canvas, ax, bars)
+    return chart
+
+
+def render_topic_chart(distribution, n_topics=3) -> bytes:
+    """Render the top topics of a distribution as a PNG bar chart.
+
+    The figure is built once per thread and bar count; each call only
+    updates bar heights and tick labels before rasterizing.
+
+    Args:
+        distribution (numpy.ndarray): Topic distribution of a document.
+        n_topics (int): Number of top topics to display.
+
+    Returns:
+        bytes: PNG image bytes.
+    """
+    distribution = np.asarray(distribution)
+    top_indices = distribution.argsort()[-n_topics:][::-1]
+    with timed("render"):
+        canvas, ax, bars = _chart(len(top_indices))
+        for bar, probability in zip(bars, distribution[top_indices]):
+            bar.set_height(probability)
+        ax.set_xticklabels([f"Topic {idx}" for idx in top_indices])
+
+        buffer = io.BytesIO()
+        canvas.print_png(buffer)
+    return buffer.getvalue()
+
+
+def chart_etag(document_hash, model_hash, n_topics) -> str:
+    """Return the ETag of a chart.
+
+    Args:
+        document_hash (str): SHA-256 of the document bytes.
+        model_hash (str): Content hash of the model.
+        n_topics (int): Number of topics displayed.
+
+    Returns:
+        str: A quoted strong entity tag.
+    """
+    digest = hashlib.sha256(f"{document_hash}:{model_hash}:{n_topics}".encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered PNG bytes.
+
+    Args:
+        max_entries (int): Maximum number of images kept.
+        max_bytes (int): Maximum combined size of the images in bytes.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached image for ``key``, or None."""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        record_cache_lookup("chart", image is not None, image is None)
+        return image
+
+    def put(self, key, image):
+        """Store an image, evicting the least recently used ones if needed."""
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = image
+            self._size += len(image)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        """Drop every cached image."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_default_cache = RenderCache(
+    max_entries=env_int("NG20LDA_RENDER_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+    max_bytes=env_int("NG20LDA_RENDER_CACHE_BYTES", DEFAULT_MAX_BYTES),
+)
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide cache of rendered charts."""
+    return _default_cache
@@ -0,0 +1,321 @@
+"""Content-addressed cache of document topic distributions.
+
+Results are keyed by the SHA-256 of the document text together with the
+content hash of the model, so a retrained or replaced model never serves
+stale results. Two tiers are used:
+
+* an in-process LRU of recent results;
+* an optional SQLite database that persists across restarts and can be
+  shared by several processes (it runs in WAL mode, so readers never block
+  the writer). It holds at most ``max_disk_entries`` results; once full,
+  the least recently read or written results are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from ng20lda.config import env_int
+from ng20lda.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_DISK_ENTRIES = 1_000_000
+# Eviction trims the database to this fraction of its cap, so it does not
+# run again on every write once the cap is reached
+EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    model_hash TEXT NOT NULL,
+    dtype TEXT NOT NULL,
+    value BLOB NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_model ON results (model_hash);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS models (
+    path TEXT PRIMARY KEY,
+    model_hash TEXT NOT NULL
+);
+"""
+
+
+def document_hash(text) -> str:
+    """Return the SHA-256 hex digest of a document.
+
+    Args:
+        text (str): Document text.
+
+    Returns:
+        str: Hex digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+@dataclass
+class ResultCacheStats:
+    """Counters describing result cache activity."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered by either tier."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a plain dictionary."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+class ResultCache:
+    """Two-tier cache of topic distributions keyed by document and model hash.
+
+    Args:
+        max_entries (int): Maximum number of results kept in memory.
+        path (str, optional): SQLite database for the persistent tier.
+            Only the memory tier is used when omitted.
+        max_disk_entries (int): Maximum number of results kept in the
+            database.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._models: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = ResultCacheStats()
+        if path is not None:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._connection().executescript(_SCHEMA)
+            # Upper bound on the rows; other processes may add more, so it
+            # is recounted before evicting
+            self._disk_rows = self._count_disk()
+
+    def _count_disk(self):
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def key(doc_hash, model_hash) -> str:
+        """Return the cache key of a document scored with a model."""
+        return f"{model_hash}:{doc_hash}"
+
+    def track_model(self, model_path, model_hash) -> None:
+        """Record the current hash of a model, dropping results of the previous one.
+
+        Args:
+            model_path (str): Path the model is loaded from.
+            model_hash (str): Current content hash of the model.
+        """
+        model_path = os.path.abspath(model_path)
+        with self._lock:
+            if self._models.get(model_path) == model_hash:
+                return
+            previous = self._models.get(model_path)
+            self._models[model_path] = model_hash
+            if previous is not None:
+                prefix = f"{previous}:"
+                for key in [key for key in self._entries if key.startswith(prefix)]:
+                    del self._entries[key]
+        if self.path is None:
+            return
+
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT model_hash FROM models WHERE path = ?", (model_path,)
+        ).fetchone()
+        if row is not None and row[0] != model_hash:
+            connection.execute("DELETE FROM results WHERE model_hash = ?", (row[0],))
+            logger.info("Model %s changed, dropped its cached results", model_path)
+        connection.execute(
+            "INSERT OR REPLACE INTO models (path, model_hash) VALUES (?, ?)",
+            (model_path, model_hash),
+        )
+
+    def get_many(self, keys):
+        """Look up several keys at once.
+
+        Args:
+            keys (list): Cache keys.
+
+        Returns:
+            list: The cached distribution for each key, or None on a miss.
+        """
+        results = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for position, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is None:
+                    missing.append(position)
+                else:
+                    self._entries.move_to_end(key)
+                    results[position] = value
+            self.stats.memory_hits += len(keys) - len(missing)
+
+        if missing and self.path is not None:
+            found = self._get_disk([keys[position] for position in missing])
+            with self._lock:
+                for position in missing:
+                    value = found.get(keys[position])
+                    if value is not None:
+                        results[position] = value
+                        self._store(keys[position], value)
+                        self.stats.disk_hits += 1
+
+        n_misses = sum(value is None for value in results)
+        with self._lock:
+            self.stats.misses += n_misses
+        record_cache_lookup("result", len(keys) - n_misses, n_misses)
+        return results
+
+    def _get_disk(self, keys):
+        connection = self._connection()
+        found = {}
+        # Stay below SQLite's default limit on bound parameters
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for key, dtype, value in connection.execute(
+                f"SELECT key, dtype, value FROM results WHERE key IN ({placeholders})", batch
+            ):
+                found[key] = np.frombuffer(value, dtype=dtype)
+        if found:
+            connection.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(time.time(), key) for key in found],
+            )
+        return found
+
+    def put_many(self, items):
+        """Store ``(key, distribution)`` pairs in both tiers.
+
+        Args:
+            items (list): Pairs of cache key and topic distribution.
+        """
+        items = [(key, np.array(value)) for key, value in items]
+        with self._lock:
+            for key, value in items:
+                self._store(key, value)
+        if self.path is None or not items:
+            return
+
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO results (key, model_hash, dtype, value, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, key.split(":", 1)[0], value.dtype.str, value.tobytes(), now)
+                    for key, value in items
+                ],
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        with self._lock:
+            self._disk_rows += len(items)
+            full = self._disk_rows > self.max_disk_entries
+        if full:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Delete the least recently used results beyond the database cap."""
+        connection = self._connection()
+        n_rows = self._count_disk()
+        excess = n_rows - int(self.max_disk_entries * EVICT_TO)
+        if n_rows > self.max_disk_entries and excess > 0:
+            connection.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            n_rows -= excess
+            logger.info("Evicted %s results from %s", excess, self.path)
+        with self._lock:
+            self._disk_rows = n_rows
+
+    def _store(self, key, value):
+        value.setflags(write=False)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._models.clear()
+        if self.path is not None:
+            self._connection().execute("DELETE FROM results")
+            with self._lock:
+                self._disk_rows = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_default_cache = ResultCache(
+    max_entries=env_int("NG20LDA_RESULT_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+    path=os.environ.get("NG20LDA_RESULT_CACHE_PATH") or None,
+    max_disk_entries=env_int("NG20LDA_RESULT_CACHE_DISK_SIZE", DEFAULT_MAX_DISK_ENTRIES),
+)
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache."""
+    return _default_cache
+
+
+def set_result_cache(cache) -> ResultCache:
+    """Replace the process-wide result cache.
+
+    Args:
+        cache (ResultCache): The cache to use from now on.
+
+    Returns:
+        ResultCache: The previous cache.
+    """
+    global _default_cache
+    previous, _default_cache = _default_cache, cache
+    return previous
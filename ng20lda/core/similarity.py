@@ -0,0 +1,398 @@
+"""Nearest-neighbour search over document topic distributions.
+
+A similarity index stores the doc-topic matrix of a corpus in a directory::
+
+    index/
+        manifest.json        format version, shape and model content hash
+        doc_topic.npy        float32 topic distributions, one row per document
+        sqrt_doc_topic.npy   their element-wise square roots, for Hellinger
+        norms.npy            float32 L2 norms of the rows, for cosine
+        partitions.npy       int64 row bounds of each dominant-topic partition
+        ids.txt              document IDs, one per line, in row order
+
+Rows are sorted by dominant topic, so each partition is a contiguous range
+of rows. The arrays are memory-mapped and scanned in fixed-size blocks: each
+block is scored against the query with one matrix-vector product and only
+its best ``k`` rows are kept, so a query touches each row once and holds
+``O(block_size)`` scores at a time. Queries can be restricted to the
+partitions of the query's strongest topics for approximate, faster search.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ng20lda.config import env_int
+from ng20lda.core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "ng20lda-similarity-index"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DOC_TOPIC_NAME = "doc_topic.npy"
+SQRT_NAME = "sqrt_doc_topic.npy"
+NORMS_NAME = "norms.npy"
+PARTITIONS_NAME = "partitions.npy"
+IDS_NAME = "ids.txt"
+METRICS = ("hellinger", "cosine")
+DEFAULT_BLOCK_SIZE = 65536
+DEFAULT_MAX_INDEXES = 4
+
+
+def is_similarity_index(path) -> bool:
+    """Return True if ``path`` is a similarity index directory.
+
+    Args:
+        path (str): Path to check.
+
+    Returns:
+        bool: Whether the path holds a similarity index manifest.
+    """
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        return False
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("format") == FORMAT_NAME
+
+
+def _replace(path, name, write):
+    tmp_path = os.path.join(path, f".{name}.tmp")
+    write(tmp_path)
+    os.replace(tmp_path, os.path.join(path, name))
+
+
+def _save_array(tmp_path, array):
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+
+
+def write_similarity_index(chunks, n_documents, n_topics, output_path, model_hash=None,
+                           block_size=DEFAULT_BLOCK_SIZE):
+    """Write a similarity index from chunks of topic distributions.
+
+    Distributions are first written unsorted to a memory-mapped scratch
+    file, then copied block by block in dominant-topic order, so memory use
+    does not grow with the corpus. The manifest is written last.
+
+    Args:
+        chunks (iterable): ``(labels, distributions)`` pairs, for instance
+            from :func:`ng20lda.core.lda_model.iter_topic_distributions`.
+        n_documents (int): Total number of documents in ``chunks``.
+        n_topics (int): Number of topics of the model.
+        output_path (str): Index directory.
+        model_hash (str, optional): Content hash of the model, recorded so
+            queries can check they use the same model.
+        block_size (int): Rows copied per block.
+
+    Returns:
+        int: Number of indexed documents.
+
+    Raises:
+        ValueError: If the chunks hold a different number of documents.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    manifest_path = os.path.join(output_path, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    scratch_path = os.path.join(output_path, ".unsorted.npy")
+    unsorted = np.lib.format.open_memmap(
+        scratch_path, mode='w+', dtype=np.float32, shape=(n_documents, n_topics)
+    )
+    ids = []
+    dominant = np.empty(n_documents, dtype=np.int32)
+    for labels, distributions in chunks:
+        start, stop = len(ids), len(ids) + len(labels)
+        if stop > n_documents:
+            raise ValueError(f"Got more than the expected {n_documents} documents.")
+        unsorted[start:stop] = distributions
+        dominant[start:stop] = np.argmax(distributions, axis=1)
+        ids.extend(labels)
+        logger.info("Scored %s of %s documents for the index", stop, n_documents)
+    if len(ids) != n_documents:
+        raise ValueError(f"Expected {n_documents} documents, got {len(ids)}.")
+
+    order = np.argsort(dominant, kind="stable")
+    partitions = np.searchsorted(dominant[order], np.arange(n_topics + 1)).astype(np.int64)
+
+    def write_sorted(tmp_path, transform):
+        rows = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=np.float32, shape=(n_documents, n_topics)
+        )
+        for start in range(0, n_documents, block_size):
+            rows[start:start + block_size] = transform(unsorted[order[start:start + block_size]])
+        rows.flush()
+        del rows
+
+    def write_norms(tmp_path):
+        norms = np.empty(n_documents, dtype=np.float32)
+        for start in range(0, n_documents, block_size):
+            norms[start:start + block_size] = np.linalg.norm(
+                unsorted[order[start:start + block_size]], axis=1
+            )
+        _save_array(tmp_path, norms)
+
+    def write_ids(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+            for position in order:
+                f.write(ids[position] + '\n')
+
+    def write_manifest(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    _replace(output_path, DOC_TOPIC_NAME, lambda tmp: write_sorted(tmp, lambda block: block))
+    _replace(output_path, SQRT_NAME, lambda tmp: write_sorted(tmp, np.sqrt))
+    _replace(output_path, NORMS_NAME, write_norms)
+    _replace(output_path, PARTITIONS_NAME, lambda tmp: _save_array(tmp, partitions))
+    _replace(output_path, IDS_NAME, write_ids)
+    del unsorted
+    os.remove(scratch_path)
+    manifest = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "n_documents": n_documents,
+        "n_topics": n_topics,
+        "model_hash": model_hash,
+    }
+    _replace(output_path, MANIFEST_NAME, write_manifest)
+    logger.info("Similarity index %s holds %s documents", output_path, n_documents)
+    return n_documents
+
+
+def build_similarity_index(document_paths, model_path, output_path, chunk_size=1000,
+                           workers=None, corpus_path=None):
+    """Score every document with a model and write a similarity index.
+
+    Args:
+        document_paths (list): Paths of the documents, or document IDs
+            within ``corpus_path``; they become the index's IDs.
+        model_path (str): Path to the saved model.
+        output_path (str): Index directory.
+        chunk_size (int): Documents scored per ``transform`` call.
+        workers (int, optional): Processes used to vectorize each chunk.
+        corpus_path (str, optional): Packed corpus to read documents from.
+
+    Returns:
+        int: Number of indexed documents.
+    """
+    from ng20lda.core.lda_model import iter_topic_distributions
+    from ng20lda.core.model_cache import get_model_cache
+
+    # The entry's hash was computed with the weights it holds
+    entry = get_model_cache().get_entry(model_path)
+    chunks = iter_topic_distributions(
+        document_paths, entry.lda_model, entry.vectorizer, chunk_size, workers, corpus_path
+    )
+    return write_similarity_index(
+        chunks,
+        len(document_paths),
+        entry.lda_model.n_components,
+        output_path,
+        model_hash=entry.content_hash,
+    )
+
+
+def _merge_top(best_scores, best_rows, scores, rows, k):
+    """Keep the ``k`` highest scores of two candidate sets."""
+    if len(scores) > k:
+        keep = np.argpartition(scores, len(scores) - k)[-k:]
+        scores, rows = scores[keep], rows[keep]
+    scores = np.concatenate((best_scores, scores))
+    rows = np.concatenate((best_rows, rows))
+    if len(scores) > k:
+        keep = np.argpartition(scores, len(scores) - k)[-k:]
+        scores, rows = scores[keep], rows[keep]
+    return scores, rows
+
+
+class SimilarityIndex:
+    """Read-only, memory-mapped view of a similarity index.
+
+    Args:
+        path (str): Index directory.
+        block_size (int): Rows scored per block during a query.
+
+    Raises:
+        ValueError: If the directory is not a supported similarity index.
+    """
+
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE):
+        self.path = path
+        self.block_size = block_size
+        with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not an ng20lda similarity index.")
+        if self.manifest.get("format_version", 0) > FORMAT_VERSION:
+            raise ValueError(
+                f"Index format version {self.manifest['format_version']} is newer than "
+                f"supported version {FORMAT_VERSION}."
+            )
+        self.doc_topic = np.load(os.path.join(path, DOC_TOPIC_NAME), mmap_mode='r')
+        self.sqrt_doc_topic = np.load(os.path.join(path, SQRT_NAME), mmap_mode='r')
+        self.norms = np.load(os.path.join(path, NORMS_NAME), mmap_mode='r')
+        self.partitions = np.load(os.path.join(path, PARTITIONS_NAME))
+        with open(os.path.join(path, IDS_NAME), 'r', encoding='utf-8', newline='\n') as f:
+            self.ids = f.read().split('\n')[:-1]
+        if len(self.ids) != self.doc_topic.shape[0]:
+            raise ValueError(f"Index {path} has mismatched IDs and rows.")
+        self._index = None
+
+    @property
+    def model_hash(self):
+        """Content hash of the model the index was built with."""
+        return self.manifest.get("model_hash")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, doc_id):
+        """Return the row of a document ID.
+
+        Raises:
+            KeyError: If the ID is not in the index.
+        """
+        if self._index is None:
+            self._index = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        return self._index[doc_id]
+
+    def _ranges(self, distribution, n_probe):
+        if n_probe is None or n_probe >= len(self.partitions) - 1:
+            return [(0, len(self.ids))]
+        topics = np.argsort(distribution)[::-1][:max(n_probe, 1)]
+        return [(int(self.partitions[topic]), int(self.partitions[topic + 1])) for topic in topics]
+
+    def query(self, distribution, k=10, metric="hellinger", n_probe=None, exclude=()):
+        """Find the documents closest to a topic distribution.
+
+        Args:
+            distribution (numpy.ndarray): Topic distribution of the query.
+            k (int): Number of neighbours to return.
+            metric (str): ``"hellinger"`` or ``"cosine"``.
+            n_probe (int, optional): Only scan the partitions of the query's
+                ``n_probe`` strongest topics. Scans every row when omitted.
+            exclude (iterable): Rows left out of the results.
+
+        Returns:
+            list: ``(doc_id, distance)`` pairs, closest first.
+
+        Raises:
+            ValueError: If ``metric`` is not supported or ``k`` is below 1.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}.")
+        distribution = np.asarray(distribution, dtype=np.float32)
+        exclude = np.fromiter(exclude, dtype=np.int64)
+        if metric == "hellinger":
+            matrix, vector = self.sqrt_doc_topic, np.sqrt(distribution)
+        else:
+            matrix, vector = self.doc_topic, distribution / np.linalg.norm(distribution)
+
+        n_candidates = k + len(exclude)
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        with timed("similarity_scan"):
+            for start, stop in self._ranges(distribution, n_probe):
+                for block_start in range(start, stop, self.block_size):
+                    block_stop = min(block_start + self.block_size, stop)
+                    scores = matrix[block_start:block_stop] @ vector
+                    if metric == "cosine":
+                        scores /= self.norms[block_start:block_stop]
+                    best_scores, best_rows = _merge_top(
+                        best_scores, best_rows, scores,
+                        np.arange(block_start, block_stop, dtype=np.int64), n_candidates,
+                    )
+
+        keep = ~np.isin(best_rows, exclude)
+        best_scores, best_rows = best_scores[keep], best_rows[keep]
+        ranked = np.argsort(-best_scores, kind="stable")[:k]
+        if metric == "hellinger":
+            distances = np.sqrt(np.clip(1.0 - best_scores[ranked], 0.0, None))
+        else:
+            distances = 1.0 - best_scores[ranked]
+        return [
+            (self.ids[row], float(distance))
+            for row, distance in zip(best_rows[ranked], distances)
+        ]
+
+    def query_id(self, doc_id, k=10, metric="hellinger", n_probe=None):
+        """Find the documents closest to an indexed document, excluding itself.
+
+        Args:
+            doc_id (str): ID of the query document.
+            k (int): Number of neighbours to return.
+            metric (str): ``"hellinger"`` or ``"cosine"``.
+            n_probe (int, optional): See :meth:`query`.
+
+        Returns:
+            list: ``(doc_id, distance)`` pairs, closest first.
+
+        Raises:
+            KeyError: If the ID is not in the index.
+        """
+        row = self.index_of(doc_id)
+        return self.query(self.doc_topic[row], k, metric, n_probe, exclude=(row,))
+
+    def close(self):
+        """Release the memory maps."""
+        self.doc_topic = self.sqrt_doc_topic = self.norms = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _IndexCache:
+    """Small LRU of open indexes, reopened when the manifest changes."""
+
+    def __init__(self, max_indexes):
+        self.max_indexes = max_indexes
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        key = os.path.abspath(path)
+        signature = os.stat(os.path.join(key, MANIFEST_NAME)).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1]
+        index = SimilarityIndex(key)
+        with self._lock:
+            self._entries[key] = (signature, index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_indexes:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = _IndexCache(env_int("NG20LDA_INDEX_CACHE_SIZE", DEFAULT_MAX_INDEXES))
+
+
+def get_similarity_index(path) -> SimilarityIndex:
+    """Open a similarity index through the process-wide cache.
+
+    Args:
+        path (str): Index directory.
+
+    Returns:
+        SimilarityIndex: The open index.
+    """
+    return _default_cache.get(path)
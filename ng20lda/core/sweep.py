@@ -0,0 +1,273 @@
+"""Parallel sweep over the number of LDA topics.
+
+The corpus is vectorized once by the caller. Its train and held-out
+document-term matrices are copied into shared memory, and every worker
+process maps the same pages instead of receiving its own pickled copy, so
+memory use does not grow with the number of workers. Each candidate runs in
+a fresh worker process, which makes the reported peak RSS specific to that
+configuration. Without workers every candidate is trained in the calling
+process, whose peak RSS covers all earlier candidates, so none is reported.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import scipy.sparse as sp
+
+from ng20lda.core.lda_model import train_lda_model
+from ng20lda.core.topic_words import top_k_indices
+from ng20lda.core.utils import peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COHERENCE_WORDS = 10
+
+
+@dataclass
+class SweepResult:
+    """Scores of one candidate topic count.
+
+    Attributes:
+        n_topics (int): Number of topics.
+        perplexity (float): Perplexity on the held-out documents (lower is
+            better).
+        coherence (float): Mean UMass coherence of the topics on the
+            training documents (higher is better).
+        fit_seconds (float): Wall time spent training.
+        peak_rss (int, optional): Peak resident memory of the training
+            process in bytes, including the shared matrix pages it touched.
+            ``None`` when the sweep ran without worker processes, or the
+            platform cannot report it.
+    """
+
+    n_topics: int
+    perplexity: float
+    coherence: float
+    fit_seconds: float
+    peak_rss: int | None
+
+    def as_dict(self) -> dict:
+        """Return the scores as a plain dictionary."""
+        return asdict(self)
+
+
+def umass_coherence(components, doc_term_matrix, n_words=DEFAULT_COHERENCE_WORDS):
+    """Compute the mean UMass coherence of a set of topics.
+
+    For the top words ``w_1..w_n`` of a topic, UMass coherence sums
+    ``log((D(w_i, w_j) + 1) / D(w_j))`` over pairs ``j < i``, where ``D``
+    counts the documents containing the words.
+
+    Args:
+        components (numpy.ndarray): Topic-word weights, shape (n_topics, n_features).
+        doc_term_matrix: Sparse document-term matrix the topics were fit on.
+        n_words (int): Number of top words per topic.
+
+    Returns:
+        float: Coherence averaged over topics.
+    """
+    top = top_k_indices(np.asarray(components), n_words)
+    words, positions = np.unique(top, return_inverse=True)
+    positions = positions.reshape(top.shape)
+
+    present = sp.csc_matrix(doc_term_matrix[:, words] > 0, dtype=np.float64)
+    co_doc = (present.T @ present).toarray()
+    doc_freq = np.maximum(np.diag(co_doc), 1.0)
+
+    scores = []
+    for topic in positions:
+        pairs = [
+            np.log((co_doc[topic[i], topic[j]] + 1.0) / doc_freq[topic[j]])
+            for i in range(1, len(topic))
+            for j in range(i)
+        ]
+        scores.append(np.mean(pairs) if pairs else 0.0)
+    return float(np.mean(scores))
+
+
+class SharedCSRMatrix:
+    """A CSR matrix whose arrays are held in shared memory blocks.
+
+    The creating process owns the blocks and unlinks them on :meth:`close`;
+    other processes rebuild a zero-copy view with :func:`attach_csr`.
+
+    Args:
+        matrix: Sparse matrix to share.
+    """
+
+    def __init__(self, matrix):
+        matrix = sp.csr_matrix(matrix)
+        # Canonical (sorted, deduplicated) indices, so no reader ever sorts
+        # them in place while another process is using the same pages.
+        matrix.sum_duplicates()
+        self._blocks = []
+        arrays = {}
+        for name in ("data", "indices", "indptr"):
+            array = getattr(matrix, name)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self._blocks.append(block)
+            arrays[name] = (block.name, array.dtype.str, array.shape[0])
+        self.spec = {"shape": matrix.shape, "arrays": arrays}
+
+    def close(self):
+        """Release and unlink the shared memory blocks."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach_block(name):
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching also registers the block, but workers
+        # share the creator's resource tracker, so it is only unlinked once.
+        return SharedMemory(name=name)
+
+
+def attach_csr(spec):
+    """Rebuild a shared CSR matrix from the spec of a :class:`SharedCSRMatrix`.
+
+    Args:
+        spec (dict): ``SharedCSRMatrix.spec``.
+
+    Returns:
+        tuple: ``(matrix, blocks)``; the blocks must be kept alive while the
+        matrix is in use. The matrix arrays are read-only.
+    """
+    blocks = []
+    arrays = {}
+    for name, (block_name, dtype, length) in spec["arrays"].items():
+        block = _attach_block(block_name)
+        blocks.append(block)
+        array = np.ndarray((length,), dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    matrix = sp.csr_matrix(
+        (arrays["data"], arrays["indices"], arrays["indptr"]), shape=spec["shape"], copy=False
+    )
+    matrix.has_canonical_format = True
+    return matrix, blocks
+
+
+# Matrices attached by each sweep worker, with the blocks backing them
+_worker_matrices = {}
+
+
+def _init_sweep_worker(train_spec, heldout_spec):
+    for name, spec in (("train", train_spec), ("heldout", heldout_spec)):
+        _worker_matrices[name] = attach_csr(spec)
+
+
+def _fit_candidate(n_topics, train_matrix, heldout_matrix, random_state, n_words,
+                   record_rss=True):
+    start = time.perf_counter()
+    lda_model = train_lda_model(train_matrix, n_topics=n_topics, random_state=random_state)
+    fit_seconds = time.perf_counter() - start
+    scored = heldout_matrix if heldout_matrix.shape[0] else train_matrix
+    result = SweepResult(
+        n_topics=n_topics,
+        perplexity=float(lda_model.perplexity(scored)),
+        coherence=umass_coherence(lda_model.components_, train_matrix, n_words),
+        fit_seconds=fit_seconds,
+        peak_rss=peak_rss_bytes() if record_rss else None,
+    )
+    logger.info(
+        "n_topics=%s: perplexity %.1f, coherence %.3f in %.2fs",
+        n_topics,
+        result.perplexity,
+        result.coherence,
+        fit_seconds,
+    )
+    return result, lda_model
+
+
+def _fit_shared_candidate(args):
+    n_topics, random_state, n_words = args
+    train_matrix, _ = _worker_matrices["train"]
+    heldout_matrix, _ = _worker_matrices["heldout"]
+    return _fit_candidate(n_topics, train_matrix, heldout_matrix, random_state, n_words)
+
+
+def split_heldout(doc_term_matrix, heldout=0.1, random_state=42):
+    """Split the rows of a matrix into training and held-out sets.
+
+    Args:
+        doc_term_matrix: Sparse document-term matrix.
+        heldout (float): Fraction of documents held out.
+        random_state (int): Seed of the split.
+
+    Returns:
+        tuple: (train_matrix, heldout_matrix) as float32 CSR matrices.
+    """
+    matrix = sp.csr_matrix(doc_term_matrix, dtype=np.float32)
+    order = np.random.default_rng(random_state).permutation(matrix.shape[0])
+    n_heldout = int(round(matrix.shape[0] * heldout))
+    return matrix[np.sort(order[n_heldout:])], matrix[np.sort(order[:n_heldout])]
+
+
+def sweep_topics(doc_term_matrix, n_topics_list, workers=1, heldout=0.1, random_state=42,
+                 n_words=DEFAULT_COHERENCE_WORDS):
+    """Train one model per topic count and score each of them.
+
+    Args:
+        doc_term_matrix: Sparse document-term matrix of the whole corpus.
+        n_topics_list (list): Topic counts to try.
+        workers (int): Number of worker processes.
+        heldout (float): Fraction of documents held out for perplexity.
+        random_state (int): Seed for the split and the models.
+        n_words (int): Top words per topic used for coherence.
+
+    Returns:
+        tuple: ``(results, best_model)`` where ``results`` lists
+        :class:`SweepResult` in the order of ``n_topics_list`` and
+        ``best_model`` is the model with the lowest held-out perplexity.
+    """
+    if not n_topics_list:
+        raise ValueError("At least one topic count is required.")
+    # float32 up front, so LDA's input validation never copies the matrix
+    train_matrix, heldout_matrix = split_heldout(doc_term_matrix, heldout, random_state)
+    logger.info(
+        "Sweeping %s topic counts over %s training and %s held-out documents",
+        len(n_topics_list),
+        train_matrix.shape[0],
+        heldout_matrix.shape[0],
+    )
+
+    tasks = [(n_topics, random_state, n_words) for n_topics in n_topics_list]
+    if workers <= 1:
+        outcomes = [
+            _fit_candidate(
+                n_topics, train_matrix, heldout_matrix, random_state, n_words, record_rss=False
+            )
+            for n_topics in n_topics_list
+        ]
+    else:
+        with SharedCSRMatrix(train_matrix) as shared_train, \
+                SharedCSRMatrix(heldout_matrix) as shared_heldout:
+            del train_matrix, heldout_matrix
+            with Pool(
+                processes=min(workers, len(tasks)),
+                initializer=_init_sweep_worker,
+                initargs=(shared_train.spec, shared_heldout.spec),
+                maxtasksperchild=1,
+            ) as pool:
+                outcomes = pool.map(_fit_shared_candidate, tasks, chunksize=1)
+
+    results = [result for result, _ in outcomes]
+    best_index = min(range(len(results)), key=lambda index: results[index].perplexity)
+    return results, outcomes[best_index][1]
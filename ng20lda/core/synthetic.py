@@ -0,0 +1,104 @@
+"""Synthetic newsgroup-like corpora for benchmarks and offline testing."""
+
+from __future__ import annotations
+
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "ze", "po", "qu", "da"]
+
+
+def make_vocabulary(size, seed=0):
+    """Create a list of distinct pseudo-words.
+
+    Args:
+        size (int): Number of words to create.
+        seed (int): Random seed.
+
+    Returns:
+        list: Distinct lowercase words of three to five syllables.
+    """
+    rng = np.random.default_rng(seed)
+    words = set()
+    while len(words) < size:
+        n_syllables = rng.integers(3, 6)
+        words.add("".join(rng.choice(_SYLLABLES, size=n_syllables)))
+    return sorted(words)
+
+
+def iter_synthetic_documents(n_documents, n_topics=20, vocabulary_size=5000,
+                             words_per_document=150, seed=0):
+    """Yield ``(category, text)`` pairs drawn from a simple topic model.
+
+    Each topic favours its own slice of the vocabulary with a Zipf-like
+    distribution, and each document mixes a dominant topic with background
+    words, which is close enough to newsgroup posts for timing purposes.
+
+    Args:
+        n_documents (int): Number of documents to generate.
+        n_topics (int): Number of latent topics (and categories).
+        vocabulary_size (int): Number of distinct words.
+        words_per_document (int): Average document length in words.
+        seed (int): Random seed.
+
+    Yields:
+        tuple: (category, text)
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(make_vocabulary(vocabulary_size, seed))
+    ranks = 1.0 / np.arange(1, vocabulary_size + 1)
+    topic_word = np.empty((n_topics, vocabulary_size))
+    for topic in range(n_topics):
+        topic_word[topic] = np.roll(ranks, topic * vocabulary_size // n_topics)
+    topic_word /= topic_word.sum(axis=1, keepdims=True)
+    background = ranks / ranks.sum()
+
+    for _ in range(n_documents):
+        topic = int(rng.integers(n_topics))
+        length = max(1, int(rng.poisson(words_per_document)))
+        n_topical = rng.binomial(length, 0.7)
+        words = np.concatenate([
+            rng.choice(vocabulary, size=n_topical, p=topic_word[topic]),
+            rng.choice(vocabulary, size=length - n_topical, p=background),
+        ])
+        rng.shuffle(words)
+        yield f"topic{topic:02d}", " ".join(words)
+
+
+def generate_synthetic_corpus(output_dir, n_documents, n_topics=20, vocabulary_size=5000,
+                              words_per_document=150, seed=0):
+    """Write a synthetic corpus as one .txt file per document.
+
+    Documents are laid out like :func:`ng20lda.core.data_fetcher.fetch_and_save_ng20`
+    output, with one subdirectory per category.
+
+    Args:
+        output_dir (str): Directory to write the corpus into.
+        n_documents (int): Number of documents to generate.
+        n_topics (int): Number of latent topics (and categories).
+        vocabulary_size (int): Number of distinct words.
+        words_per_document (int): Average document length in words.
+        seed (int): Random seed.
+
+    Returns:
+        str: The output directory.
+    """
+    counts = {}
+    documents = iter_synthetic_documents(
+        n_documents, n_topics, vocabulary_size, words_per_document, seed
+    )
+    for category, text in documents:
+        category_dir = os.path.join(output_dir, category)
+        if category not in counts:
+            os.makedirs(category_dir, exist_ok=True)
+            counts[category] = 0
+        with open(os.path.join(category_dir, f"{counts[category]}.txt"), 'w', encoding='utf-8') as f:
+            f.write(text)
+        counts[category] += 1
+
+    logger.info("Generated %s synthetic documents in %s", n_documents, output_dir)
+    return output_dir
@@ -0,0 +1,207 @@
+"""Precomputed top words per topic, stored with the model."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+
+import numpy as np
+from sklearn.feature_extraction import FeatureHasher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_SIZE = 20
+
+
+@dataclass
+class TopicWordIndex:
+    """Top words of every topic, sorted by decreasing weight.
+
+    Attributes:
+        indices (numpy.ndarray): Feature indices, shape (n_topics, k).
+        weights (numpy.ndarray): Topic-word probabilities, shape (n_topics, k).
+        words (list): Words for ``indices``, one list per topic.
+    """
+
+    indices: np.ndarray
+    weights: np.ndarray
+    words: list
+
+    @property
+    def size(self) -> int:
+        """Number of words stored per topic."""
+        return self.indices.shape[1]
+
+
+# Indexes are attached to the model object itself, so they live exactly as
+# long as the loaded model (for instance while it sits in the model cache).
+_indexes = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def top_k_indices(matrix, k):
+    """Return the column indices of the k largest values of each row.
+
+    Uses ``np.argpartition`` over the whole matrix so only the selected
+    columns are sorted.
+
+    Args:
+        matrix (numpy.ndarray): 2D array of scores.
+        k (int): Number of indices to keep per row.
+
+    Returns:
+        numpy.ndarray: Array of shape (n_rows, k) sorted by decreasing value.
+    """
+    k = min(k, matrix.shape[1])
+    rows = np.arange(matrix.shape[0])[:, np.newaxis]
+    partition = np.argpartition(matrix, -k, axis=1)[:, -k:]
+    order = np.argsort(-matrix[rows, partition], axis=1, kind="stable")
+    return partition[rows, order]
+
+
+def _feature_names(vectorizer, indices):
+    """Resolve feature indices to words.
+
+    Only the requested indices are looked up, instead of building the full
+    sorted feature-name array with ``get_feature_names_out``. Hashing
+    vectorizers have no vocabulary; their ``feature_names_`` map (see
+    :func:`name_hashed_features`) names the top features, and any other
+    feature is shown as ``#<index>``.
+    """
+    needed = set(np.unique(indices).tolist())
+    if hasattr(vectorizer, "vocabulary_"):
+        names = {
+            index: term for term, index in vectorizer.vocabulary_.items() if index in needed
+        }
+    else:
+        names = getattr(vectorizer, "feature_names_", {})
+    return [[names.get(i, f"#{i}") for i in row.tolist()] for row in indices]
+
+
+def name_hashed_features(lda_model, vectorizer, documents, n_words=DEFAULT_INDEX_SIZE,
+                         chunk_size=1000):
+    """Build the reverse map of a hashing vectorizer for the top features only.
+
+    Hashed features cannot be turned back into words, so the documents are
+    tokenized once more and, for each of the top ``n_words`` features of
+    every topic, the most frequent term hashing to it becomes its name.
+    Only terms landing on those features are counted, so memory is bounded
+    by the features that survive rather than by the corpus vocabulary.
+
+    The map is stored as ``vectorizer.feature_names_`` and saved with the
+    model. Names already present for a surviving feature are kept, so an
+    updated model only needs the new documents to name its new top
+    features; when every top feature already has a name the documents are
+    not read at all.
+
+    Args:
+        lda_model: Trained LDA model.
+        vectorizer: HashingVectorizer the model was trained with.
+        documents (iterable): Document strings, typically streamed from disk.
+        n_words (int): Number of top features named per topic.
+        chunk_size (int): Documents tokenized per batch.
+
+    Returns:
+        dict: ``{feature_index: term}`` for the named features.
+    """
+    components = np.asarray(lda_model.components_)
+    needed = set(np.unique(top_k_indices(components, n_words)).tolist())
+    names = {
+        index: term
+        for index, term in getattr(vectorizer, "feature_names_", {}).items()
+        if index in needed
+    }
+    needed -= set(names)
+    if not needed:
+        vectorizer.feature_names_ = dict(sorted(names.items()))
+        return vectorizer.feature_names_
+    analyzer = vectorizer.build_analyzer()
+    hasher = FeatureHasher(vectorizer.n_features, input_type="string", alternate_sign=False)
+
+    counts = Counter()
+    documents = iter(documents)
+    for chunk in iter(lambda: list(islice(documents, chunk_size)), []):
+        chunk_counts = Counter(term for document in chunk for term in analyzer(document))
+        terms = list(chunk_counts)
+        if not terms:
+            continue
+        # One term per row, so the CSR column indices are the terms' features
+        columns = hasher.transform([[term] for term in terms]).indices
+        for term, column in zip(terms, columns.tolist()):
+            if column in needed:
+                counts[column, term] += chunk_counts[term]
+
+    named = set()
+    for (index, term), _ in sorted(counts.items(), key=lambda item: (-item[1], item[0][1])):
+        if index not in named:
+            names[index] = term
+            named.add(index)
+    vectorizer.feature_names_ = dict(sorted(names.items()))
+    logger.info("Named %s of %s unnamed top hashed features", len(named), len(needed))
+    return vectorizer.feature_names_
+
+
+def compute_topic_word_index(lda_model, vectorizer, n_words=DEFAULT_INDEX_SIZE):
+    """Compute the top ``n_words`` words of every topic.
+
+    Args:
+        lda_model: Trained LDA model.
+        vectorizer: Fitted vectorizer.
+        n_words (int): Number of words to keep per topic.
+
+    Returns:
+        TopicWordIndex: The computed index.
+    """
+    components = np.asarray(lda_model.components_)
+    indices = top_k_indices(components, n_words).astype(np.int32)
+    rows = np.arange(components.shape[0])[:, np.newaxis]
+    weights = components[rows, indices] / components.sum(axis=1, keepdims=True)
+    return TopicWordIndex(indices, weights, _feature_names(vectorizer, indices))
+
+
+def register_topic_word_index(lda_model, indices, weights, vectorizer):
+    """Attach a stored topic-word index to a loaded model.
+
+    Args:
+        lda_model: Loaded LDA model.
+        indices (numpy.ndarray): Stored feature indices.
+        weights (numpy.ndarray): Stored topic-word probabilities.
+        vectorizer: Fitted vectorizer used to resolve words.
+    """
+    indices = np.asarray(indices)
+    index = TopicWordIndex(indices, np.asarray(weights), _feature_names(vectorizer, indices))
+    with _lock:
+        _indexes[lda_model] = index
+
+
+def get_topic_word_index(lda_model, vectorizer, n_words=DEFAULT_INDEX_SIZE):
+    """Return an index holding at least ``n_words`` words per topic.
+
+    The index stored with the model is used when it is large enough;
+    otherwise a larger one is computed once and memoized for the model.
+
+    Args:
+        lda_model: Trained LDA model.
+        vectorizer: Fitted vectorizer.
+        n_words (int): Minimum number of words per topic.
+
+    Returns:
+        TopicWordIndex: An index with ``size >= n_words`` (or every feature).
+    """
+    n_features = lda_model.components_.shape[1]
+    with _lock:
+        index = _indexes.get(lda_model)
+    if index is not None and index.size >= min(n_words, n_features):
+        return index
+
+    logger.info("Computing top %s words per topic", n_words)
+    index = compute_topic_word_index(lda_model, vectorizer, max(n_words, DEFAULT_INDEX_SIZE))
+    with _lock:
+        current = _indexes.get(lda_model)
+        if current is None or current.size < index.size:
+            _indexes[lda_model] = index
+    return index
@@ -0,0 +1,182 @@
+"""Record of the documents a model was trained on.
+
+Models trained with ``--manifest``, and every model produced by an
+incremental update, get a sidecar ``<model>.ingest.json`` listing the
+documents they have seen, with their size, modification time and SHA-256.
+Incremental training compares the corpus against it to find new and
+changed documents, so a model without a manifest cannot be updated. Files whose size and modification time are unchanged
+are trusted without being read, so scanning a large corpus costs one
+``stat`` per file plus a read of each changed file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+
+from ng20lda.core.corpus_store import (
+    DATA_NAME,
+    IDS_NAME,
+    OFFSETS_NAME,
+    PackedCorpus,
+    is_packed_corpus,
+)
+from ng20lda.core.document_processor import iter_document_paths
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".ingest.json"
+
+
+@dataclass
+class DocumentRecord:
+    """What is known about an ingested document.
+
+    Attributes:
+        size (int): Size in bytes.
+        mtime_ns (int, optional): Modification time, for files on disk.
+        sha256 (str): Hex digest of the document bytes.
+    """
+
+    size: int
+    mtime_ns: int | None
+    sha256: str
+
+
+def manifest_path_for(model_path) -> str:
+    """Return the path of the training manifest of a model."""
+    return f"{os.fspath(model_path).rstrip(os.sep)}{MANIFEST_SUFFIX}"
+
+
+def load_training_manifest(model_path):
+    """Load the training manifest of a model.
+
+    Args:
+        model_path (str): Path to the saved model.
+
+    Returns:
+        dict: Mapping of document ID to :class:`DocumentRecord`.
+
+    Raises:
+        FileNotFoundError: If the model has no manifest. Treating every
+            document as new would fold the whole corpus into the model a
+            second time.
+    """
+    path = manifest_path_for(model_path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"No training manifest at {path}; retrain the model with --manifest "
+            "before updating it."
+        )
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version", 0) > MANIFEST_VERSION:
+        raise ValueError(f"Training manifest {path} has an unsupported version.")
+    return {doc_id: DocumentRecord(**record) for doc_id, record in manifest["documents"].items()}
+
+
+def save_training_manifest(records, model_path):
+    """Write the training manifest of a model.
+
+    Args:
+        records (dict): Mapping of document ID to :class:`DocumentRecord`.
+        model_path (str): Path to the saved model.
+    """
+    path = manifest_path_for(model_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {
+                "version": MANIFEST_VERSION,
+                "documents": {doc_id: asdict(record) for doc_id, record in sorted(records.items())},
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def corpus_fingerprint(source) -> str:
+    """Return a digest identifying the current state of a corpus.
+
+    Only metadata is read: the ID, size and modification time of every
+    file, or of the files of a packed corpus. Any added, removed, renamed
+    or rewritten document changes the digest.
+
+    Args:
+        source (str): Directory of .txt files or a packed corpus.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    if is_packed_corpus(source):
+        paths = [os.path.join(source, name) for name in (DATA_NAME, OFFSETS_NAME, IDS_NAME)]
+    else:
+        paths = iter_document_paths(source)
+    for path in paths:
+        stat = os.stat(path)
+        doc_id = os.path.relpath(path, source).replace(os.sep, '/')
+        digest.update(f"{doc_id}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_corpus(source, previous=None):
+    """Compare a corpus with a training manifest.
+
+    Args:
+        source (str): Directory of .txt files or a packed corpus.
+        previous (dict, optional): Records from :func:`load_training_manifest`.
+
+    Returns:
+        tuple: ``(records, changed)`` where ``records`` maps every current
+        document ID to its :class:`DocumentRecord` and ``changed`` lists
+        the documents that are new or whose contents changed, as file paths
+        (or positions, for a packed corpus) in corpus order.
+    """
+    previous = previous or {}
+    records = {}
+    changed = []
+
+    if is_packed_corpus(source):
+        with PackedCorpus(source) as corpus:
+            for position, doc_id in enumerate(corpus.ids):
+                payload = corpus.document_bytes(position)
+                record = DocumentRecord(len(payload), None, hashlib.sha256(payload).hexdigest())
+                payload.release()
+                old = previous.get(doc_id)
+                if old is None or old.sha256 != record.sha256:
+                    changed.append(position)
+                records[doc_id] = record
+    else:
+        for path in iter_document_paths(source):
+            doc_id = os.path.relpath(path, source).replace(os.sep, '/')
+            stat = os.stat(path)
+            old = previous.get(doc_id)
+            if old is not None and old.size == stat.st_size and old.mtime_ns == stat.st_mtime_ns:
+                records[doc_id] = old
+                continue
+            record = DocumentRecord(stat.st_size, stat.st_mtime_ns, _hash_file(path))
+            if old is None or old.sha256 != record.sha256:
+                changed.append(path)
+            records[doc_id] = record
+
+    removed = len(set(previous) - set(records))
+    logger.info(
+        "Scanned %s documents: %s new or changed, %s removed",
+        len(records),
+        len(changed),
+        removed,
+    )
+    return records, changed
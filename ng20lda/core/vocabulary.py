@@ -0,0 +1,209 @@
+"""Streaming vocabulary construction for large corpora."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import Counter
+from itertools import islice
+from numbers import Integral
+
+import numpy as np
+import scipy.sparse as sp
+
+from ng20lda.core.document_processor import build_vectorizer
+
+logger = logging.getLogger(__name__)
+
+
+def count_terms(documents, analyzer):
+    """Count term and document frequencies over a stream of documents.
+
+    Args:
+        documents (iterable): Document strings.
+        analyzer: Callable turning a document into a list of terms.
+
+    Returns:
+        tuple: (term_counts, doc_counts, n_documents)
+    """
+    term_counts = Counter()
+    doc_counts = Counter()
+    n_documents = 0
+    for document in documents:
+        terms = analyzer(document)
+        term_counts.update(terms)
+        doc_counts.update(set(terms))
+        n_documents += 1
+    return term_counts, doc_counts, n_documents
+
+
+def prune_vocabulary(term_counts, doc_counts, n_documents, max_features, max_df, min_df):
+    """Select the vocabulary kept by CountVectorizer's pruning rules.
+
+    Mirrors ``CountVectorizer._limit_features``: terms are sorted, filtered
+    on document frequency, then limited to the ``max_features`` most
+    frequent ones.
+
+    Args:
+        term_counts (Counter): Total occurrences per term.
+        doc_counts (Counter): Number of documents containing each term.
+        n_documents (int): Number of documents counted.
+        max_features (int): Maximum number of terms to keep, or None.
+        max_df (float or int): Upper document frequency bound.
+        min_df (float or int): Lower document frequency bound.
+
+    Returns:
+        list: Sorted list of kept terms.
+
+    Raises:
+        ValueError: If the bounds are inconsistent or no term survives.
+    """
+    max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_documents
+    min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_documents
+    if max_doc_count < min_doc_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+    if not term_counts:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+    terms = np.array(sorted(term_counts))
+    dfs = np.array([doc_counts[term] for term in terms], dtype=np.int64)
+    mask = (dfs <= max_doc_count) & (dfs >= min_doc_count)
+    if max_features is not None and mask.sum() > max_features:
+        tfs = np.array([term_counts[term] for term in terms], dtype=np.int64)
+        mask_inds = (-tfs[mask]).argsort()[:max_features]
+        new_mask = np.zeros(len(dfs), dtype=bool)
+        new_mask[np.where(mask)[0][mask_inds]] = True
+        mask = new_mask
+
+    kept = terms[mask].tolist()
+    if not kept:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    return kept
+
+
+def vectorizer_from_terms(terms, max_features=1000):
+    """Create a fitted vectorizer from an already selected vocabulary.
+
+    The vectorizer is left in the same state ``fit`` would produce, so it
+    pickles and transforms exactly like one returned by
+    :func:`ng20lda.core.document_processor.vectorize_documents`.
+
+    Args:
+        terms (list): Vocabulary terms; a term's position is its column.
+        max_features (int): Value recorded in the vectorizer's parameters.
+
+    Returns:
+        CountVectorizer: Fitted vectorizer.
+    """
+    vectorizer = build_vectorizer(max_features)
+    vectorizer.vocabulary_ = {term: index for index, term in enumerate(terms)}
+    vectorizer.fixed_vocabulary_ = False
+    return vectorizer
+
+
+def build_vocabulary(documents, max_features=1000):
+    """Build a vectorizer vocabulary from streamed documents (pass 1).
+
+    Only term and document frequency counters are kept in memory, never
+    the documents themselves or a document-term matrix.
+
+    Args:
+        documents (iterable): Document strings, typically streamed from disk.
+        max_features (int): Maximum number of features for the vectorizer.
+
+    Returns:
+        CountVectorizer: Fitted vectorizer with the pruned vocabulary.
+    """
+    vectorizer = build_vectorizer(max_features)
+    term_counts, doc_counts, n_documents = count_terms(documents, vectorizer.build_analyzer())
+    terms = prune_vocabulary(
+        term_counts,
+        doc_counts,
+        n_documents,
+        vectorizer.max_features,
+        vectorizer.max_df,
+        vectorizer.min_df,
+    )
+    logger.info(
+        "Built vocabulary of %s terms from %s candidates over %s documents",
+        len(terms),
+        len(term_counts),
+        n_documents,
+    )
+    return vectorizer_from_terms(terms, max_features)
+
+
+def iter_csr_chunks(chunks, vectorizer):
+    """Vectorize chunks of documents against a fixed vocabulary (pass 2).
+
+    Args:
+        chunks (iterable): Lists of document strings.
+        vectorizer: Fitted vectorizer.
+
+    Yields:
+        scipy.sparse.csr_matrix: Document-term matrix for each chunk.
+    """
+    for texts in chunks:
+        yield sp.csr_matrix(vectorizer.transform(texts))
+
+
+def vectorize_streaming(make_documents, chunk_size=1000, max_features=1000, vectorizer=None):
+    """Vectorize a corpus in two streaming passes.
+
+    Args:
+        make_documents: Callable returning a fresh iterable of document
+            strings; called once per pass.
+        chunk_size (int): Number of documents vectorized at once in pass 2.
+        max_features (int): Maximum number of features for the vectorizer.
+        vectorizer: Optional fitted vectorizer; skips pass 1 when given.
+
+    Returns:
+        tuple: (document-term matrix, fitted vectorizer)
+    """
+    if vectorizer is None:
+        vectorizer = build_vocabulary(make_documents(), max_features)
+
+    documents = iter(make_documents())
+    chunks = iter(lambda: list(islice(documents, chunk_size)), [])
+    matrices = list(iter_csr_chunks(chunks, vectorizer))
+    if not matrices:
+        raise ValueError("No documents to vectorize.")
+    doc_term_matrix = sp.vstack(matrices, format='csr')
+    logger.info(
+        "Vectorized %s documents with %s features",
+        doc_term_matrix.shape[0],
+        doc_term_matrix.shape[1],
+    )
+    return doc_term_matrix, vectorizer
+
+
+def save_vocabulary(vectorizer, path):
+    """Persist a fitted vectorizer's vocabulary as JSON.
+
+    Args:
+        vectorizer: Fitted vectorizer.
+        path (str): Destination file.
+    """
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    data = {"max_features": vectorizer.max_features, "terms": terms}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    logger.info("Saved vocabulary of %s terms to %s", len(terms), path)
+
+
+def load_vocabulary(path):
+    """Load a vocabulary saved by :func:`save_vocabulary`.
+
+    Args:
+        path (str): Vocabulary file.
+
+    Returns:
+        CountVectorizer: Fitted vectorizer using the stored vocabulary.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    logger.info("Loaded vocabulary of %s terms from %s", len(data["terms"]), path)
+    return vectorizer_from_terms(data["terms"], data["max_features"])
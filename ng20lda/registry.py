@@ -0,0 +1,342 @@
+"""Named, hot-swappable models for the API.
+
+The registry maps model names to the version currently serving them. A new
+version is loaded and warmed up off the request path, then swapped in
+atomically: requests that already hold the previous version finish with it,
+and the previous version is freed once the last of them releases it.
+
+Models are configured with a JSON file named by ``NG20LDA_MODEL_REGISTRY``::
+
+    {"models": {"news": {"path": "models/news", "version": "2024-05"}}}
+
+Relative paths are resolved against the directory of the file. The version
+defaults to the first characters of the model's content hash.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from ng20lda.core.inference import get_inference_engine
+from ng20lda.core.lda_model import get_top_words_per_topic, score_documents
+from ng20lda.core.metrics import get_metrics, timed
+from ng20lda.core.model_cache import load_model_with_hash
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TERMS = 16
+
+
+class UnknownModelError(KeyError):
+    """Raised when no version of a model name is being served."""
+
+
+class ModelVersion:
+    """One loaded version of a named model.
+
+    Attributes:
+        name (str): Model name.
+        version (str): Version label.
+        path (str): Absolute path the model was loaded from.
+        lda_model: Trained LDA model; None once the version is freed.
+        vectorizer: Fitted vectorizer; None once the version is freed.
+        content_hash (str): Content hash of the model.
+        loaded_at (float): Time the version finished warming up.
+        in_flight (int): Requests currently holding the version.
+        retired (bool): Whether a newer version replaced this one.
+        freed (threading.Event): Set once the version is retired and drained.
+    """
+
+    def __init__(self, name, version, path, lda_model, vectorizer, content_hash):
+        self.name = name
+        self.version = version
+        self.path = path
+        self.lda_model = lda_model
+        self.vectorizer = vectorizer
+        self.content_hash = content_hash
+        self.loaded_at = time.time()
+        self.in_flight = 0
+        self.retired = False
+        self.freed = threading.Event()
+
+    def topic_distributions(self, documents):
+        """Compute topic distributions with this version.
+
+        Args:
+            documents (list): Document strings.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_documents, n_topics).
+        """
+        return score_documents(documents, self.lda_model, self.vectorizer, self.content_hash)
+
+    def as_dict(self) -> dict:
+        """Describe the version as a plain dictionary."""
+        return {
+            "version": self.version,
+            "path": self.path,
+            "content_hash": self.content_hash,
+            "loaded_at": self.loaded_at,
+            "in_flight": self.in_flight,
+        }
+
+    def __repr__(self):
+        return f"ModelVersion({self.name!r}, {self.version!r})"
+
+
+def _warm_up(lda_model, vectorizer):
+    """Build the per-model indexes and run one inference."""
+    top_words = get_top_words_per_topic(lda_model, vectorizer)
+    terms = [word for words in top_words for word in words][:WARMUP_TERMS]
+    doc_term_matrix = vectorizer.transform([" ".join(terms)])
+    get_inference_engine(lda_model).transform(doc_term_matrix)
+
+
+def load_version(name, path, version=None):
+    """Load a model from disk and warm it up.
+
+    Args:
+        name (str): Model name.
+        path (str): Path to the saved model (pickle or artifact directory).
+        version (str, optional): Version label; defaults to the first 12
+            characters of the content hash.
+
+    Returns:
+        ModelVersion: The loaded version, ready to serve.
+    """
+    path = os.path.abspath(path)
+    start = time.perf_counter()
+    lda_model, vectorizer, _, content_hash = load_model_with_hash(path)
+    with timed("model_warmup"):
+        _warm_up(lda_model, vectorizer)
+    logger.info(
+        "Loaded model %s version %s from %s in %.3fs",
+        name, version or content_hash[:12], path, time.perf_counter() - start,
+    )
+    return ModelVersion(name, version or content_hash[:12], path, lda_model, vectorizer,
+                        content_hash)
+
+
+class ModelRegistry:
+    """Thread-safe mapping of model names to their serving version.
+
+    Args:
+        loader: Callable ``(name, path, version) -> ModelVersion``.
+            Defaults to :func:`load_version`.
+    """
+
+    def __init__(self, loader=None):
+        self._loader = loader or load_version
+        self._active: dict[str, ModelVersion] = {}
+        self._draining: list[ModelVersion] = []
+        self._loading: dict[str, dict] = {}
+        self._errors: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def register(self, name, path, version=None) -> ModelVersion:
+        """Load a version and start serving it under ``name``.
+
+        The version is loaded and warmed up before it replaces the current
+        one, so requests never wait for it.
+
+        Args:
+            name (str): Model name.
+            path (str): Path to the saved model.
+            version (str, optional): Version label.
+
+        Returns:
+            ModelVersion: The version now serving ``name``.
+        """
+        model_version = self._loader(name, path, version)
+        self._activate(model_version)
+        return model_version
+
+    def register_in_background(self, name, path, version=None):
+        """Load a version on the registry's loader thread and swap it in when warm.
+
+        Loads run one at a time, so at most one extra model is being loaded
+        at any moment. A failed load leaves the current version in place and
+        is reported by :meth:`status`.
+
+        Args:
+            name (str): Model name.
+            path (str): Path to the saved model.
+            version (str, optional): Version label.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the new version.
+
+        Raises:
+            RuntimeError: If a version of ``name`` is already being loaded.
+        """
+        with self._lock:
+            if name in self._loading:
+                raise RuntimeError(f"A version of model {name!r} is already loading.")
+            self._loading[name] = {"path": os.path.abspath(path), "version": version}
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="ng20lda-registry"
+                )
+        return self._executor.submit(self._register_pending, name, path, version)
+
+    def _register_pending(self, name, path, version):
+        try:
+            model_version = self.register(name, path, version)
+        except Exception as error:
+            logger.exception("Loading model %s from %s failed", name, path)
+            with self._lock:
+                self._errors[name] = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(name, None)
+        return model_version
+
+    def _activate(self, model_version):
+        with self._lock:
+            previous = self._active.get(model_version.name)
+            self._active[model_version.name] = model_version
+            self._errors.pop(model_version.name, None)
+            if previous is not None:
+                previous.retired = True
+                if previous.in_flight:
+                    self._draining.append(previous)
+                else:
+                    self._free(previous)
+        get_metrics().increment("model_swaps", model=model_version.name)
+        logger.info("Serving model %s version %s", model_version.name, model_version.version)
+
+    def _free(self, model_version):
+        # Called with the lock held. The inference engine and topic-word
+        # index are weakly keyed by the model and go with it.
+        model_version.lda_model = None
+        model_version.vectorizer = None
+        model_version.freed.set()
+        logger.info("Freed model %s version %s", model_version.name, model_version.version)
+
+    def checkout(self, name) -> ModelVersion:
+        """Return the version serving ``name`` and hold it until :meth:`release`.
+
+        Args:
+            name (str): Model name.
+
+        Returns:
+            ModelVersion: The current version.
+
+        Raises:
+            UnknownModelError: If ``name`` is not registered.
+        """
+        with self._lock:
+            model_version = self._active.get(name)
+            if model_version is None:
+                raise UnknownModelError(name)
+            model_version.in_flight += 1
+        return model_version
+
+    def release(self, model_version) -> None:
+        """Release a version obtained from :meth:`checkout`.
+
+        A retired version is freed when its last holder releases it.
+        """
+        with self._lock:
+            model_version.in_flight -= 1
+            if model_version.retired and not model_version.in_flight:
+                self._draining.remove(model_version)
+                self._free(model_version)
+
+    @contextmanager
+    def acquire(self, name):
+        """Hold the version serving ``name`` for the duration of a block.
+
+        Args:
+            name (str): Model name.
+
+        Yields:
+            ModelVersion: The current version.
+
+        Raises:
+            UnknownModelError: If ``name`` is not registered.
+        """
+        model_version = self.checkout(name)
+        try:
+            yield model_version
+        finally:
+            self.release(model_version)
+
+    def load_config(self, config_path) -> None:
+        """Register every model listed in a JSON configuration file.
+
+        Args:
+            config_path (str): Path to the configuration file.
+        """
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        base_dir = os.path.dirname(os.path.abspath(config_path))
+        for name, spec in config.get("models", {}).items():
+            self.register(name, os.path.join(base_dir, spec["path"]), spec.get("version"))
+
+    def status(self) -> dict:
+        """Describe the served, loading and draining versions of every model.
+
+        Returns:
+            dict: One entry per model name.
+        """
+        with self._lock:
+            names = set(self._active) | set(self._loading) | set(self._errors)
+            return {
+                name: {
+                    "active": self._active[name].as_dict() if name in self._active else None,
+                    "loading": self._loading.get(name),
+                    "draining": [
+                        model_version.as_dict()
+                        for model_version in self._draining
+                        if model_version.name == name
+                    ],
+                    "error": self._errors.get(name),
+                }
+                for name in sorted(names)
+            }
+
+    def __contains__(self, name) -> bool:
+        with self._lock:
+            return name in self._active
+
+    def clear(self) -> None:
+        """Stop serving every model."""
+        with self._lock:
+            active = list(self._active.values())
+            self._active.clear()
+            for model_version in active:
+                model_version.retired = True
+                if model_version.in_flight:
+                    self._draining.append(model_version)
+                else:
+                    self._free(model_version)
+
+    def shutdown(self) -> None:
+        """Stop the loader thread once pending loads are done."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_default_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    return _default_registry
+
+
+def load_registry_config() -> None:
+    """Register the models listed in ``NG20LDA_MODEL_REGISTRY``, if set."""
+    config_path = os.environ.get("NG20LDA_MODEL_REGISTRY")
+    if config_path:
+        _default_registry.load_config(config_path)
@@ -0,0 +1,145 @@
+"""Bounded, coalescing execution of inference work for the API."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ng20lda.config import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the dispatcher already holds its maximum number of requests."""
+
+
+def _default_infer(model_key, documents):
+    # Keys are model paths, or loaded models such as registry versions
+    if not isinstance(model_key, str):
+        return model_key.topic_distributions(documents)
+    from ng20lda.core.lda_model import get_topic_distributions
+
+    return get_topic_distributions(documents, model_key)
+
+
+class InferenceDispatcher:
+    """Run CPU-bound inference on a dedicated, size-limited thread pool.
+
+    Topic distribution requests for the same model that arrive within
+    ``batch_window`` seconds of each other are coalesced into a single
+    ``transform`` call. The number of requests admitted at once (queued
+    or running) is capped at ``max_queue_depth``; further requests fail
+    immediately with :class:`QueueFullError` instead of adding latency.
+
+    Args:
+        max_workers (int): Number of inference threads.
+        max_queue_depth (int): Maximum number of admitted requests.
+        batch_window (float): Seconds to wait for more requests to coalesce.
+        max_batch_size (int): Batch size that triggers an immediate flush.
+        infer: Callable ``(model_key, documents) -> distributions`` used for
+            coalesced batches.
+    """
+
+    def __init__(self, max_workers=4, max_queue_depth=64, batch_window=0.002,
+                 max_batch_size=32, infer=None):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._infer = infer or _default_infer
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ng20lda-inference"
+        )
+        self._pending = {}
+        self.depth = 0
+        self.batches = 0
+
+    def _admit(self):
+        if self.depth >= self.max_queue_depth:
+            raise QueueFullError(f"Inference queue is full ({self.max_queue_depth} requests).")
+        self.depth += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run ``func`` on the inference pool, subject to the queue limit.
+
+        Raises:
+            QueueFullError: If the dispatcher is at capacity.
+        """
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            self.depth -= 1
+
+    async def topic_distribution(self, model_key, document):
+        """Return the topic distribution of one document, batched with others.
+
+        Args:
+            model_key (str): Model the document is scored with.
+            document (str): Document text.
+
+        Returns:
+            numpy.ndarray: Topic distribution of the document.
+
+        Raises:
+            QueueFullError: If the dispatcher is at capacity.
+        """
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            batch = self._pending.setdefault(model_key, [])
+            batch.append((document, future))
+            if len(batch) >= self.max_batch_size:
+                self._flush(model_key)
+            elif len(batch) == 1:
+                loop.call_later(self.batch_window, self._flush, model_key)
+            return await future
+        finally:
+            self.depth -= 1
+
+    def _flush(self, model_key):
+        batch = self._pending.pop(model_key, None)
+        if not batch:
+            return
+        documents = [document for document, _ in batch]
+        futures = [future for _, future in batch]
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self._executor, self._infer, model_key, documents)
+
+        def deliver(done):
+            error = done.exception()
+            for index, future in enumerate(futures):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(done.result()[index])
+
+        task.add_done_callback(deliver)
+
+    def shutdown(self):
+        """Stop the inference threads once queued work is done."""
+        self._executor.shutdown(wait=True)
+
+
+def create_dispatcher():
+    """Create a dispatcher configured from ``NG20LDA_*`` environment variables.
+
+    Returns:
+        InferenceDispatcher: The configured dispatcher.
+    """
+    return InferenceDispatcher(
+        max_workers=env_int("NG20LDA_INFERENCE_WORKERS", 4),
+        max_queue_depth=env_int("NG20LDA_MAX_QUEUE_DEPTH", 64),
+        batch_window=env_float("NG20LDA_BATCH_WINDOW_MS", 2.0) / 1000.0,
+        max_batch_size=env_int("NG20LDA_MAX_BATCH_SIZE", 32),
+    )
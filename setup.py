@@ -28,6 +28,7 @@ setup(
         "numpy>=1.20.0",
         "typer>=0.9.0",
         "fastapi>=0.110.0",
+        "python-multipart>=0.0.9",
         "uvicorn>=0.27.0",
         "matplotlib>=3.7.0",
     ],
@@ -35,6 +36,7 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "hypothesis>=6.0.0",
+            "httpx>=0.24.0",
             "sphinx>=5.0.0",
             "sphinx-rtd-theme>=1.0.0",
         ],
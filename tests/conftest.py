@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from ng20lda.core.document_processor import vectorize_documents
+from ng20lda.core.lda_model import save_model, train_lda_model
+
+TOPIC_WORDS = [
+    ["graphics", "image", "render", "pixel", "color", "display", "video", "screen"],
+    ["space", "orbit", "launch", "nasa", "rocket", "moon", "shuttle", "satellite"],
+    ["hockey", "team", "game", "season", "player", "goal", "league", "playoff"],
+]
+
+
+def make_documents(n_documents: int = 30) -> list[str]:
+    documents = []
+    for i in range(n_documents):
+        words = TOPIC_WORDS[i % len(TOPIC_WORDS)]
+        documents.append(" ".join(words[(i + j) % len(words)] for j in range(12)))
+    return documents
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    root = tmp_path / "corpus"
+    for i, document in enumerate(make_documents()):
+        category = root / f"cat{i % len(TOPIC_WORDS)}"
+        category.mkdir(parents=True, exist_ok=True)
+        (category / f"{i}.txt").write_text(document, encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    doc_term_matrix, vectorizer = vectorize_documents(make_documents())
+    lda_model = train_lda_model(doc_term_matrix, n_topics=3)
+    path = tmp_path / "lda.pkl"
+    save_model(lda_model, vectorizer, str(path))
+    return path
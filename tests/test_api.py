@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+
+from ng20lda.api import app
+from ng20lda.core.result_cache import get_result_cache
+
+client = TestClient(app)
+
+
+def test_describe_batch_returns_one_result_per_document(corpus_dir, model_path) -> None:
+    paths = sorted(str(path) for path in corpus_dir.rglob("*.txt"))[:4]
+
+    response = client.post(
+        "/describe/batch",
+        json={"document_paths": paths, "model_path": str(model_path), "n_topics": 2},
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["document"] for result in results] == paths
+    assert all(len(result["topics"]) == 2 for result in results)
+
+
+def test_describe_batch_reports_missing_documents(model_path) -> None:
+    response = client.post(
+        "/describe/batch",
+        json={"document_paths": ["missing.txt"], "model_path": str(model_path)},
+    )
+
+    assert response.status_code == 404
+
+
+def test_describe_batch_rejects_oversized_batches(monkeypatch, model_path) -> None:
+    monkeypatch.setattr("ng20lda.api.MAX_BATCH_DOCUMENTS", 2)
+
+    response = client.post(
+        "/describe/batch",
+        json={"document_paths": ["a.txt", "b.txt", "c.txt"], "model_path": str(model_path)},
+    )
+
+    assert response.status_code == 413
+    assert "/describe/stream" in response.json()["detail"]
+
+
+def test_describe_and_visualize(corpus_dir, model_path) -> None:
+    document = str(next(corpus_dir.rglob("*.txt")))
+    body = {"document_path": document, "model_path": str(model_path)}
+
+    described = client.post("/describe", json=body)
+    visualized = client.post("/visualize", json=body)
+
+    assert described.status_code == 200
+    assert described.json()["description"].startswith(f"Document: {document}")
+    assert visualized.status_code == 200
+    assert visualized.content.startswith(b"\x89PNG")
+
+
+def test_describe_returns_404_for_missing_document(model_path) -> None:
+    response = client.post(
+        "/describe", json={"document_path": "missing.txt", "model_path": str(model_path)}
+    )
+
+    assert response.status_code == 404
+
+
+def test_visualize_supports_conditional_requests(corpus_dir, model_path) -> None:
+    document = str(next(corpus_dir.rglob("*.txt")))
+    body = {"document_path": document, "model_path": str(model_path), "n_topics": 2}
+
+    first = client.post("/visualize", json=body)
+    etag = first.headers["etag"]
+    cached = client.post("/visualize", json=body)
+    revalidated = client.post("/visualize", json=body, headers={"If-None-Match": etag})
+    other = client.post("/visualize", json={**body, "n_topics": 3}, headers={"If-None-Match": etag})
+
+    assert cached.content == first.content
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+
+def test_metrics_exposes_stages_and_requests(corpus_dir, model_path) -> None:
+    document = str(next(corpus_dir.rglob("*.txt")))
+    get_result_cache().clear()
+    client.post("/describe", json={"document_path": document, "model_path": str(model_path)})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'ng20lda_stage_seconds_count{stage="lda_transform"}' in text
+    assert 'route="/describe",status="200"' in text
+    assert 'ng20lda_cache_entries{cache="model"}' in text
+
+
+def test_named_models_are_served_and_swapped(corpus_dir, model_path, tmp_path) -> None:
+    from ng20lda.registry import get_model_registry
+
+    registry = get_model_registry()
+    document = str(next(corpus_dir.rglob("*.txt")))
+    registry.register("news", str(model_path), "v1")
+    try:
+        described = client.post("/describe", json={"document_path": document, "model": "news"})
+        unknown = client.post("/describe", json={"document_path": document, "model": "other"})
+        loading = client.post(
+            "/admin/models/news", json={"path": str(model_path), "version": "v2"}
+        )
+        registry.shutdown()
+        models = client.get("/models").json()["models"]
+    finally:
+        registry.clear()
+
+    assert described.status_code == 200
+    assert described.json()["description"].startswith(f"Document: {document}")
+    assert unknown.status_code == 404
+    assert loading.status_code == 202
+    assert models["news"]["active"]["version"] == "v2"
+
+
+def test_requests_need_exactly_one_model(corpus_dir, model_path) -> None:
+    document = str(next(corpus_dir.rglob("*.txt")))
+
+    response = client.post(
+        "/describe",
+        json={"document_path": document, "model": "news", "model_path": str(model_path)},
+    )
+
+    assert response.status_code == 422
+
+
+def test_describe_accepts_inline_text(model_path) -> None:
+    response = client.post(
+        "/describe", json={"text": "space orbit launch nasa", "model_path": str(model_path)}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["description"].startswith("Document: <text>")
+
+
+def test_describe_stream_returns_ndjson_results(model_path) -> None:
+    lines = [
+        json.dumps({"id": "a", "text": "space orbit launch"}),
+        "not json",
+        json.dumps({"text": "hockey team game"}),
+    ]
+
+    def body():
+        # Split mid-line to exercise incremental parsing
+        payload = ("\n".join(lines) + "\n").encode()
+        yield payload[:10]
+        yield payload[10:]
+
+    response = client.post(
+        "/describe/stream",
+        params={"model_path": str(model_path), "n_topics": 2, "chunk_size": 1},
+        content=body(),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result.get("document") for result in results] == ["a", None, "3"]
+    assert results[1]["line"] == 2
+    assert len(results[2]["topics"]) == 2
+
+
+def test_describe_upload_describes_each_file(model_path) -> None:
+    response = client.post(
+        "/describe/upload",
+        data={"model_path": str(model_path)},
+        files=[
+            ("files", ("space.txt", b"space orbit launch", "text/plain")),
+            ("files", ("hockey.txt", b"hockey team game", "text/plain")),
+        ],
+    )
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["document"] for result in results] == ["space.txt", "hockey.txt"]
+
+
+def test_describe_upload_reads_files_in_pieces(monkeypatch, model_path) -> None:
+    monkeypatch.setattr("ng20lda.api.UPLOAD_READ_SIZE", 1)
+    text = "café space orbit launch"
+
+    response = client.post(
+        "/describe/upload",
+        data={"model_path": str(model_path)},
+        files=[("files", ("space.txt", text.encode("utf-8"), "text/plain"))],
+    )
+    streamed = client.post(
+        "/describe/stream",
+        params={"model_path": str(model_path)},
+        content=json.dumps({"text": text}).encode("utf-8"),
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.text)["topics"] == json.loads(streamed.text)["topics"]
+
+
+def test_describe_upload_rejects_oversized_files(monkeypatch, model_path) -> None:
+    monkeypatch.setattr("ng20lda.api.MAX_UPLOAD_BYTES", 8)
+
+    response = client.post(
+        "/describe/upload",
+        data={"model_path": str(model_path)},
+        files=[
+            ("files", ("small.txt", b"space", "text/plain")),
+            ("files", ("large.txt", b"hockey team game", "text/plain")),
+        ],
+    )
+
+    assert response.status_code == 413
+    assert "large.txt" in response.json()["detail"]
+
+
+def test_describe_stream_rejects_unknown_model() -> None:
+    response = client.post("/describe/stream", params={"model": "missing"}, content=b"")
+
+    assert response.status_code == 404
+
+
+def test_similar_returns_related_documents(corpus_dir, model_path, tmp_path) -> None:
+    from ng20lda.core.similarity import build_similarity_index
+
+    paths = sorted(str(path) for path in corpus_dir.rglob("*.txt"))
+    index_path = str(tmp_path / "index")
+    build_similarity_index(paths, str(model_path), index_path)
+
+    by_id = client.post("/similar", json={"index_path": index_path, "id": paths[0], "k": 2})
+    by_text = client.post(
+        "/similar",
+        json={"index_path": index_path, "text": "space orbit launch", "model_path": str(model_path)},
+    )
+    no_model = client.post("/similar", json={"index_path": index_path, "text": "space"})
+
+    assert by_id.status_code == 200
+    assert len(by_id.json()["results"]) == 2
+    assert by_text.status_code == 200
+    assert len(by_text.json()["results"]) == 10
+    assert no_model.status_code == 422
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ng20lda.core.artifact import is_artifact, read_manifest
+from ng20lda.core.document_processor import build_hashing_vectorizer, load_documents_recursive
+from ng20lda.core.lda_model import (
+    get_top_words_per_topic,
+    infer_model_format,
+    load_model,
+    save_model,
+    train_lda_model,
+)
+from ng20lda.core.topic_words import name_hashed_features
+from ng20lda.core.model_cache import ModelCache
+
+
+def test_artifact_round_trip_matches_pickle(tmp_path, model_path) -> None:
+    lda_model, vectorizer = load_model(str(model_path))
+    artifact_path = tmp_path / "model"
+
+    save_model(lda_model, vectorizer, str(artifact_path), model_format="artifact")
+    loaded_lda, loaded_vectorizer = load_model(str(artifact_path))
+
+    assert is_artifact(str(artifact_path))
+    assert isinstance(loaded_lda.components_, np.memmap)
+    assert loaded_vectorizer.vocabulary_ == vectorizer.vocabulary_
+    documents = ["space orbit launch", "hockey team goal season"]
+    np.testing.assert_allclose(
+        loaded_lda.transform(loaded_vectorizer.transform(documents)),
+        lda_model.transform(vectorizer.transform(documents)),
+    )
+
+
+def test_artifact_content_hash_is_stable(tmp_path, model_path) -> None:
+    lda_model, vectorizer = load_model(str(model_path))
+
+    save_model(lda_model, vectorizer, str(tmp_path / "a"), model_format="artifact")
+    save_model(lda_model, vectorizer, str(tmp_path / "b"), model_format="artifact")
+
+    assert read_manifest(str(tmp_path / "a"))["content_hash"] == (
+        read_manifest(str(tmp_path / "b"))["content_hash"]
+    )
+
+
+def test_model_cache_reloads_resaved_artifact(tmp_path, model_path) -> None:
+    lda_model, vectorizer = load_model(str(model_path))
+    artifact_path = str(tmp_path / "model")
+    save_model(lda_model, vectorizer, artifact_path, model_format="artifact")
+    cache = ModelCache()
+
+    first, _ = cache.get(artifact_path)
+    assert cache.get(artifact_path)[0] is first
+    save_model(lda_model, vectorizer, artifact_path, model_format="artifact")
+
+    assert cache.get(artifact_path)[0] is not first
+    assert cache.stats.reloads == 1
+
+
+def test_hashing_model_round_trips_without_vocabulary(tmp_path, corpus_dir) -> None:
+    documents = load_documents_recursive(str(corpus_dir))
+    vectorizer = build_hashing_vectorizer(n_features=2 ** 12)
+    lda_model = train_lda_model(vectorizer.transform(documents), n_topics=3)
+    name_hashed_features(lda_model, vectorizer, documents)
+
+    for path, model_format in ((tmp_path / "model", "artifact"), (tmp_path / "model.pkl", "pickle")):
+        save_model(lda_model, vectorizer, str(path), model_format=model_format)
+        loaded_lda, loaded_vectorizer = load_model(str(path))
+
+        assert not hasattr(loaded_vectorizer, "vocabulary_")
+        assert loaded_vectorizer.feature_names_ == vectorizer.feature_names_
+        assert get_top_words_per_topic(loaded_lda, loaded_vectorizer) == (
+            get_top_words_per_topic(lda_model, vectorizer)
+        )
+        np.testing.assert_allclose(
+            loaded_lda.transform(loaded_vectorizer.transform(documents[:2])),
+            lda_model.transform(vectorizer.transform(documents[:2])),
+            rtol=1e-5,
+        )
+    assert read_manifest(str(tmp_path / "model"))["vectorizer_class"] == "HashingVectorizer"
+
+
+def test_models_are_pickles_unless_asked_for_artifacts(tmp_path) -> None:
+    existing = tmp_path / "existing"
+    existing.mkdir()
+
+    assert infer_model_format(str(tmp_path / "model.bin")) == "pickle"
+    assert infer_model_format(str(tmp_path / "models" / "news")) == "pickle"
+    assert infer_model_format(str(tmp_path / "news") + "/") == "artifact"
+    assert infer_model_format(str(existing)) == "artifact"
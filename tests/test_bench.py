@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+
+from typer.testing import CliRunner
+
+from ng20lda.bench import compare_reports, run_benchmarks, summarize
+from ng20lda.cli.typer_app import app
+
+runner = CliRunner()
+
+
+def test_summarize_percentiles_and_throughput() -> None:
+    summary = summarize([0.01, 0.02, 0.03, 0.04], n_items=10)
+
+    assert summary["count"] == 4
+    assert summary["p50_ms"] == 25.0
+    assert round(summary["throughput_per_s"]) == 400
+
+
+def test_run_benchmarks_covers_every_stage() -> None:
+    report = run_benchmarks(n_documents=60, n_topics=3, queries=4, repeat=1)
+
+    assert set(report["stages"]) == {
+        "load_documents_recursive",
+        "vectorize_documents",
+        "train_lda_model",
+        "save_model[pickle]",
+        "load_model[pickle]",
+        "save_model[artifact]",
+        "load_model[artifact]",
+        "describe_document",
+        "POST /describe",
+        "POST /visualize",
+        "POST /describe/batch",
+        "POST /describe[artifact]",
+    }
+    assert report["stages"]["describe_document"]["count"] == 4
+    assert all("peak_rss_bytes" not in summary for summary in report["stages"].values())
+    json.dumps(report)
+
+
+def test_compare_reports_flags_slower_stages() -> None:
+    baseline = {"stages": {"train": {"p50_ms": 100.0}, "load": {"p50_ms": 10.0}}}
+    report = {"stages": {"train": {"p50_ms": 150.0}, "load": {"p50_ms": 11.0}, "new": {"p50_ms": 1.0}}}
+
+    regressions = compare_reports(report, baseline, tolerance=0.25)
+
+    assert [regression["stage"] for regression in regressions] == ["train"]
+    assert regressions[0]["ratio"] == 1.5
+
+
+def test_bench_command_fails_on_regression(tmp_path) -> None:
+    output = tmp_path / "report.json"
+    result = runner.invoke(
+        app,
+        ["bench", "--n-documents", "40", "-n", "2", "--queries", "2", "--repeat", "1",
+         "--no-api", "--output", str(output)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "train_lda_model" in result.output
+
+    baseline = json.loads(output.read_text())
+    for summary in baseline["stages"].values():
+        summary["p50_ms"] /= 100
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline))
+
+    result = runner.invoke(
+        app,
+        ["bench", "--n-documents", "40", "-n", "2", "--queries", "2", "--repeat", "1",
+         "--no-api", "--baseline", str(baseline_path)],
+    )
+    assert result.exit_code == 1
+    assert "Regression" in result.output
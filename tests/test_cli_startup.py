@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = {"numpy", "scipy", "sklearn", "matplotlib"}
+# Generous budget for the time spent importing modules, in microseconds; a
+# regression that pulls in scikit-learn alone costs several times this.
+IMPORT_BUDGET_US = 400_000
+
+
+def _import_times(args):
+    """Run the CLI under ``-X importtime`` and return ``{module: self time}``."""
+    code = f"from ng20lda.cli.typer_app import app; app({args!r})"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert completed.returncode == 0, completed.stderr
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize("args", [["--help"], ["count", __file__]])
+def test_light_commands_skip_heavy_dependencies(args) -> None:
+    times = _import_times(args)
+
+    loaded = {module.split(".")[0] for module in times}
+    assert not loaded & HEAVY_MODULES
+    assert sum(times.values()) < IMPORT_BUDGET_US
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.corpus_store import (
+    PackedCorpus,
+    PackedCorpusWriter,
+    is_packed_corpus,
+    write_packed_corpus,
+)
+from ng20lda.core.document_processor import iter_documents
+from ng20lda.core.parallel import vectorize_paths_parallel
+from ng20lda.core.vocabulary import build_vocabulary
+
+runner = CliRunner()
+
+
+def test_packed_corpus_round_trip(tmp_path) -> None:
+    documents = [("a/0.txt", "héllo wörld"), ("a/1.txt", ""), ("b/0.txt", "third")]
+    assert write_packed_corpus(documents, str(tmp_path / "packed")) == 3
+
+    with PackedCorpus(str(tmp_path / "packed")) as corpus:
+        assert list(corpus.iter_documents()) == documents
+        assert corpus.get("b/0.txt") == "third"
+        assert bytes(corpus.document_bytes(0)) == "héllo wörld".encode("utf-8")
+        with pytest.raises(KeyError):
+            corpus.get("missing")
+
+
+def test_packed_corpus_append_rejects_duplicates(tmp_path) -> None:
+    path = str(tmp_path / "packed")
+    write_packed_corpus([("a", "first")], path)
+    write_packed_corpus([("b", "second")], path, append=True)
+
+    with pytest.raises(ValueError):
+        with PackedCorpusWriter(path, append=True) as writer:
+            writer.add("a", "again")
+
+    with PackedCorpus(path) as corpus:
+        assert list(corpus.iter_documents()) == [("a", "first"), ("b", "second")]
+
+
+def test_interrupted_write_keeps_previous_corpus(tmp_path) -> None:
+    path = str(tmp_path / "packed")
+    documents = [("a", "first"), ("b", "second"), ("c", "third")]
+    write_packed_corpus(documents, path)
+
+    def interrupted():
+        yield "d", "fourth"
+        raise KeyboardInterrupt
+
+    for append in (False, True):
+        with pytest.raises(KeyboardInterrupt):
+            write_packed_corpus(interrupted(), path, append=append)
+
+        assert is_packed_corpus(path)
+        with PackedCorpus(path) as corpus:
+            assert list(corpus.iter_documents()) == documents
+    assert sorted(os.listdir(path)) == ["data.bin", "ids.txt", "manifest.json", "offsets.npy"]
+    assert os.path.getsize(os.path.join(path, "data.bin")) == len("firstsecondthird")
+
+
+def test_iter_documents_reads_packed_corpus(tmp_path, corpus_dir) -> None:
+    packed = str(tmp_path / "packed")
+    write_packed_corpus(iter_documents(str(corpus_dir)), packed)
+
+    assert is_packed_corpus(packed)
+    assert not is_packed_corpus(str(corpus_dir))
+    assert list(iter_documents(packed)) == list(iter_documents(str(corpus_dir)))
+
+
+def test_parallel_vectorization_of_packed_corpus(tmp_path, corpus_dir) -> None:
+    packed = str(tmp_path / "packed")
+    n_documents = write_packed_corpus(iter_documents(str(corpus_dir)), packed)
+    vectorizer = build_vocabulary(text for _, text in iter_documents(str(corpus_dir)))
+    expected = vectorizer.transform(text for _, text in iter_documents(str(corpus_dir)))
+
+    matrix = vectorize_paths_parallel(
+        range(n_documents), vectorizer, workers=2, shard_size=7, corpus_path=packed
+    )
+
+    assert (matrix != expected).nnz == 0
+
+
+def test_cli_pack_train_and_describe_batch(tmp_path, corpus_dir) -> None:
+    packed = tmp_path / "packed"
+    model = tmp_path / "lda.pkl"
+
+    packed_result = runner.invoke(app, ["pack", str(corpus_dir), str(packed)])
+    train_result = runner.invoke(app, ["train", str(packed), str(model), "-n", "3"])
+    describe_result = runner.invoke(app, ["describe-batch", str(packed), str(model)])
+
+    assert packed_result.exit_code == 0, packed_result.output
+    assert train_result.exit_code == 0, train_result.output
+    assert describe_result.exit_code == 0, describe_result.output
+    assert '"document": "cat0/0.txt"' in describe_result.output
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import tarfile
+
+import pytest
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.corpus_store import PackedCorpus
+from ng20lda.core.data_fetcher import (
+    INGEST_MANIFEST_NAME,
+    fetch_and_save_ng20,
+    ingest_ng20,
+    load_newsgroups,
+)
+
+POSTS = {
+    "20news-bydate-train/sci.space/61000": "From: a@b.c\nSubject: orbit\n\nThe shuttle reached orbit.",
+    "20news-bydate-train/sci.space/60999": "From: d@e.f\nSubject: moon\n\nLanding on the moon.",
+    "20news-bydate-train/rec.sport.hockey/52000": "From: g@h.i\nSubject: goal\n\nWhat a goal.",
+    "20news-bydate-test/sci.space/62000": "From: j@k.l\nSubject: mars\n\nMars next.",
+    "20news-bydate-test/rec.sport.hockey/53000": (
+        "From: m@n.o\nSubject: re: goal\n\nIn article <1@h.i> g@h.i writes:\n"
+        "> What a goal.\nAgreed.\n--\nFan"
+    ),
+}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "20news-bydate.tar.gz"
+    with tarfile.open(path, "w:gz") as tar:
+        for name, text in POSTS.items():
+            payload = text.encode("latin1")
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            tar.addfile(info, io.BytesIO(payload))
+    return str(path)
+
+
+def test_load_newsgroups_reads_archive_in_sklearn_order(archive) -> None:
+    train = load_newsgroups(archive=archive)
+    everything = load_newsgroups(subset="all", archive=archive)
+
+    assert sorted(train) == ["rec.sport.hockey", "sci.space"]
+    # Headers are stripped and files are ordered by name
+    assert train["sci.space"] == ["Landing on the moon.", "The shuttle reached orbit."]
+    assert everything["sci.space"][-1] == "Mars next."
+    # Quotes and the signature are stripped too
+    assert everything["rec.sport.hockey"][-1] == "Agreed."
+    with pytest.raises(ValueError):
+        load_newsgroups(["comp.graphics"], archive=archive)
+
+
+def test_ingest_writes_categories_and_resumes(tmp_path, archive) -> None:
+    output_dir = tmp_path / "out"
+
+    first = ingest_ng20(str(output_dir), archive=archive)
+    second = ingest_ng20(str(output_dir), archive=archive)
+
+    assert first == (3, 0)
+    assert second == (0, 3)
+    assert (output_dir / "sci_space" / "1.txt").read_text() == "The shuttle reached orbit."
+    assert (output_dir / "rec_sport_hockey" / "0.txt").read_text() == "What a goal."
+
+    # A truncated file and a torn manifest line are repaired on the next run
+    (output_dir / "sci_space" / "0.txt").write_text("Land")
+    with open(output_dir / INGEST_MANIFEST_NAME, "a") as manifest:
+        manifest.write('{"id": "rec_sport')
+    os.remove(output_dir / "rec_sport_hockey" / "0.txt")
+
+    assert ingest_ng20(str(output_dir), archive=archive) == (2, 1)
+    assert (output_dir / "sci_space" / "0.txt").read_text() == "Landing on the moon."
+    with open(output_dir / INGEST_MANIFEST_NAME) as manifest:
+        lines = manifest.read().splitlines()
+    assert sum(1 for line in lines if line.startswith("{") and line.endswith("}")) == 5
+    assert ingest_ng20(str(output_dir), archive=archive) == (0, 3)
+
+
+def test_ingest_packed_skips_existing_ids(tmp_path, archive) -> None:
+    output_dir = str(tmp_path / "packed")
+
+    ingest_ng20(output_dir, categories=["sci.space"], n_documents=1, archive=archive, packed=True)
+    written, skipped = ingest_ng20(output_dir, archive=archive, packed=True)
+
+    assert (written, skipped) == (2, 1)
+    with PackedCorpus(output_dir) as corpus:
+        assert sorted(corpus.ids) == [
+            "rec_sport_hockey/0.txt", "sci_space/0.txt", "sci_space/1.txt"
+        ]
+
+
+def test_fetch_packed_twice_skips_existing_ids(tmp_path, monkeypatch) -> None:
+    import sklearn.datasets
+    from sklearn.utils import Bunch
+
+    texts = ["first post", "second post", "third post"]
+    monkeypatch.setattr(
+        sklearn.datasets, "fetch_20newsgroups", lambda **kwargs: Bunch(data=texts)
+    )
+    output_dir = str(tmp_path / "packed")
+
+    fetch_and_save_ng20("sci.space", 2, output_dir, packed=True)
+    fetch_and_save_ng20("sci.space", 3, output_dir, packed=True)
+
+    with PackedCorpus(output_dir) as corpus:
+        assert list(corpus.iter_documents()) == [
+            (f"sci_space/{i}.txt", text) for i, text in enumerate(texts)
+        ]
+
+
+def test_ingest_command(tmp_path, archive) -> None:
+    result = CliRunner().invoke(
+        app,
+        ["ingest", str(tmp_path / "out"), "--archive", archive, "-c", "sci.space", "--subset", "all"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Wrote 3 documents" in result.output
+    records = [
+        json.loads(line) for line in (tmp_path / "out" / INGEST_MANIFEST_NAME).read_text().splitlines()
+    ]
+    assert sorted(record["id"] for record in records) == [
+        "sci_space/0.txt", "sci_space/1.txt", "sci_space/2.txt"
+    ]
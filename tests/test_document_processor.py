@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from ng20lda.core.document_processor import (
+    build_hashing_vectorizer,
+    find_documents,
+    iter_document_chunks,
+    iter_documents,
+    load_documents_recursive,
+    minimal_vectorizer,
+    vectorize_documents,
+)
+
+
+def test_find_documents_accepts_directory_and_glob(corpus_dir) -> None:
+    from_dir = find_documents(str(corpus_dir))
+    from_glob = find_documents(os.path.join(str(corpus_dir), "**", "*.txt"))
+
+    assert len(from_dir) == 30
+    assert from_dir == from_glob
+    assert find_documents(from_dir[0]) == [from_dir[0]]
+
+
+def test_iter_documents_yields_relative_ids(corpus_dir) -> None:
+    sequential = list(iter_documents(str(corpus_dir)))
+    threaded = list(iter_documents(str(corpus_dir), max_workers=4))
+
+    assert sequential == threaded
+    assert sequential[0][0] == "cat0/0.txt"
+    assert [text for _, text in sequential] == load_documents_recursive(str(corpus_dir))
+
+
+def test_iter_document_chunks_respects_chunk_size(corpus_dir) -> None:
+    chunks = list(iter_document_chunks(str(corpus_dir), chunk_size=8))
+
+    assert [len(doc_ids) for doc_ids, _ in chunks] == [8, 8, 8, 6]
+    assert all(len(doc_ids) == len(texts) for doc_ids, texts in chunks)
+
+
+def test_vectorize_documents_accepts_generator(corpus_dir) -> None:
+    from_list, _ = vectorize_documents(load_documents_recursive(str(corpus_dir)))
+    from_generator, _ = vectorize_documents(text for _, text in iter_documents(str(corpus_dir)))
+
+    assert (from_list != from_generator).nnz == 0
+
+
+def test_vectorize_documents_keeps_minimal_state(corpus_dir) -> None:
+    documents = load_documents_recursive(str(corpus_dir))
+    doc_term_matrix, vectorizer = vectorize_documents(documents)
+
+    assert not hasattr(vectorizer, "stop_words_")
+    assert all(type(index) is int for index in vectorizer.vocabulary_.values())
+    assert (vectorizer.transform(documents) != doc_term_matrix).nnz == 0
+    assert minimal_vectorizer(vectorizer).vocabulary_ == vectorizer.vocabulary_
+
+
+def test_hashing_vectorizer_counts_into_fixed_features() -> None:
+    vectorizer = build_hashing_vectorizer(n_features=64)
+
+    matrix = vectorizer.transform(["orbit orbit launch the"])
+
+    assert matrix.shape == (1, 64)
+    assert matrix.dtype == np.float32
+    assert sorted(matrix.data.tolist()) in ([1.0, 2.0], [3.0])
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ng20lda.core.inference import InferenceEngine, get_inference_engine
+from ng20lda.core.lda_model import load_model
+
+
+def test_inference_engine_matches_sklearn_transform(model_path) -> None:
+    lda_model, vectorizer = load_model(str(model_path))
+    documents = [
+        "space orbit launch nasa rocket",
+        "hockey team game season player goal hockey",
+        "graphics image space hockey",
+        "",
+    ]
+    doc_term_matrix = vectorizer.transform(documents)
+
+    engine = InferenceEngine(lda_model)
+
+    np.testing.assert_allclose(
+        engine.transform(doc_term_matrix),
+        lda_model.transform(doc_term_matrix),
+        # Models are trained in float32
+        rtol=1e-5,
+        atol=1e-7,
+    )
+
+
+def test_get_inference_engine_is_cached_per_model(model_path) -> None:
+    lda_model, _ = load_model(str(model_path))
+
+    assert get_inference_engine(lda_model) is get_inference_engine(lda_model)
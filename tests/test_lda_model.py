@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.document_processor import (
+    find_documents,
+    iter_document_chunks,
+    iter_documents,
+)
+from ng20lda.core.lda_model import (
+    describe_documents,
+    get_document_topic_distribution,
+    get_top_words_per_topic,
+    load_model,
+    train_lda_model_online,
+)
+from ng20lda.core.topic_words import top_k_indices
+from ng20lda.core.vocabulary import build_vocabulary
+
+
+def test_top_k_indices_matches_argsort() -> None:
+    rng = np.random.default_rng(0)
+    matrix = rng.random((20, 8))
+
+    expected = np.argsort(-matrix, axis=1)[:, :3]
+
+    np.testing.assert_array_equal(top_k_indices(matrix, 3), expected)
+
+
+def test_describe_documents_matches_single_document_path(corpus_dir, model_path) -> None:
+    paths = find_documents(str(corpus_dir))
+
+    results = list(describe_documents(paths, str(model_path), n_topics=2, chunk_size=7))
+
+    assert [result["document"] for result in results] == paths
+    for result in results[:5]:
+        distribution = get_document_topic_distribution(result["document"], str(model_path))
+        top = result["topics"][0]
+        assert top["topic"] == int(distribution.argmax())
+        assert np.isclose(top["probability"], distribution.max())
+        assert len(result["topics"]) == 2
+
+
+def test_train_lda_model_online_checkpoints_each_pass(corpus_dir) -> None:
+    vectorizer = build_vocabulary(text for _, text in iter_documents(str(corpus_dir)))
+    checkpoints = []
+
+    def make_chunks():
+        for _, texts in iter_document_chunks(str(corpus_dir), chunk_size=8):
+            yield vectorizer.transform(texts)
+
+    lda_model = train_lda_model_online(
+        make_chunks,
+        total_samples=30,
+        n_topics=3,
+        batch_size=8,
+        passes=2,
+        checkpoint=checkpoints.append,
+        checkpoint_every=3,
+    )
+
+    assert lda_model.components_.shape == (3, len(vectorizer.vocabulary_))
+    assert lda_model.n_batch_iter_ == 9
+    assert len(checkpoints) == 4
+
+
+def test_train_with_hashed_features_skips_vocabulary(tmp_path, corpus_dir) -> None:
+    runner = CliRunner()
+    for mode in ("batch", "online"):
+        output = tmp_path / f"{mode}.pkl"
+        result = runner.invoke(
+            app,
+            ["train", str(corpus_dir), str(output), "-n", "3", "--mode", mode,
+             "--hash-features", "4096"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "MB, loads in" in result.output
+        lda_model, vectorizer = load_model(str(output))
+        assert lda_model.components_.shape == (3, 4096)
+        top_words = get_top_words_per_topic(lda_model, vectorizer)
+        assert not any(word.startswith("#") for words in top_words for word in words)
+
+    rejected = runner.invoke(
+        app,
+        ["train", str(corpus_dir), str(tmp_path / "m.pkl"), "--hash-features", "4096",
+         "--matrix", str(tmp_path / "m.npz")],
+    )
+    assert rejected.exit_code == 1
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import numpy as np
+from typer.testing import CliRunner
+
+import ng20lda.cli.typer_app as typer_app
+from ng20lda.cli.typer_app import app
+from ng20lda.core.document_processor import iter_documents, vectorize_documents
+from ng20lda.core.matrix_store import (
+    count_dtype,
+    index_dtype,
+    load_doc_term_matrix,
+    save_doc_term_matrix,
+)
+
+runner = CliRunner()
+
+
+def test_compact_dtypes() -> None:
+    assert count_dtype(0) == np.uint8
+    assert count_dtype(255) == np.uint8
+    assert count_dtype(256) == np.uint16
+    assert count_dtype(2 ** 20) == np.uint32
+    assert index_dtype(10, 1000) == np.int32
+    assert index_dtype(2 ** 31, 1000) == np.int64
+
+
+def test_vectorized_matrix_is_float32(corpus_dir) -> None:
+    matrix, _ = vectorize_documents(text for _, text in iter_documents(str(corpus_dir)))
+
+    assert matrix.dtype == np.float32
+    assert matrix.indices.dtype == np.int32
+
+
+def test_doc_term_matrix_round_trip(tmp_path, corpus_dir) -> None:
+    matrix, vectorizer = vectorize_documents(text for _, text in iter_documents(str(corpus_dir)))
+    path = tmp_path / "matrix.npz"
+
+    save_doc_term_matrix(matrix, vectorizer, str(path))
+    with np.load(path) as stored:
+        assert stored["data"].dtype == np.uint8
+        assert stored["indices"].dtype == np.int32
+    loaded, loaded_vectorizer = load_doc_term_matrix(str(path))
+
+    assert loaded.dtype == np.float32
+    assert (loaded != matrix).nnz == 0
+    assert loaded_vectorizer.vocabulary_ == vectorizer.vocabulary_
+    assert loaded_vectorizer.max_features == vectorizer.max_features
+
+
+def test_train_reuses_saved_matrix(tmp_path, corpus_dir, monkeypatch) -> None:
+    matrix_path = tmp_path / "matrix.npz"
+    args = ["train", str(corpus_dir), str(tmp_path / "lda.pkl"), "-n", "3", "--matrix", str(matrix_path)]
+
+    assert runner.invoke(app, args).exit_code == 0
+    assert matrix_path.exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the corpus was vectorized again")
+
+    monkeypatch.setattr(typer_app, "_vectorize_corpus", fail)
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+
+
+def test_train_rebuilds_matrix_of_edited_corpus(tmp_path, corpus_dir) -> None:
+    matrix_path = tmp_path / "matrix.npz"
+    args = ["train", str(corpus_dir), str(tmp_path / "lda.pkl"), "-n", "3", "--matrix", str(matrix_path)]
+    assert runner.invoke(app, args).exit_code == 0
+
+    reused = runner.invoke(app, [*args, "--vocabulary", str(tmp_path / "vocab.json")])
+    assert "--vocabulary is ignored" in reused.output
+
+    (corpus_dir / "cat0" / "0.txt").write_text("hockey team goal season", encoding="utf-8")
+    result = runner.invoke(app, args)
+
+    assert result.exit_code == 0, result.output
+    assert "different version of the corpus" in result.output
+    matrix, _ = load_doc_term_matrix(str(matrix_path))
+    assert matrix.shape[0] == 30
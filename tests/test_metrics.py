@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.metrics import MetricsRegistry, get_metrics, timed
+from ng20lda.core.result_cache import get_result_cache
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def metrics():
+    registry = get_metrics()
+    was_enabled = registry.enabled
+    registry.reset()
+    registry.enable()
+    yield registry
+    registry.reset()
+    registry.enabled = was_enabled
+
+
+def test_disabled_registry_records_nothing() -> None:
+    registry = MetricsRegistry()
+
+    with registry.timer("stage_seconds", stage="x"):
+        pass
+    registry.increment("documents_processed", 3)
+
+    assert registry.timer("stage_seconds") is registry.timer("other")
+    assert registry.render_prometheus() == "\n"
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry(enabled=True)
+    for value in (0.0004, 0.003, 0.003, 20.0):
+        registry.observe("stage_seconds", value, stage="vectorize")
+    registry.increment("cache_lookups", 2, cache="model", result="hit")
+
+    text = registry.render_prometheus()
+
+    assert 'ng20lda_stage_seconds_bucket{stage="vectorize",le="0.0005"} 1' in text
+    assert 'ng20lda_stage_seconds_bucket{stage="vectorize",le="0.005"} 3' in text
+    assert 'ng20lda_stage_seconds_bucket{stage="vectorize",le="+Inf"} 4' in text
+    assert 'ng20lda_stage_seconds_count{stage="vectorize"} 4' in text
+    assert 'ng20lda_cache_lookups_total{cache="model",result="hit"} 2' in text
+
+
+def test_timed_records_into_stage_summary(metrics) -> None:
+    for _ in range(3):
+        with timed("train"):
+            pass
+
+    (row,) = metrics.stage_summary()
+    assert row["stage"] == "train" and row["count"] == 3
+
+
+def test_profile_option_prints_stage_summary(corpus_dir, model_path, metrics) -> None:
+    document = str(next(corpus_dir.rglob("*.txt")))
+    get_result_cache().clear()
+
+    result = runner.invoke(app, ["--profile", "describe", document, str(model_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "lda_transform" in result.output
+    assert "cache_lookups[cache=model" in result.output
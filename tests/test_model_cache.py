@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+from ng20lda.core.lda_model import describe_document
+from ng20lda.core.model_cache import ModelCache, get_model_cache
+
+
+def _write(path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_model_cache_hits_after_first_load(tmp_path) -> None:
+    loads = []
+    cache = ModelCache(loader=lambda path: loads.append(path) or ("lda", "vec"))
+    model = _write(tmp_path / "model.pkl", b"abc")
+
+    assert cache.get(model) == ("lda", "vec")
+    assert cache.get(model) == ("lda", "vec")
+    assert len(loads) == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_model_cache_reloads_when_file_changes(tmp_path) -> None:
+    loads = []
+    cache = ModelCache(loader=lambda path: loads.append(path) or ("lda", "vec"))
+    model = _write(tmp_path / "model.pkl", b"abc")
+    cache.get(model)
+
+    _write(tmp_path / "model.pkl", b"abcdef")
+    cache.get(model)
+
+    assert len(loads) == 2
+    assert cache.stats.reloads == 1
+
+
+def test_model_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ModelCache(max_models=2, loader=lambda path: (path, None))
+    first = _write(tmp_path / "a.pkl", b"a")
+    second = _write(tmp_path / "b.pkl", b"b")
+    third = _write(tmp_path / "c.pkl", b"c")
+
+    cache.get(first)
+    cache.get(second)
+    cache.get(first)
+    cache.get(third)
+
+    assert first in cache
+    assert second not in cache
+    assert third in cache
+    assert cache.stats.evictions == 1
+
+
+def test_model_cache_respects_byte_budget(tmp_path) -> None:
+    cache = ModelCache(max_bytes=5, loader=lambda path: (path, None))
+    first = _write(tmp_path / "a.pkl", b"aaaa")
+    second = _write(tmp_path / "b.pkl", b"bbbb")
+
+    cache.get(first)
+    cache.get(second)
+
+    assert len(cache) == 1
+    assert second in cache
+
+
+def test_describe_document_uses_shared_cache(tmp_path, model_path) -> None:
+    document = tmp_path / "doc.txt"
+    document.write_text("space orbit launch nasa rocket", encoding="utf-8")
+    cache = get_model_cache()
+    cache.invalidate()
+
+    describe_document(str(document), str(model_path))
+    hits = cache.stats.hits
+    describe_document(str(document), str(model_path))
+
+    assert cache.stats.hits == hits + 1
+    assert os.path.abspath(model_path) in cache
+
+
+def test_model_cache_content_hash_follows_file_contents(tmp_path) -> None:
+    path = tmp_path / "model.bin"
+    path.write_bytes(b"first")
+    cache = ModelCache(loader=lambda p: (object(), object()))
+
+    first = cache.content_hash(str(path))
+    assert cache.content_hash(str(path)) == first
+
+    path.write_bytes(b"second!")
+    assert cache.content_hash(str(path)) != first
+
+
+def test_entry_hash_describes_the_loaded_model(tmp_path) -> None:
+    cache = ModelCache(loader=lambda path: (open(path, "rb").read(), None))
+    model = _write(tmp_path / "model.pkl", b"old")
+    entry = cache.get_entry(model)
+
+    _write(tmp_path / "model.pkl", b"new model")
+
+    assert entry.lda_model == b"old"
+    assert entry.content_hash == hashlib.sha256(b"old").hexdigest()
+
+
+def test_model_replaced_while_loading_is_loaded_again(tmp_path) -> None:
+    model = tmp_path / "model.pkl"
+    _write(model, b"old")
+
+    def loader(path):
+        content = open(path, "rb").read()
+        if content == b"old":
+            _write(model, b"new model")
+        return content, None
+
+    cache = ModelCache(loader=loader)
+    entry = cache.get_entry(str(model))
+
+    assert entry.lda_model == b"new model"
+    assert entry.content_hash == hashlib.sha256(b"new model").hexdigest()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from ng20lda.core.document_processor import find_documents, iter_documents
+from ng20lda.core.lda_model import describe_documents
+from ng20lda.core.parallel import build_vocabulary_parallel, vectorize_paths_parallel
+from ng20lda.core.vocabulary import build_vocabulary
+
+
+def test_parallel_vocabulary_matches_sequential(corpus_dir) -> None:
+    paths = find_documents(str(corpus_dir))
+    expected = build_vocabulary(text for _, text in iter_documents(str(corpus_dir)))
+
+    vectorizer = build_vocabulary_parallel(paths, workers=2, shard_size=4)
+
+    assert vectorizer.vocabulary_ == expected.vocabulary_
+
+
+def test_parallel_vectorization_matches_sequential(corpus_dir) -> None:
+    paths = find_documents(str(corpus_dir))
+    vectorizer = build_vocabulary(text for _, text in iter_documents(str(corpus_dir)))
+    expected = vectorizer.transform(open(path, encoding="utf-8").read() for path in paths)
+
+    matrix = vectorize_paths_parallel(paths, vectorizer, workers=2, shard_size=7)
+
+    assert matrix.shape == expected.shape
+    assert (matrix != expected).nnz == 0
+
+
+def test_describe_documents_with_workers(corpus_dir, model_path) -> None:
+    paths = find_documents(str(corpus_dir))
+
+    sequential = list(describe_documents(paths, str(model_path), chunk_size=10))
+    parallel = list(describe_documents(paths, str(model_path), chunk_size=10, workers=2))
+
+    assert [r["topics"][0]["topic"] for r in parallel] == [
+        r["topics"][0]["topic"] for r in sequential
+    ]
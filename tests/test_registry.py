@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from ng20lda.core.lda_model import get_topic_distributions, load_model
+from ng20lda.core.model_cache import compute_model_hash
+from ng20lda.registry import ModelRegistry, ModelVersion, UnknownModelError, load_version
+
+
+def _fake_loader(name, path, version):
+    return ModelVersion(name, version or path, path, "lda", "vec", path)
+
+
+def test_swap_drains_in_flight_requests_before_freeing() -> None:
+    registry = ModelRegistry(loader=_fake_loader)
+    old = registry.register("news", "v1.pkl", "v1")
+
+    with registry.acquire("news") as held:
+        registry.register("news", "v2.pkl", "v2")
+        with registry.acquire("news") as current:
+            assert current.version == "v2"
+        assert held is old
+        assert held.lda_model == "lda"
+        assert not old.freed.is_set()
+        assert [entry["version"] for entry in registry.status()["news"]["draining"]] == ["v1"]
+
+    assert old.freed.is_set()
+    assert old.lda_model is None
+    assert registry.status()["news"]["draining"] == []
+
+
+def test_idle_version_is_freed_on_swap() -> None:
+    registry = ModelRegistry(loader=_fake_loader)
+    old = registry.register("news", "v1.pkl")
+
+    registry.register("news", "v2.pkl")
+
+    assert old.freed.is_set()
+
+
+def test_unknown_model_raises() -> None:
+    registry = ModelRegistry(loader=_fake_loader)
+
+    with pytest.raises(UnknownModelError):
+        registry.checkout("missing")
+
+
+def test_failed_background_load_keeps_current_version() -> None:
+    def loader(name, path, version):
+        if path == "broken.pkl":
+            raise ValueError("corrupt model")
+        return _fake_loader(name, path, version)
+
+    registry = ModelRegistry(loader=loader)
+    registry.register("news", "v1.pkl", "v1")
+
+    future = registry.register_in_background("news", "broken.pkl")
+    with pytest.raises(ValueError):
+        future.result(timeout=10)
+    registry.shutdown()
+
+    status = registry.status()["news"]
+    assert status["active"]["version"] == "v1"
+    assert status["loading"] is None
+    assert "corrupt model" in status["error"]
+
+
+def test_load_config_resolves_paths_and_versions(tmp_path, model_path) -> None:
+    config = tmp_path / "models.json"
+    config.write_text(json.dumps({"models": {"news": {"path": model_path.name}}}))
+    registry = ModelRegistry()
+
+    registry.load_config(str(config))
+
+    with registry.acquire("news") as model_version:
+        assert model_version.path == str(model_path)
+        assert model_version.content_hash.startswith(model_version.version)
+        documents = ["space orbit launch", "hockey team game"]
+        np.testing.assert_allclose(
+            model_version.topic_distributions(documents),
+            get_topic_distributions(documents, str(model_path)),
+        )
+
+
+def test_load_version_hashes_the_model_it_loaded(monkeypatch, model_path) -> None:
+    loads = []
+
+    def replacing_load(path):
+        loads.append(path)
+        if len(loads) == 1:
+            # Another writer replaces the model between the hash and the load
+            model_path.write_bytes(model_path.read_bytes() + b"\0")
+        return load_model(path)
+
+    monkeypatch.setattr("ng20lda.core.lda_model.load_model", replacing_load)
+    model_version = load_version("news", str(model_path))
+
+    assert len(loads) == 2
+    assert model_version.content_hash == compute_model_hash(str(model_path))
+    assert model_version.version == model_version.content_hash[:12]
+
+
+def test_load_version_warms_up_model(model_path) -> None:
+    model_version = load_version("news", str(model_path), "v1")
+
+    assert model_version.version == "v1"
+    assert model_version.lda_model is not None
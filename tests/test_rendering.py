@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from ng20lda.core.rendering import RenderCache, chart_etag, render_topic_chart
+
+
+def test_render_topic_chart_reuses_figure_across_calls() -> None:
+    first = render_topic_chart(np.array([0.1, 0.6, 0.3]), n_topics=2)
+    second = render_topic_chart(np.array([0.7, 0.2, 0.1]), n_topics=2)
+    again = render_topic_chart(np.array([0.1, 0.6, 0.3]), n_topics=2)
+
+    assert first.startswith(b"\x89PNG")
+    assert first != second
+    assert first == again
+
+
+def test_render_topic_chart_is_thread_safe() -> None:
+    distribution = np.array([0.2, 0.5, 0.3])
+    expected = render_topic_chart(distribution)
+    results = []
+
+    def render():
+        results.append(render_topic_chart(distribution))
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [expected] * 4
+
+
+def test_render_cache_evicts_least_recently_used() -> None:
+    cache = RenderCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+
+    assert cache.get("a") == b"1"
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_chart_etag_depends_on_every_key_part() -> None:
+    base = chart_etag("doc", "model", 3)
+
+    assert base.startswith('"') and base.endswith('"')
+    assert base == chart_etag("doc", "model", 3)
+    assert len({base, chart_etag("doc2", "model", 3), chart_etag("doc", "model2", 3),
+                chart_etag("doc", "model", 2)}) == 4
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ng20lda.core.lda_model import get_topic_distributions, save_model
+from ng20lda.core.model_cache import load_cached_model
+from ng20lda.core.result_cache import (
+    ResultCache,
+    document_hash,
+    get_result_cache,
+    set_result_cache,
+)
+
+
+def test_result_cache_persists_on_disk(tmp_path) -> None:
+    path = tmp_path / "results.sqlite"
+    key = ResultCache.key(document_hash("some text"), "model")
+    ResultCache(path=str(path)).put_many([(key, np.array([0.25, 0.75]))])
+
+    reopened = ResultCache(path=str(path))
+    (value,) = reopened.get_many([key])
+
+    np.testing.assert_array_equal(value, [0.25, 0.75])
+    assert reopened.stats.disk_hits == 1
+    reopened.get_many([key, "missing"])
+    assert reopened.stats.memory_hits == 1
+    assert reopened.stats.hit_ratio == 2 / 3
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path) -> None:
+    path = str(tmp_path / "results.sqlite")
+    keys = [ResultCache.key(document_hash(f"document {i}"), "model") for i in range(11)]
+    cache = ResultCache(path=path, max_disk_entries=10)
+    for key in keys[:10]:
+        cache.put_many([(key, np.array([1.0]))])
+    ResultCache(path=path).get_many([keys[0]])
+
+    cache.put_many([(keys[10], np.array([1.0]))])
+
+    found = ResultCache(path=path).get_many(keys)
+    assert [value is not None for value in found] == [True, False, False] + [True] * 8
+
+
+def test_result_cache_drops_results_when_model_changes(tmp_path) -> None:
+    path = str(tmp_path / "results.sqlite")
+    cache = ResultCache(path=path)
+    cache.track_model("model.pkl", "old")
+    cache.put_many([(cache.key("doc", "old"), np.array([1.0]))])
+
+    ResultCache(path=path).track_model("model.pkl", "new")
+    cache.track_model("model.pkl", "new")
+
+    assert ResultCache(path=path).get_many([cache.key("doc", "old")]) == [None]
+    assert len(cache) == 0
+
+
+def test_topic_distributions_are_served_from_cache(tmp_path, model_path) -> None:
+    previous = set_result_cache(ResultCache(path=str(tmp_path / "results.sqlite")))
+    try:
+        documents = ["space orbit launch", "python code compile", "space orbit launch"]
+        first = get_topic_distributions(documents, str(model_path))
+        second = get_topic_distributions(documents[:2], str(model_path))
+        stats = get_result_cache().stats
+    finally:
+        set_result_cache(previous)
+
+    np.testing.assert_allclose(second, first[:2])
+    assert stats.misses == 3
+    assert stats.memory_hits == 2
+
+
+def test_retrained_model_does_not_reuse_results(tmp_path, model_path) -> None:
+    previous = set_result_cache(ResultCache())
+    try:
+        document = ["space orbit launch nasa"]
+        before = get_topic_distributions(document, str(model_path))
+        lda_model, vectorizer = load_cached_model(str(model_path))
+        lda_model.components_ = lda_model.components_[::-1].copy()
+        lda_model.exp_dirichlet_component_ = lda_model.exp_dirichlet_component_[::-1].copy()
+        save_model(lda_model, vectorizer, str(model_path))
+        after = get_topic_distributions(document, str(model_path))
+    finally:
+        set_result_cache(previous)
+
+    np.testing.assert_allclose(after[0], before[0][::-1], atol=1e-6)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from ng20lda.serving import InferenceDispatcher, QueueFullError
+
+
+def test_concurrent_requests_are_coalesced() -> None:
+    calls = []
+
+    def infer(model_key, documents):
+        calls.append(list(documents))
+        return [f"{model_key}:{document}" for document in documents]
+
+    dispatcher = InferenceDispatcher(max_workers=1, batch_window=0.05, infer=infer)
+
+    async def run():
+        return await asyncio.gather(
+            *(dispatcher.topic_distribution("model", f"doc{i}") for i in range(5))
+        )
+
+    results = asyncio.run(run())
+    dispatcher.shutdown()
+
+    assert results == [f"model:doc{i}" for i in range(5)]
+    assert calls == [[f"doc{i}" for i in range(5)]]
+
+
+def test_requests_over_queue_depth_are_rejected() -> None:
+    dispatcher = InferenceDispatcher(
+        max_workers=1, max_queue_depth=2, batch_window=0.05, infer=lambda key, docs: docs
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(dispatcher.topic_distribution("model", f"doc{i}") for i in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    dispatcher.shutdown()
+
+    assert results[:2] == ["doc0", "doc1"]
+    assert isinstance(results[2], QueueFullError)
+
+
+def test_inference_errors_reach_every_caller() -> None:
+    def infer(model_key, documents):
+        raise ValueError("boom")
+
+    dispatcher = InferenceDispatcher(max_workers=1, infer=infer)
+
+    with pytest.raises(ValueError):
+        asyncio.run(dispatcher.topic_distribution("model", "doc"))
+    dispatcher.shutdown()
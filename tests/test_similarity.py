@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.similarity import SimilarityIndex, build_similarity_index, write_similarity_index
+
+
+def _write_random_index(path, n_documents=500, n_topics=6, block_size=64):
+    rng = np.random.default_rng(0)
+    distributions = rng.dirichlet(np.full(n_topics, 0.2), size=n_documents).astype(np.float32)
+    chunks = (
+        ([f"doc{i}" for i in range(start, start + 100)], distributions[start:start + 100])
+        for start in range(0, n_documents, 100)
+    )
+    write_similarity_index(chunks, n_documents, n_topics, str(path), block_size=block_size)
+    return distributions
+
+
+@pytest.mark.parametrize("metric", ["hellinger", "cosine"])
+def test_query_matches_brute_force(tmp_path, metric) -> None:
+    distributions = _write_random_index(tmp_path / "index")
+    query = distributions[7]
+    if metric == "hellinger":
+        expected = np.sqrt(np.clip(1 - np.sqrt(distributions) @ np.sqrt(query), 0, None))
+    else:
+        norms = np.linalg.norm(distributions, axis=1)
+        expected = 1 - distributions @ query / (norms * np.linalg.norm(query))
+
+    with SimilarityIndex(str(tmp_path / "index"), block_size=50) as index:
+        results = index.query(query, k=5, metric=metric)
+
+    nearest = np.argsort(expected)[:5]
+    assert [doc_id for doc_id, _ in results] == [f"doc{i}" for i in nearest]
+    np.testing.assert_allclose([distance for _, distance in results], expected[nearest], atol=1e-5)
+
+
+def test_query_id_excludes_the_query_document(tmp_path) -> None:
+    _write_random_index(tmp_path / "index")
+
+    with SimilarityIndex(str(tmp_path / "index")) as index:
+        results = index.query_id("doc3", k=3)
+        with pytest.raises(KeyError):
+            index.query_id("missing")
+
+    assert len(results) == 3
+    assert "doc3" not in [doc_id for doc_id, _ in results]
+
+
+def test_probing_scans_only_dominant_topic_partitions(tmp_path) -> None:
+    distributions = _write_random_index(tmp_path / "index")
+    query = distributions[0]
+
+    with SimilarityIndex(str(tmp_path / "index")) as index:
+        probed = index.query(query, k=10, n_probe=1)
+
+    dominant = {f"doc{i}": topic for i, topic in enumerate(np.argmax(distributions, axis=1))}
+    assert {dominant[doc_id] for doc_id, _ in probed} == {np.argmax(query)}
+
+
+def test_index_and_similar_commands(corpus_dir, model_path, tmp_path) -> None:
+    runner = CliRunner()
+    index_path = tmp_path / "index"
+    document = sorted(corpus_dir.rglob("*.txt"))[0]
+
+    indexed = runner.invoke(
+        app, ["index", str(corpus_dir), str(model_path), "--output", str(index_path)]
+    )
+    by_id = runner.invoke(app, ["similar", str(index_path), "--id", str(document), "-k", "3"])
+    by_document = runner.invoke(
+        app, ["similar", str(index_path), str(document), "--model", str(model_path), "-k", "1"]
+    )
+
+    assert indexed.exit_code == 0, indexed.output
+    assert "Indexed 30 documents" in indexed.output
+    assert by_id.exit_code == 0, by_id.output
+    related = [line.split("\t")[1] for line in by_id.output.splitlines()]
+    assert len(related) == 3
+    assert all(path.split("/")[-2] == document.parent.name for path in related)
+    # Documents of one category share their words, so the closest is any of them
+    distance, nearest = by_document.output.strip().split("\t")
+    assert float(distance) < 1e-3
+    assert nearest.split("/")[-2] == document.parent.name
+
+
+def test_build_similarity_index_records_model_hash(corpus_dir, model_path, tmp_path) -> None:
+    from ng20lda.core.model_cache import compute_model_hash
+
+    paths = sorted(str(path) for path in corpus_dir.rglob("*.txt"))
+    build_similarity_index(paths, str(model_path), str(tmp_path / "index"), chunk_size=7)
+
+    with SimilarityIndex(str(tmp_path / "index")) as index:
+        assert sorted(index.ids) == paths
+        assert index.model_hash == compute_model_hash(str(model_path))
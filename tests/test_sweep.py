@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.document_processor import iter_documents, vectorize_documents
+from ng20lda.core.lda_model import load_model
+from ng20lda.core.sweep import (
+    SharedCSRMatrix,
+    attach_csr,
+    split_heldout,
+    sweep_topics,
+    umass_coherence,
+)
+
+runner = CliRunner()
+
+
+def test_shared_csr_matrix_round_trip(corpus_dir) -> None:
+    matrix, _ = vectorize_documents(text for _, text in iter_documents(str(corpus_dir)))
+
+    with SharedCSRMatrix(matrix) as shared:
+        attached, blocks = attach_csr(shared.spec)
+        assert (attached != matrix).nnz == 0
+        del attached
+        for block in blocks:
+            block.close()
+
+
+def test_split_heldout_partitions_rows(corpus_dir) -> None:
+    matrix, _ = vectorize_documents(text for _, text in iter_documents(str(corpus_dir)))
+
+    train, heldout = split_heldout(matrix, heldout=0.2)
+
+    assert train.shape[0] == 24 and heldout.shape[0] == 6
+    assert train.dtype == np.float32
+    assert train.sum() + heldout.sum() == matrix.sum()
+
+
+def test_umass_coherence_prefers_cooccurring_words() -> None:
+    matrix = np.array([[1, 1, 0, 0], [1, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+    coherent = np.array([[5.0, 4.0, 0.1, 0.1]])
+    incoherent = np.array([[0.1, 0.1, 5.0, 4.0]])
+
+    assert umass_coherence(coherent, matrix, 2) > umass_coherence(incoherent, matrix, 2)
+
+
+def test_sweep_topics_in_parallel_matches_sequential(corpus_dir) -> None:
+    matrix, _ = vectorize_documents(text for _, text in iter_documents(str(corpus_dir)))
+
+    sequential, _ = sweep_topics(matrix, [2, 3], workers=1)
+    parallel, best = sweep_topics(matrix, [2, 3], workers=2)
+
+    assert [r.n_topics for r in parallel] == [2, 3]
+    np.testing.assert_allclose(
+        [r.perplexity for r in parallel], [r.perplexity for r in sequential]
+    )
+    assert best.n_components == min(parallel, key=lambda r: r.perplexity).n_topics
+    assert all(r.peak_rss is None for r in sequential)
+
+
+def test_cli_sweep_saves_best_model_and_report(tmp_path, corpus_dir) -> None:
+    output = tmp_path / "best.pkl"
+    report = tmp_path / "report.json"
+
+    result = runner.invoke(
+        app, ["sweep", str(corpus_dir), str(output), "-n", "2,3", "--report", str(report)]
+    )
+
+    assert result.exit_code == 0, result.output
+    scores = json.loads(report.read_text(encoding="utf-8"))
+    assert [r["n_topics"] for r in scores["results"]] == [2, 3]
+    lda_model, _ = load_model(str(output))
+    assert lda_model.n_components == scores["best_n_topics"]
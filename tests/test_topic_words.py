@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+
+from ng20lda.core.document_processor import build_hashing_vectorizer, load_documents_recursive
+from ng20lda.core.lda_model import get_top_words_per_topic, load_model, save_model, train_lda_model
+from ng20lda.core.topic_words import (
+    DEFAULT_INDEX_SIZE,
+    get_topic_word_index,
+    name_hashed_features,
+    top_k_indices,
+)
+
+
+def _argsort_top_weights(lda_model, n_words):
+    return [np.sort(topic)[-n_words:][::-1] for topic in lda_model.components_]
+
+
+def test_top_words_match_full_argsort(model_path) -> None:
+    lda_model, vectorizer = load_model(str(model_path))
+    vocabulary = vectorizer.vocabulary_
+
+    # float32 models have exact ties between symmetric words, so the weights
+    # of the chosen words are compared rather than their tie order
+    for n_words in (1, 5, 15):
+        top_words = get_top_words_per_topic(lda_model, vectorizer, n_words)
+        for topic, words, expected in zip(
+            lda_model.components_, top_words, _argsort_top_weights(lda_model, n_words)
+        ):
+            np.testing.assert_array_equal(topic[[vocabulary[word] for word in words]], expected)
+
+
+def test_topic_word_index_is_stored_with_model(tmp_path, model_path) -> None:
+    with open(model_path, "rb") as f:
+        assert "topic_words" in pickle.load(f)
+
+    lda_model, vectorizer = load_model(str(model_path))
+    save_model(lda_model, vectorizer, str(tmp_path / "model"), model_format="artifact")
+    artifact_lda, artifact_vectorizer = load_model(str(tmp_path / "model"))
+
+    index = get_topic_word_index(artifact_lda, artifact_vectorizer, 5)
+    assert index.size == min(DEFAULT_INDEX_SIZE, lda_model.components_.shape[1])
+    assert np.all(np.diff(index.weights, axis=1) <= 0)
+
+
+def test_larger_requests_are_memoized(model_path) -> None:
+    lda_model, vectorizer = load_model(str(model_path))
+    n_features = lda_model.components_.shape[1]
+
+    first = get_topic_word_index(lda_model, vectorizer, n_features)
+    second = get_topic_word_index(lda_model, vectorizer, n_features)
+
+    assert first is second
+    assert first.size == n_features
+
+
+def test_hashed_features_are_named_from_documents(corpus_dir) -> None:
+    documents = load_documents_recursive(str(corpus_dir))
+    vectorizer = build_hashing_vectorizer(n_features=2 ** 12)
+    doc_term_matrix = vectorizer.transform(documents)
+    lda_model = train_lda_model(doc_term_matrix, n_topics=3)
+
+    names = name_hashed_features(lda_model, vectorizer, iter(documents), n_words=8, chunk_size=7)
+
+    # Top features no term hashes to only hold the prior and stay unnamed
+    top = set(top_k_indices(lda_model.components_, 8).ravel().tolist())
+    assert set(names) == top & set(doc_term_matrix.indices.tolist())
+    vocabulary = {word for document in documents for word in document.split()}
+    assert set(names.values()) <= vocabulary
+
+
+def test_named_features_keep_names_without_reading(corpus_dir) -> None:
+    documents = load_documents_recursive(str(corpus_dir))
+    vectorizer = build_hashing_vectorizer(n_features=2 ** 12)
+    lda_model = train_lda_model(vectorizer.transform(documents), n_topics=3)
+    top = sorted(set(top_k_indices(lda_model.components_, 2).ravel().tolist()))
+    vectorizer.feature_names_ = {index: f"kept{index}" for index in top}
+
+    def unread():
+        raise AssertionError("documents were read")
+        yield
+
+    names = name_hashed_features(lda_model, vectorizer, unread(), n_words=2)
+
+    assert names == {index: f"kept{index}" for index in top}
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from ng20lda.cli.typer_app import app
+from ng20lda.core.lda_model import load_model, read_model_lineage
+from ng20lda.core.model_cache import compute_model_hash
+from ng20lda.core.training_manifest import (
+    load_training_manifest,
+    manifest_path_for,
+    save_training_manifest,
+    scan_corpus,
+)
+
+runner = CliRunner()
+
+
+def test_scan_corpus_reports_new_and_changed_files(corpus_dir) -> None:
+    records, changed = scan_corpus(str(corpus_dir))
+    assert len(changed) == len(records) == 30
+
+    edited = corpus_dir / "cat0" / "0.txt"
+    edited.write_text("a completely different document", encoding="utf-8")
+    (corpus_dir / "cat1" / "new.txt").write_text("brand new", encoding="utf-8")
+    touched = corpus_dir / "cat2" / "2.txt"
+    os.utime(touched, ns=(0, 0))
+
+    records, changed = scan_corpus(str(corpus_dir), records)
+
+    assert sorted(changed) == sorted([str(edited), str(corpus_dir / "cat1" / "new.txt")])
+    assert records["cat2/2.txt"].mtime_ns == 0
+
+
+def test_training_manifest_round_trip(tmp_path, corpus_dir) -> None:
+    records, _ = scan_corpus(str(corpus_dir))
+    save_training_manifest(records, str(tmp_path / "model"))
+
+    assert os.path.exists(manifest_path_for(str(tmp_path / "model")))
+    assert load_training_manifest(str(tmp_path / "model")) == records
+    with pytest.raises(FileNotFoundError):
+        load_training_manifest(str(tmp_path / "missing"))
+
+
+def test_train_update_only_ingests_new_documents(tmp_path, corpus_dir) -> None:
+    base = tmp_path / "base"
+    updated = tmp_path / "updated"
+    result = runner.invoke(app, ["train", str(corpus_dir), str(base), "-n", "3", "--manifest"])
+    assert result.exit_code == 0, result.output
+
+    unchanged = runner.invoke(app, ["train", str(corpus_dir), str(updated), "--update", str(base)])
+    assert "up to date" in unchanged.output
+    assert not updated.exists()
+
+    (corpus_dir / "cat0" / "extra.txt").write_text(
+        "space orbit launch nasa rocket satellite", encoding="utf-8"
+    )
+    result = runner.invoke(app, ["train", str(corpus_dir), str(updated), "--update", str(base)])
+
+    assert result.exit_code == 0, result.output
+    assert "1 new or changed documents" in result.output
+    assert read_model_lineage(str(updated)) == {
+        "version": 2,
+        "parent": compute_model_hash(str(base)),
+    }
+    assert "cat0/extra.txt" in load_training_manifest(str(updated))
+    base_model, _ = load_model(str(base))
+    updated_model, _ = load_model(str(updated))
+    assert not np.allclose(base_model.components_, updated_model.components_)
+
+
+def test_train_update_of_hashed_model(tmp_path, corpus_dir) -> None:
+    base = tmp_path / "base.pkl"
+    updated = tmp_path / "updated.pkl"
+    args = ["train", str(corpus_dir), str(base), "-n", "3", "--hash-features", "4096", "--manifest"]
+    assert runner.invoke(app, args).exit_code == 0
+    (corpus_dir / "cat0" / "extra.txt").write_text("space orbit launch nasa", encoding="utf-8")
+
+    result = runner.invoke(app, ["train", str(corpus_dir), str(updated), "--update", str(base)])
+
+    assert result.exit_code == 0, result.output
+    _, base_vectorizer = load_model(str(base))
+    _, vectorizer = load_model(str(updated))
+    shared = set(base_vectorizer.feature_names_) & set(vectorizer.feature_names_)
+    assert shared
+    assert all(
+        vectorizer.feature_names_[index] == base_vectorizer.feature_names_[index]
+        for index in shared
+    )
+
+
+def test_train_records_manifest_only_when_asked(tmp_path, corpus_dir) -> None:
+    model = tmp_path / "lda.pkl"
+
+    result = runner.invoke(app, ["train", str(corpus_dir), str(model), "-n", "3"])
+
+    assert result.exit_code == 0, result.output
+    assert not os.path.exists(manifest_path_for(str(model)))
+
+
+def test_train_update_requires_a_manifest(tmp_path, corpus_dir, model_path) -> None:
+    updated = tmp_path / "updated.pkl"
+
+    result = runner.invoke(app, ["train", str(corpus_dir), str(updated), "--update", str(model_path)])
+
+    assert result.exit_code == 1
+    assert "--manifest" in result.output
+    assert not updated.exists()
+
+
+def test_train_update_rejects_options_it_cannot_apply(tmp_path, corpus_dir, model_path) -> None:
+    for option, extra in (
+        ("--n-topics", ["-n", "50"]),
+        ("--mode", ["--mode", "online"]),
+        ("--hash-features", ["--hash-features", "4096"]),
+    ):
+        result = runner.invoke(
+            app,
+            ["train", str(corpus_dir), str(tmp_path / "updated"), "--update", str(model_path), *extra],
+        )
+
+        assert result.exit_code == 1
+        assert f"--update cannot be combined with {option}" in result.output
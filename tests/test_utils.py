@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import bz2
+import gzip
+import lzma
 import tempfile
 
 import pytest
 from hypothesis import given, strategies as st
+from typer.testing import CliRunner
 
-from ng20lda.core.utils import count_lines_from_file, count_lines_from_string
+from ng20lda.cli.typer_app import app
+from ng20lda.core import utils
+from ng20lda.core.utils import (
+    count_lines_from_file,
+    count_lines_from_string,
+    count_lines_in_directory,
+)
+
+runner = CliRunner()
 
 
 @pytest.mark.parametrize(
@@ -21,20 +33,64 @@ def test_count_lines_from_string(text: str, expected: int) -> None:
     assert count_lines_from_string(text) == expected
 
 
-#@given(
-    #lines=st.lists(st.text(min_size=0, max_size=10), max_size=10),
-    #add_trailing_newline=st.booleans(),
-#)
-#def test_count_lines_from_file_hypothesis(lines: list[str], add_trailing_newline: bool) -> None:
-#    text = "\n".join(lines)
-#   if add_trailing_newline and lines:
-#        text = f"{text}\n"
-#    elif add_trailing_newline and not lines:
-#        text = "\n"
+@given(
+    lines=st.lists(st.text(min_size=0, max_size=10), max_size=10),
+    add_trailing_newline=st.booleans(),
+)
+def test_count_lines_from_file_hypothesis(lines: list[str], add_trailing_newline: bool) -> None:
+    text = "\n".join(lines)
+    if add_trailing_newline:
+        text = f"{text}\n"
+
+    expected = len(text.splitlines())
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=True, suffix=".txt", encoding="utf-8",
+                                     newline="") as tmp:
+        tmp.write(text)
+        tmp.flush()
+        assert count_lines_from_file(tmp.name) == expected
+
+
+@given(text=st.text(alphabet="ab\r\n\x85  é", max_size=40), block_size=st.integers(1, 5))
+def test_line_breaks_split_across_blocks(text: str, block_size: int) -> None:
+    data = text.encode("utf-8")
+    blocks = [data[start:start + block_size] for start in range(0, len(data), block_size)]
+
+    assert utils._lines(*utils._count_blocks(blocks)) == len(text.splitlines())
+
+
+def test_count_lines_ignores_invalid_utf8(tmp_path) -> None:
+    path = tmp_path / "dump.txt"
+    path.write_bytes(b"caf\xe9\nna\xffive\n\x80end")
+
+    assert count_lines_from_file(str(path)) == 3
+
+
+@pytest.mark.parametrize(("suffix", "opener"), [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)])
+def test_count_lines_in_compressed_files(tmp_path, suffix, opener) -> None:
+    path = tmp_path / f"dump.txt{suffix}"
+    with opener(path, "wb") as f:
+        f.write(b"one\r\ntwo\rthree\n" * 1000)
+
+    assert count_lines_from_file(str(path)) == 3000
+
+
+def test_parallel_count_matches_sequential(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"".join(b"line %d\r\n" % i for i in range(5000)) + b"no newline")
+    monkeypatch.setattr(utils, "PARALLEL_MIN_BYTES", 0)
+
+    assert count_lines_from_file(str(path), workers=3) == count_lines_from_file(str(path)) == 5001
+
+
+def test_count_recursive_totals_a_tree(tmp_path) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "x.txt").write_text("1\n2\n")
+    (tmp_path / "y.txt").write_text("3")
 
-#    expected = len(text.splitlines())
+    assert count_lines_in_directory(str(tmp_path), max_workers=2) == (2, 3)
 
-#    with tempfile.NamedTemporaryFile(mode="w", delete=True, suffix=".txt", encoding = "utf-8") as tmp:
-#        tmp.write(text)
-#        tmp.flush()
-#        assert count_lines_from_file(tmp.name) == expected
+    result = runner.invoke(app, ["count", str(tmp_path), "--recursive"])
+    assert result.exit_code == 0
+    assert "Number of lines: 3" in result.output
+    assert runner.invoke(app, ["count", str(tmp_path)]).exit_code == 1
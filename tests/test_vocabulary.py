@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ng20lda.core.document_processor import iter_documents, vectorize_documents
+from ng20lda.core.vocabulary import (
+    build_vocabulary,
+    load_vocabulary,
+    save_vocabulary,
+    vectorize_streaming,
+)
+
+
+def _corpus(n_documents: int = 60) -> list[str]:
+    rng = np.random.default_rng(1)
+    words = [f"term{i}" for i in range(80)] + ["the", "and"]
+    weights = 1.0 / np.arange(1, len(words) + 1)
+    weights /= weights.sum()
+    return [" ".join(rng.choice(words, size=40, p=weights)) for _ in range(n_documents)]
+
+
+def test_streaming_vocabulary_matches_count_vectorizer() -> None:
+    documents = _corpus()
+
+    expected_matrix, expected = vectorize_documents(documents, max_features=25)
+    matrix, vectorizer = vectorize_streaming(
+        lambda: iter(documents), chunk_size=7, max_features=25
+    )
+
+    np.testing.assert_array_equal(
+        vectorizer.get_feature_names_out(), expected.get_feature_names_out()
+    )
+    assert (matrix != expected_matrix).nnz == 0
+
+
+def test_vocabulary_round_trips_through_file(tmp_path, corpus_dir) -> None:
+    vectorizer = build_vocabulary(text for _, text in iter_documents(str(corpus_dir)))
+    path = tmp_path / "vocabulary.json"
+
+    save_vocabulary(vectorizer, str(path))
+    loaded = load_vocabulary(str(path))
+
+    assert loaded.vocabulary_ == vectorizer.vocabulary_
+    assert (loaded.transform(["space orbit"]) != vectorizer.transform(["space orbit"])).nnz == 0